@@ -6,11 +6,16 @@ and see Reddit + X results from the last 30 days. Optional login (email/username
 so you can deploy publicly and still restrict access.
 """
 
+import hashlib
 import io
 import json
 import os
+import queue
 import subprocess
 import sys
+import threading
+import time
+import uuid
 from pathlib import Path
 
 import streamlit as st
@@ -60,6 +65,7 @@ def _run_auth_gate():
             with st.sidebar:
                 if st.button("Sign out", key="auth_logout"):
                     st.session_state["_auth_ok"] = False
+                    st.session_state.pop("_auth_user", None)
                     st.rerun()
             return True
         st.subheader("🔐 Sign in")
@@ -76,6 +82,7 @@ def _run_auth_gate():
                     st.error(f"Use an email address ending with @{creds['email_domain']}.")
                 elif pwd and pwd.strip() == creds["shared_password"]:
                     st.session_state["_auth_ok"] = True
+                    st.session_state["_auth_user"] = email.strip().lower()  # Scopes "Recent research"
                     st.rerun()
                 else:
                     st.error("Wrong password.")
@@ -107,6 +114,7 @@ def _run_auth_gate():
     if not status:
         st.stop()
     # Logged in: show logout in sidebar
+    st.session_state["_auth_user"] = username
     with st.sidebar:
         st.caption(f"Signed in as **{name or username}**")
         auth.logout(location="sidebar", key="logout_btn")
@@ -118,17 +126,22 @@ def _offer_docx_download(content: str, base_name: str) -> None:
     try:
         from docx import Document
         from docx.shared import Pt
-        doc = Document()
-        for block in content.split("\n\n"):
-            block = block.strip()
-            if block:
-                doc.add_paragraph(block)
-        buf = io.BytesIO()
-        doc.save(buf)
-        buf.seek(0)
+        # Every rerun (e.g. any download click) re-renders; build each report once
+        cache_key = ("docx", _report_hash(content))
+        data = _get_result_cache().get(cache_key)
+        if data is None:
+            doc = Document()
+            for block in content.split("\n\n"):
+                block = block.strip()
+                if block:
+                    doc.add_paragraph(block)
+            buf = io.BytesIO()
+            doc.save(buf)
+            data = buf.getvalue()
+            _get_result_cache().set(cache_key, data)
         st.download_button(
             "📘 Word (.docx)",
-            data=buf.getvalue(),
+            data=data,
             file_name=f"{base_name}.docx",
             mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             key="dl_docx",
@@ -141,6 +154,14 @@ def _offer_docx_download(content: str, base_name: str) -> None:
 PROJECT_ROOT = Path(__file__).resolve().parent
 SCRIPT_PATH = PROJECT_ROOT / "scripts" / "last30days.py"
 
+# Shared helpers from the research engine (progress events, stream parsing)
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+from lib import cache as l30_cache  # noqa: E402
+from lib import dates as l30_dates  # noqa: E402
+from lib import jobs as l30_jobs  # noqa: E402
+from lib import render as l30_render  # noqa: E402
+from lib import ui as l30_ui  # noqa: E402
+
 # Same path as last30days script
 ENV_FILE = Path.home() / ".config" / "last30days" / ".env"
 
@@ -181,6 +202,11 @@ def _inject_secrets_into_env():
         pass
 
 
+def _claude_model() -> str:
+    """Claude model id (ANTHROPIC_MODEL overrides the default)."""
+    return os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-5")
+
+
 def _generate_with_claude(report_text: str) -> tuple[str | None, str | None]:
     """
     Call Claude to fill in Best Practices and Prompt Pack. Returns (completed_report, error).
@@ -207,8 +233,7 @@ Keep all other content unchanged (headers, Reddit/X items, links, date range, et
     try:
         # Valid model IDs per Anthropic docs (claude-3-5-sonnet is deprecated/removed)
         # Use ANTHROPIC_MODEL in .env to override. Examples: claude-sonnet-4-5, claude-3-7-sonnet-latest, claude-3-5-haiku-latest
-        default_model = "claude-sonnet-4-5"
-        model = os.environ.get("ANTHROPIC_MODEL", default_model)
+        model = _claude_model()
         client = anthropic.Anthropic(api_key=api_key)
         msg = client.messages.create(
             model=model,
@@ -228,9 +253,53 @@ Keep all other content unchanged (headers, Reddit/X items, links, date range, et
         return None, err
 
 
-def run_research(topic: str, quick: bool, deep: bool, sources: str, emit: str) -> tuple[str, str, int]:
+# Token budget of the research handed to Claude (compact output only). Claude
+# rewrites the whole report, so its input has to leave room in max_tokens for
+# the added sections; the best items by score and source diversity are kept.
+def _env_positive(name: str, default, cast=int):
+    """cast(env var name), or default (with a warning) if malformed or not positive."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        number = 0
+    if not 0 < number < float("inf"):  # Also rejects nan
+        kind = "a positive integer" if cast is int else "a positive number"
+        sys.stderr.write(f"[app] Ignoring {name}={value!r} (not {kind}); using {default}\n")
+        return default
+    return number
+
+
+CLAUDE_CONTEXT_BUDGET = _env_positive("LAST30DAYS_CLAUDE_BUDGET", 2500)
+
+RESEARCH_TIMEOUT = 180  # seconds
+# Budget handed to the script; shorter than RESEARCH_TIMEOUT so it can stop
+# early and still return partial results before we give up on it
+RESEARCH_BUDGET = RESEARCH_TIMEOUT - 20
+
+
+def run_research(
+    topic: str,
+    quick: bool,
+    deep: bool,
+    sources: str,
+    emit: str,
+    on_event=None,
+    on_block=None,
+    on_tick=None,
+    should_cancel=None,
+    budget: int | None = None,
+) -> tuple[str, str, int]:
     """
     Run last30days.py and return (stdout, stderr, returncode).
+
+    Output is consumed live: structured progress events from stderr go to
+    on_event(event), completed --emit=stream blocks from stdout go to
+    on_block(block), and on_tick(elapsed) is called while waiting. The
+    subprocess is killed if should_cancel() returns True or the caller is
+    interrupted. budget caps the output's size in tokens (--budget).
     """
     if not SCRIPT_PATH.exists():
         return "", f"Script not found: {SCRIPT_PATH}", -1
@@ -241,37 +310,298 @@ def run_research(topic: str, quick: bool, deep: bool, sources: str, emit: str) -
         topic,
         "--emit", emit,
         "--sources", sources,
+        "--timeout", str(RESEARCH_BUDGET),
     ]
     if quick:
         cmd.append("--quick")
     if deep:
         cmd.append("--deep")
+    if budget:
+        cmd.extend(["--budget", str(budget)])
 
     env = os.environ.copy()
     _inject_secrets_into_env()
     for key in ("OPENAI_API_KEY", "XAI_API_KEY"):
         if key in os.environ:
             env[key] = os.environ[key]
-    # Write outputs to project out/ so we don't hit PermissionError on ~/.local
+    # Write outputs to project out/ so we don't hit PermissionError on ~/.local.
+    # Each run gets its own out/runs/<run>/ directory (keyed by LAST30DAYS_RUN_ID),
+    # so concurrent sessions don't overwrite each other's files.
     out_dir = PROJECT_ROOT / "out"
     out_dir.mkdir(parents=True, exist_ok=True)
     env["LAST30DAYS_OUTPUT_DIR"] = str(out_dir)
+    env["LAST30DAYS_RUN_ID"] = uuid.uuid4().hex[:12]
+    env["LAST30DAYS_PROGRESS_EVENTS"] = "1"
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=str(PROJECT_ROOT),
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=180,
+            bufsize=1,
             env=env,
         )
-        return result.stdout, result.stderr, result.returncode
-    except subprocess.TimeoutExpired:
-        return "", "Research timed out (max 3 minutes). Try --quick or a narrower topic.", -1
     except Exception as e:
         return "", str(e), -1
 
+    # Pump both pipes into one queue so neither can fill up and block the child
+    lines: queue.Queue = queue.Queue()
+
+    def _pump(pipe, name):
+        for line in pipe:
+            lines.put((name, line))
+        lines.put((name, None))
+
+    for pipe, name in ((proc.stdout, "stdout"), (proc.stderr, "stderr")):
+        threading.Thread(target=_pump, args=(pipe, name), daemon=True).start()
+
+    stdout_parts: list[str] = []
+    stderr_parts: list[str] = []
+    blocks_seen = 0
+    open_pipes = 2
+    started = time.monotonic()
+    try:
+        while open_pipes:
+            elapsed = time.monotonic() - started
+            if elapsed > RESEARCH_TIMEOUT:
+                proc.kill()
+                return (
+                    "".join(stdout_parts),
+                    "".join(stderr_parts) + "\nResearch timed out (max 3 minutes). Try --quick or a narrower topic.",
+                    -1,
+                )
+            if should_cancel and should_cancel():
+                proc.kill()
+                return "".join(stdout_parts), "".join(stderr_parts) + "\nResearch cancelled.", -1
+            try:
+                name, line = lines.get(timeout=0.5)
+            except queue.Empty:
+                if on_tick:
+                    on_tick(elapsed)
+                continue
+            if line is None:
+                open_pipes -= 1
+                continue
+            if name == "stderr":
+                event = l30_ui.parse_event(line)
+                if event is not None:
+                    if on_event:
+                        on_event(event)
+                    continue
+                stderr_parts.append(line)
+            else:
+                stdout_parts.append(line)
+                if on_block and line.startswith("<!-- last30days:") and " end -->" in line:
+                    blocks = l30_render.parse_stream_blocks("".join(stdout_parts))
+                    for block in blocks[blocks_seen:]:
+                        on_block(block)
+                    blocks_seen = len(blocks)
+        return "".join(stdout_parts), "".join(stderr_parts), proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        return "".join(stdout_parts), "".join(stderr_parts), -1
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+
+
+def _describe_event(event: dict) -> str | None:
+    """Turn a progress event into a one-line status message."""
+    source = {"reddit": "Reddit", "x": "X", "web": "Web"}.get(event.get("source"), event.get("source", ""))
+    kind = event.get("event")
+    if kind == "source_start":
+        return f"{source}: searching…"
+    if kind == "source_item":
+        return f"{source}: {event.get('count', 0)} found so far…"
+    if kind == "source_end":
+        duration = event.get("duration")
+        took = f" in {duration:.0f}s" if duration else ""
+        return f"{source}: found {event.get('count', 0)}{took}"
+    if kind == "enrich_start":
+        return f"{source}: fetching engagement for {event.get('total', 0)} threads…"
+    if kind == "enrich_end":
+        return f"{source}: engagement data fetched"
+    if kind == "processing_start":
+        return "Scoring and ranking…"
+    if kind == "error":
+        return f"⚠️ {event.get('message', 'error')}"
+    if kind == "complete":
+        return f"Research complete ({event.get('elapsed', 0):.0f}s)"
+    return None
+
+
+def _final_output(stdout: str) -> str:
+    """Reduce --emit=stream output to the final compact report."""
+    finals = [b for b in l30_render.parse_stream_blocks(stdout) if b["kind"] == "final"]
+    if not finals:
+        return stdout
+    # Keep anything printed after the final block (e.g. WebSearch instructions)
+    end_marker = "<!-- last30days:final end -->"
+    return finals[-1]["body"] + stdout[stdout.rfind(end_marker) + len(end_marker):]
+
+
+# Shared across sessions: identical queries (and Claude runs on the same
+# report) within the TTL are served from memory instead of re-run
+RESULT_CACHE_TTL = _env_positive("LAST30DAYS_APP_CACHE_TTL_MINUTES", 60.0, float) * 60
+RESULT_CACHE_MB = _env_positive("LAST30DAYS_APP_CACHE_MB", 64.0, float)
+
+
+@st.cache_resource
+def _get_result_cache() -> l30_cache.MemoryCache:
+    """One result cache per app process, shared by every session."""
+    return l30_cache.MemoryCache(RESULT_CACHE_TTL, int(RESULT_CACHE_MB * 1024 * 1024))
+
+
+def _research_cache_key(topic: str, params: dict) -> tuple:
+    """Cache key for a research run: normalized topic, options and date window."""
+    from_date, to_date = l30_dates.get_date_range(30)
+    return (
+        "research",
+        " ".join(topic.lower().split()),
+        bool(params.get("quick")),
+        bool(params.get("deep")),
+        params.get("sources", "auto"),
+        params.get("emit", "compact"),
+        params.get("budget"),
+        from_date,
+        to_date,
+    )
+
+
+def _report_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _claude_cache_key(report_text: str) -> tuple:
+    return ("claude", _claude_model(), _report_hash(report_text))
+
+
+def _wants_claude(report_text: str, params: dict) -> bool:
+    return bool(report_text.strip() and params.get("output_format") != "json" and params.get("generate_with_claude"))
+
+
+def _generate_with_claude_cached(report_text: str) -> tuple[str | None, str | None]:
+    """_generate_with_claude, reusing the completion for a report seen before."""
+    results = _get_result_cache()
+    cache_key = _claude_cache_key(report_text)
+    completed = results.get(cache_key)
+    if completed is not None:
+        return completed, None
+    completed, err = _generate_with_claude(report_text)
+    if completed and not err:
+        results.set(cache_key, completed)
+    return completed, err
+
+
+def _run_research_job(job: dict, ctx: l30_jobs.JobContext) -> tuple[str, str, int, str | None]:
+    """
+    Worker-side research run: returns (display content, log, returncode, warning).
+
+    Progress and partial results go to the job store, so any session (or a
+    reopened tab) polling the job can show them.
+    """
+    params = job["params"]
+    emit = params.get("emit", "compact")
+    partial_blocks: list[str] = []
+    finished: list[dict] = []  # The run's "complete" event, if it got that far
+
+    def _on_event(event: dict):
+        if event.get("event") == "complete":
+            finished.append(event)
+        if event.get("event") == "enrich_progress":
+            ctx.progress(f"Reddit threads {event.get('current', 0)}/{event.get('total', 0)}")
+            return
+        message = _describe_event(event)
+        if message:
+            ctx.progress(message)
+
+    def _on_block(block: dict):
+        if block["kind"] in ("x", "reddit-item", "error"):
+            partial_blocks.append(block["body"])
+            ctx.partial("\n\n".join(partial_blocks))
+
+    results = _get_result_cache()
+    cache_key = _research_cache_key(job["topic"], params)
+    cached = results.get(cache_key)
+    if cached is not None:
+        # An identical job finished while this one was queued
+        stdout, stderr, code = cached
+    else:
+        stdout, stderr, code = run_research(
+            job["topic"], quick=params.get("quick", False), deep=params.get("deep", False),
+            sources=params.get("sources", "auto"), emit=emit,
+            on_event=_on_event, on_block=_on_block, should_cancel=ctx.cancelled,
+            budget=params.get("budget"),
+        )
+        if emit == "stream":
+            stdout = _final_output(stdout)
+        stderr = stderr or ""
+        # Only complete runs are shared: not ones with provider errors, failed
+        # enrichment or a deadline that cut research short
+        complete = bool(finished) and not finished[-1].get("partial")
+        if code == 0 and complete and stdout.strip() and not ctx.cancelled():
+            results.set(cache_key, (stdout, stderr, code), size=len(stdout) + len(stderr))
+
+    warnings = []
+    if code != 0 and stdout.strip():
+        # The job is marked failed; say why its partial results are shown
+        timed_out = "Research timed out" in stderr
+        warnings.append(("Research timed out" if timed_out else f"Research failed (exit code {code})")
+                        + "; showing partial results.")
+    if _wants_claude(stdout, params):
+        ctx.progress("Generating Best Practices & Prompt Pack with Claude…")
+        _inject_secrets_into_env()
+        completed, err = _generate_with_claude_cached(stdout)
+        if err:
+            warnings.append(f"Claude step failed: {err}. Showing research only.")
+        elif completed:
+            stdout = completed
+    return stdout, stderr, code, " ".join(warnings) or None
+
+
+def _cached_job_result(topic: str, params: dict) -> tuple[str, str, int] | None:
+    """(output, log, returncode) if this job can be answered from the cache alone."""
+    results = _get_result_cache()
+    cached = results.get(_research_cache_key(topic, params))
+    if cached is None:
+        return None
+    stdout, stderr, code = cached
+    if _wants_claude(stdout, params):
+        stdout = results.get(_claude_cache_key(stdout))
+        if stdout is None:
+            return None
+    return stdout, stderr, code
+
+
+# Jobs database: results outlive browser sessions and app restarts
+JOBS_DB = Path(os.environ.get("LAST30DAYS_JOBS_DB") or PROJECT_ROOT / "out" / "jobs.sqlite3")
+APP_WORKERS = _env_positive("LAST30DAYS_APP_WORKERS", l30_jobs.DEFAULT_WORKERS)
+
+
+@st.cache_resource
+def _get_job_pool() -> l30_jobs.WorkerPool:
+    """One worker pool per app process, shared by every session."""
+    JOBS_DB.parent.mkdir(parents=True, exist_ok=True)
+    store = l30_jobs.JobStore(JOBS_DB)
+    store.requeue_interrupted()
+    store.prune()
+    pool = l30_jobs.WorkerPool(store, _run_research_job, workers=APP_WORKERS)
+    pool.start()
+    return pool
+
+
+def _job_id_from_url() -> str | None:
+    query_params = getattr(st, "query_params", None)
+    return query_params.get("job") if query_params is not None else None
+
+
+def _set_job_in_url(job_id: str) -> None:
+    """Put the job id in the URL so a bookmarked or reopened tab finds it."""
+    query_params = getattr(st, "query_params", None)
+    if query_params is not None:
+        query_params["job"] = job_id
+
 
 st.set_page_config(
     page_title="last30days – Research from Reddit & X",
@@ -316,46 +646,83 @@ generate_with_claude = st.checkbox(
     help="After research, call Claude to fill in the Best Practices and Prompt Pack sections. Requires ANTHROPIC_API_KEY.",
 )
 
-# Persist research results so they stay visible after clicking a download button (Streamlit reruns on any click)
-display_content = st.session_state.get("research_display_content", "")
-research_topic = st.session_state.get("research_topic", "")
-research_format = st.session_state.get("research_output_format", "compact")
-research_stderr = st.session_state.get("research_stderr", "")
+pool = _get_job_pool()
+owner = st.session_state.get("_auth_user")
 
 if st.button("Run research", type="primary", use_container_width=True):
     if not (topic or "").strip():
         st.warning("Please enter a topic.")
     else:
-        with st.spinner("Searching Reddit & X (this may take 30–90 seconds)…"):
-            stdout, stderr, code = run_research(
-                topic.strip(), quick=quick, deep=deep, sources=sources, emit=output_format
-            )
+        _inject_secrets_into_env()
+        params = {
+            "quick": quick,
+            "deep": deep,
+            "sources": sources,
+            # Compact output is streamed so partial results show while research runs
+            "emit": "stream" if output_format == "compact" else output_format,
+            "output_format": output_format,
+            "generate_with_claude": generate_with_claude,
+            # Claude reads (and rewrites) the research: keep it to a token budget
+            "budget": CLAUDE_CONTEXT_BUDGET if generate_with_claude and output_format == "compact" else None,
+        }
+        cached = _cached_job_result(topic.strip(), params)
+        if cached is not None:
+            job_id = pool.store.record(topic.strip(), params, owner, *cached)
+        else:
+            job_id = pool.submit(topic.strip(), params, owner=owner)
+        st.session_state["research_job_id"] = job_id
+        _set_job_in_url(job_id)
+
+# Current job: this session's latest, or the one in the URL (reopened tab)
+job_id = st.session_state.get("research_job_id") or _job_id_from_url()
+job = pool.store.get(job_id) if job_id else None
+
+with st.sidebar:
+    recent = pool.store.list(owner=owner, limit=10)
+    if recent:
+        st.subheader("Recent research")
+        icons = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌", "cancelled": "⏹️"}
+        for recent_job in recent:
+            label = f"{icons.get(recent_job['state'], '')} {recent_job['topic'][:40]}"
+            if st.button(label, key=f"job_{recent_job['id']}", use_container_width=True):
+                st.session_state["research_job_id"] = recent_job["id"]
+                _set_job_in_url(recent_job["id"])
+                st.rerun()
+
+display_content = ""
+research_topic = ""
+research_format = "compact"
+research_stderr = ""
+
+if job and job["state"] not in l30_jobs.FINISHED_STATES:
+    # Research runs in the worker pool; poll the job store until it finishes
+    if job["state"] == "queued":
+        label = "Queued – waiting for a free worker…"
+    else:
+        elapsed = time.time() - (job["started"] or time.time())
+        label = f"{job['progress'] or 'Researching…'} ({elapsed:.0f}s)"
+    st.status(label, expanded=False)
+    st.caption("You can close this tab; the research keeps running and shows up under Recent research.")
+    if st.button("Cancel research", key="cancel_research"):
+        pool.store.cancel(job["id"])
+    if job["partial"]:
+        st.markdown(job["partial"])
+    time.sleep(1)
+    st.rerun()
+elif job:
+    research_topic = job["topic"]
+    research_format = job["params"].get("output_format", "compact")
+    research_stderr = job["log"] or ""
+    if job["state"] == "cancelled":
+        st.info("Research was cancelled.")
+    elif not job["output"]:
+        st.error(job["message"] or "Research failed. Check the log below or try a different topic/depth.")
+    else:
+        display_content = job["output"]
+        if job["message"]:
+            st.warning(job["message"])
 
-        st.session_state["research_stderr"] = stderr or ""
-
-        if code != 0 and not stdout:
-            st.error("Research failed. Check the log above or try a different topic/depth.")
-            st.session_state.pop("research_display_content", None)
-        elif stdout:
-            display_content = stdout
-            if output_format != "json" and generate_with_claude and stdout.strip():
-                _inject_secrets_into_env()
-                with st.spinner("Generating Best Practices & Prompt Pack with Claude…"):
-                    completed, err = _generate_with_claude(stdout)
-                if err:
-                    st.warning(f"Claude step failed: {err}. Showing research only.")
-                elif completed:
-                    display_content = completed
-                    st.success("Done. Best Practices & Prompt Pack generated by Claude.")
-            else:
-                st.success("Done.")
-            st.session_state["research_display_content"] = display_content
-            st.session_state["research_topic"] = topic.strip()
-            st.session_state["research_output_format"] = output_format
-            research_topic = topic.strip()
-            research_format = output_format
-
-# Show results from this run or from previous run (so text does not disappear when clicking download)
+# Show the current job's results (stored, so they survive download clicks and reopened tabs)
 if display_content:
     if research_format == "json":
         st.code(display_content, language="json")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for scripts/last30days.py.
+
+Usage:
+    python3 benchmarks/bench_startup.py [--runs N] [--top K] [--max-ms MS]
+
+Times fresh interpreter runs of `--help` and a mock research run against a
+bare `python -c pass` baseline, then breaks the mock run's imports down with
+`python -X importtime`. Wall times are the best of N runs (the least noisy
+statistic on a shared machine); CPU is user+sys of the child.
+
+With --max-ms, exits non-zero if the mock run is slower than the budget, so
+it can guard startup regressions in CI.
+"""
+
+import argparse
+import compileall
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SCRIPT = ROOT / "scripts" / "last30days.py"
+
+
+def run_once(cmd: list, env: dict) -> tuple:
+    """Run cmd, returning (wall_seconds, cpu_seconds)."""
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return wall, cpu
+
+
+def measure(label: str, cmd: list, env: dict, runs: int) -> float:
+    """Print best/median wall time and best CPU time; return best wall (ms)."""
+    samples = [run_once(cmd, env) for _ in range(runs)]
+    walls = sorted(w for w, _ in samples)
+    cpu = min(c for _, c in samples)
+    best, median = walls[0] * 1000, walls[len(walls) // 2] * 1000
+    print(f"{label:<12} best {best:7.1f} ms   median {median:7.1f} ms   cpu {cpu * 1000:7.1f} ms")
+    return best
+
+
+def import_breakdown(cmd: list, env: dict, top: int):
+    """Print total import time and the slowest top-level imports."""
+    proc = subprocess.run(
+        [cmd[0], "-X", "importtime"] + cmd[1:],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_part, cumulative_us, name = line.split("|")
+        rows.append((int(self_part.split(":")[1]), int(cumulative_us), name[1:].rstrip()))
+
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    print(f"\nImports: {len(rows)} modules, {total_ms:.1f} ms total (self time)")
+    top_level = [r for r in rows if not r[2].startswith("  ")]
+    for _, cumulative_us, name in sorted(top_level, key=lambda r: -r[1])[:top]:
+        print(f"  {cumulative_us / 1000:7.1f} ms  {name.strip()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measurement")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the mock run's best time exceeds this")
+    args = parser.parse_args()
+
+    # Measure with bytecode caches in place, as an installed skill would run
+    # (PYTHONDONTWRITEBYTECODE would otherwise make every run recompile)
+    compileall.compile_dir(str(ROOT / "scripts" / "lib"), quiet=1)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        env = {**os.environ, "LAST30DAYS_OUTPUT_DIR": out_dir}
+        mock_cmd = [sys.executable, str(SCRIPT), "startup benchmark", "--mock", "--emit=path"]
+
+        measure("python", [sys.executable, "-c", "pass"], env, args.runs)
+        measure("--help", [sys.executable, str(SCRIPT), "--help"], env, args.runs)
+        mock_ms = measure("mock run", mock_cmd, env, args.runs)
+        import_breakdown(mock_cmd, env, args.top)
+
+    if args.max_ms is not None and mock_ms > args.max_ms:
+        print(f"\nFAIL: mock run {mock_ms:.1f} ms > budget {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+history - Query every item past last30days runs have seen, without API calls.
+
+Usage:
+    python3 history.py [text] [options]
+
+Options:
+    --topic=TEXT        Only items from runs whose topic contains TEXT
+    --since=DATE        Items dated on or after DATE (YYYY-MM-DD)
+    --until=DATE        Items dated on or before DATE (YYYY-MM-DD)
+    --days=N            Items from the last N days (shorthand for --since)
+    --source=SOURCE     reddit|x|web
+    --subreddit=NAME    Only this subreddit
+    --author=HANDLE     Only this X author
+    --limit=N           Max items (default: 25)
+    --all-snapshots     Every recorded snapshot instead of the latest per item
+    --emit=MODE         md|json (default: md)
+    --stats             Show store size instead of searching
+
+Examples:
+    python3 history.py "meta ads" --since=2026-07-01 --source=reddit
+    python3 history.py --subreddit=PPC --days=7
+"""
+
+import argparse
+import json
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Add lib to path
+SCRIPT_DIR = Path(__file__).parent.resolve()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from lib import dates, history
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query items seen by past last30days runs")
+    parser.add_argument("text", nargs="?", help="Words to match in item text or run topic")
+    parser.add_argument("--topic", help="Only items from runs whose topic contains this")
+    parser.add_argument("--since", help="Items dated on or after YYYY-MM-DD")
+    parser.add_argument("--until", help="Items dated on or before YYYY-MM-DD")
+    parser.add_argument("--days", type=int, help="Items from the last N days")
+    parser.add_argument("--source", choices=list(history.SOURCES), help="Only this source")
+    parser.add_argument("--subreddit", help="Only this subreddit")
+    parser.add_argument("--author", help="Only this X author")
+    parser.add_argument("--limit", type=int, default=25, help="Max items (default: 25)")
+    parser.add_argument("--all-snapshots", action="store_true", help="Every snapshot, not just the latest per item")
+    parser.add_argument("--emit", choices=["md", "json"], default="md", help="Output mode")
+    parser.add_argument("--stats", action="store_true", help="Show store size instead of searching")
+    args = parser.parse_args(argv)
+
+    if args.stats:
+        print(json.dumps({"db": str(history.DB_PATH), **history.stats()}, indent=2))
+        return
+
+    since = args.since
+    if args.days is not None:
+        since = (dates.today_utc() - timedelta(days=args.days)).isoformat()
+
+    items = history.search(
+        args.text,
+        topic=args.topic,
+        since=since,
+        until=args.until,
+        source=args.source,
+        subreddit=args.subreddit,
+        author=args.author,
+        limit=args.limit,
+        all_snapshots=args.all_snapshots,
+    )
+    if args.emit == "json":
+        print(json.dumps(items, indent=2))
+    else:
+        print(history.render_results(items))
+
+
+if __name__ == "__main__":
+    main()
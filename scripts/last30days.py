@@ -7,41 +7,50 @@ Usage:
 
 Options:
     --mock              Use fixtures instead of real API calls
-    --emit=MODE         Output mode: compact|json|md|context|path (default: compact)
+    --emit=MODE         Output mode: compact|json|md|context|path|stream (default: compact)
     --sources=MODE      Source selection: auto|reddit|x|both (default: auto)
     --quick             Faster research with fewer sources (8-12 each)
     --deep              Comprehensive research with more sources (50-70 Reddit, 40-60 X)
+    --fanout            Concurrent multi-query Reddit search (merged by URL)
+    --timeout=SECONDS   End-to-end time budget (partial results on expiry)
+    --refresh           Ignore cached search/thread/scored results (still refreshes them)
+    --incremental       Only search the days since this topic's last run; rebuild from stored items
+    --budget=TOKENS     Fit compact/stream/context output in about TOKENS tokens
+    --budget-usd=USD    Same, as an input cost (at LAST30DAYS_USD_PER_MTOK, default $3/M)
     --debug             Enable verbose debug logging
+    --daemon=CMD        Research daemon: serve|status|stop
+    --no-daemon         Run in-process even if a daemon is listening
 """
 
 import argparse
 import json
 import os
+import signal
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 # Add lib to path
 SCRIPT_DIR = Path(__file__).parent.resolve()
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from lib import (
-    dates,
-    dedupe,
-    env,
-    http,
-    models,
-    normalize,
-    openai_reddit,
-    reddit_enrich,
-    render,
-    schema,
-    score,
-    ui,
-    websearch,
-    xai_x,
-)
+# Only what every run needs is imported here. Provider clients, HTTP and the
+# processing pipeline are imported where they are used, so --help, web-only
+# and mock runs don't pay for them (see benchmarks/bench_startup.py).
+from lib import dates, env, render, schema, ui
+from lib.deadline import Deadline
+
+# Don't start the sparse-results retry search with less budget than this (seconds)
+MIN_RETRY_BUDGET = 20
+
+# Host used for thread enrichment (see http.get_reddit_json)
+REDDIT_HOST = "www.reddit.com"
+
+# Source modes that search each provider, and where Claude runs WebSearch after the script
+REDDIT_SOURCES = ("both", "reddit", "all", "reddit-web")
+X_SOURCES = ("both", "x", "all", "x-web")
+WEB_SEARCH_SOURCES = ("all", "web", "reddit-web", "x-web")
 
 
 def load_fixture(name: str) -> dict:
@@ -61,15 +70,75 @@ def _search_reddit(
     to_date: str,
     depth: str,
     mock: bool,
+    deadline: Optional[Deadline] = None,
+    fanout: bool = False,
+    use_cache: bool = True,
+    on_item=None,
 ) -> tuple:
     """Search Reddit via OpenAI (runs in thread).
 
+    With fanout, several query variants run concurrently up front instead of
+    the sequential sparse-results retry. Successful searches are saved to the
+    "openai" cache layer; with use_cache, a warm entry skips the API call.
+    on_item, if given, streams the search and gets each thread as it arrives.
+
     Returns:
         Tuple of (reddit_items, raw_openai, error)
     """
+    from lib import cache
+
+    layer_key = cache.layer_key(
+        topic, from_date, to_date, depth, "fanout" if fanout else "single", selected_models.get("openai")
+    )
+    if use_cache and not mock:
+        cached, _ = cache.load_layer("openai", layer_key)
+        if cached is not None:
+            return cached["items"], cached["raw"], None
+
+    reddit_items, raw_openai, reddit_error = _search_reddit_uncached(
+        topic, config, selected_models, from_date, to_date, depth, mock, deadline, fanout, on_item
+    )
+    if not mock and not reddit_error and not (deadline and deadline.expired()):
+        cache.save_layer("openai", layer_key, {"items": reddit_items, "raw": raw_openai})
+    return reddit_items, raw_openai, reddit_error
+
+
+def _search_reddit_uncached(
+    topic: str,
+    config: dict,
+    selected_models: dict,
+    from_date: str,
+    to_date: str,
+    depth: str,
+    mock: bool,
+    deadline: Optional[Deadline] = None,
+    fanout: bool = False,
+    on_item=None,
+) -> tuple:
+    """Run the Reddit search against OpenAI (see _search_reddit)."""
+    from lib import dedupe, http, openai_reddit
+
     raw_openai = None
     reddit_error = None
 
+    if fanout and not mock:
+        try:
+            reddit_items, raws = openai_reddit.search_reddit_fanout(
+                config["OPENAI_API_KEY"],
+                selected_models["openai"],
+                topic,
+                from_date,
+                to_date,
+                depth=depth,
+                deadline=deadline,
+                on_item=on_item,
+            )
+            return reddit_items, {"fanout": raws}, None
+        except http.HTTPError as e:
+            return [], {"error": str(e)}, f"API error: {e}"
+        except Exception as e:
+            return [], {"error": str(e)}, f"{type(e).__name__}: {e}"
+
     if mock:
         raw_openai = load_fixture("openai_sample.json")
     else:
@@ -81,6 +150,8 @@ def _search_reddit(
                 from_date,
                 to_date,
                 depth=depth,
+                deadline=deadline,
+                on_item=on_item,
             )
         except http.HTTPError as e:
             raw_openai = {"error": str(e)}
@@ -92,8 +163,10 @@ def _search_reddit(
     # Parse response
     reddit_items = openai_reddit.parse_reddit_response(raw_openai or {})
 
-    # Quick retry with simpler query if few results
-    if len(reddit_items) < 5 and not mock and not reddit_error:
+    # Quick retry with simpler query if few results (only if the budget allows)
+    remaining = deadline.remaining() if deadline else None
+    has_budget = remaining is None or remaining >= MIN_RETRY_BUDGET
+    if len(reddit_items) < 5 and not mock and not reddit_error and has_budget:
         core = openai_reddit._extract_core_subject(topic)
         if core.lower() != topic.lower():
             try:
@@ -103,17 +176,16 @@ def _search_reddit(
                     core,
                     from_date, to_date,
                     depth=depth,
+                    deadline=deadline,
+                    on_item=on_item,
                 )
-                retry_items = openai_reddit.parse_reddit_response(retry_raw)
-                # Add items not already found (by URL)
-                existing_urls = {item.get("url") for item in reddit_items}
-                for item in retry_items:
-                    if item.get("url") not in existing_urls:
-                        reddit_items.append(item)
+                reddit_items.extend(openai_reddit.parse_reddit_response(retry_raw))
             except Exception:
                 pass
 
-    return reddit_items, raw_openai, reddit_error
+    # Collapse old./www./slug/query variants of the same post so each thread
+    # is enriched (and fetched) once
+    return dedupe.dedupe_by_key(reddit_items), raw_openai, reddit_error
 
 
 def _search_x(
@@ -124,12 +196,49 @@ def _search_x(
     to_date: str,
     depth: str,
     mock: bool,
+    deadline: Optional[Deadline] = None,
+    use_cache: bool = True,
+    on_item=None,
 ) -> tuple:
     """Search X via xAI (runs in thread).
 
+    Successful searches are saved to the "xai" cache layer; with use_cache,
+    a warm entry skips the API call. on_item, if given, streams the search
+    and gets each post as it arrives.
+
     Returns:
         Tuple of (x_items, raw_xai, error)
     """
+    from lib import cache
+
+    layer_key = cache.layer_key(topic, from_date, to_date, depth, selected_models.get("xai"))
+    if use_cache and not mock:
+        cached, _ = cache.load_layer("xai", layer_key)
+        if cached is not None:
+            return cached["items"], cached["raw"], None
+
+    x_items, raw_xai, x_error = _search_x_uncached(
+        topic, config, selected_models, from_date, to_date, depth, mock, deadline, on_item
+    )
+    if not mock and not x_error and not (deadline and deadline.expired()):
+        cache.save_layer("xai", layer_key, {"items": x_items, "raw": raw_xai})
+    return x_items, raw_xai, x_error
+
+
+def _search_x_uncached(
+    topic: str,
+    config: dict,
+    selected_models: dict,
+    from_date: str,
+    to_date: str,
+    depth: str,
+    mock: bool,
+    deadline: Optional[Deadline] = None,
+    on_item=None,
+) -> tuple:
+    """Run the X search against xAI (see _search_x)."""
+    from lib import dedupe, http, xai_x
+
     raw_xai = None
     x_error = None
 
@@ -144,6 +253,8 @@ def _search_x(
                 from_date,
                 to_date,
                 depth=depth,
+                deadline=deadline,
+                on_item=on_item,
             )
         except http.HTTPError as e:
             raw_xai = {"error": str(e)}
@@ -153,11 +264,248 @@ def _search_x(
             x_error = f"{type(e).__name__}: {e}"
 
     # Parse response
-    x_items = xai_x.parse_x_response(raw_xai or {})
+    x_items = dedupe.dedupe_by_key(xai_x.parse_x_response(raw_xai or {}))
 
     return x_items, raw_xai, x_error
 
 
+def process_reddit_items(
+    items: list,
+    from_date: str,
+    to_date: str,
+    date_ctx: Optional[dates.DateContext] = None,
+    top_k: Optional[int] = None,
+) -> list:
+    """Normalize, date-filter, score, sort and dedupe raw Reddit items.
+
+    With top_k, only the first top_k items of the full result are returned,
+    found by lazy heap selection and dedupe instead of a full sort and
+    all-pairs comparison.
+    """
+    from lib import dedupe, normalize, score
+
+    date_ctx = date_ctx or dates.DateContext(from_date, to_date)
+    normalized = normalize.normalize_reddit_items(
+        dedupe.dedupe_by_key(items), from_date, to_date, date_ctx
+    )
+    # Hard date filter: exclude items with verified dates outside the range
+    # This is the safety net - even if prompts let old content through, this filters it
+    filtered = normalize.filter_by_date_range(normalized, from_date, to_date)
+    scored = score.score_reddit_items(filtered, date_ctx)
+    if top_k:
+        return dedupe.dedupe_top(score.iter_sorted(scored), top_k)
+    return dedupe.dedupe_reddit(score.sort_items(scored))
+
+
+def process_x_items(
+    items: list,
+    from_date: str,
+    to_date: str,
+    date_ctx: Optional[dates.DateContext] = None,
+    top_k: Optional[int] = None,
+) -> list:
+    """Normalize, date-filter, score, sort and dedupe raw X items (see process_reddit_items)."""
+    from lib import dedupe, normalize, score
+
+    date_ctx = date_ctx or dates.DateContext(from_date, to_date)
+    normalized = normalize.normalize_x_items(
+        dedupe.dedupe_by_key(items), from_date, to_date, date_ctx
+    )
+    filtered = normalize.filter_by_date_range(normalized, from_date, to_date)
+    scored = score.score_x_items(filtered, date_ctx)
+    if top_k:
+        return dedupe.dedupe_top(score.iter_sorted(scored), top_k)
+    return dedupe.dedupe_x(score.sort_items(scored))
+
+
+def _scored_key(args, sources: str, depth: str, selected_models: dict, from_date: str, to_date: str) -> str:
+    from lib import cache
+
+    return cache.layer_key(
+        args.topic, from_date, to_date, sources, depth, args.fanout,
+        selected_models.get("openai"), selected_models.get("xai"),
+    )
+
+
+def _load_scored(args, sources: str, depth: str, selected_models: dict, from_date: str, to_date: str) -> tuple:
+    """Scored items for this exact query from the "scored" cache layer.
+
+    Returns:
+        Tuple of (Report holding the cached reddit/x items, age_hours), or
+        (None, None) when cold, bypassed (--refresh, --mock) or web-only
+    """
+    if args.mock or args.refresh or args.incremental or sources == "web":
+        return None, None
+    from lib import cache
+
+    data, age = cache.load_layer("scored", _scored_key(args, sources, depth, selected_models, from_date, to_date))
+    if data is None:
+        return None, None
+    try:
+        restored = schema.Report.from_dict({
+            "topic": args.topic,
+            "range": {"from": from_date, "to": to_date},
+            "generated_at": "",
+            "mode": "",
+            "reddit": data.get("reddit", []),
+            "x": data.get("x", []),
+        })
+    except (KeyError, TypeError):
+        return None, None  # Written by an incompatible version
+    return restored, age
+
+
+def _save_scored(args, sources: str, depth: str, selected_models: dict, from_date: str, to_date: str,
+                 reddit_items: list, x_items: list):
+    """Save a complete run's scored items to the "scored" cache layer."""
+    from lib import cache
+
+    cache.save_layer("scored", _scored_key(args, sources, depth, selected_models, from_date, to_date), {
+        "reddit": [item.to_dict() for item in reddit_items],
+        "x": [item.to_dict() for item in x_items],
+    })
+
+
+def _update_store(
+    store: dict,
+    sources: str,
+    reddit_items: list,
+    x_items: list,
+    reddit_error: Optional[str],
+    x_error: Optional[str],
+    from_date: str,
+    to_date: str,
+    deadline: Deadline,
+    progress: ui.ProgressDisplay,
+    use_cache: bool = True,
+) -> tuple:
+    """Merge an incremental run into the topic's item store.
+
+    Re-enriches stored Reddit threads whose engagement is stale, drops items
+    that left the window, and saves the store. A source's last-success date
+    only advances when its search succeeded within budget, so a failed day
+    is searched again next time.
+
+    Returns:
+        Tuple of (reddit_items, x_items) for the full window
+    """
+    from lib import dedupe, http, incremental, reddit_enrich
+
+    in_budget = not deadline.expired()
+    if sources in REDDIT_SOURCES:
+        incremental.merge(store, "reddit", reddit_items, to_date)
+        if not reddit_error and in_budget:
+            incremental.mark_success(store, "reddit", to_date)
+    if sources in X_SOURCES:
+        incremental.merge(store, "x", x_items, to_date)
+        if not x_error and in_budget:
+            incremental.mark_success(store, "x", to_date)
+    incremental.prune(store, from_date)
+
+    # Threads from this run's search were just enriched (or just failed)
+    searched = {dedupe.canonical_key(item.get("url", "")) for item in reddit_items}
+    stale = [
+        (key, item) for key, item in incremental.stale_items(store, "reddit")
+        if key not in searched
+    ] if sources in REDDIT_SOURCES else []
+
+    if stale:
+        progress.start_reddit_enrich(1, len(stale))
+        for i, (key, item) in enumerate(stale):
+            if deadline.expired() or http.is_circuit_open(REDDIT_HOST):
+                progress.show_error(f"{len(stale) - i} stored Reddit threads keep their previous engagement")
+                break
+            if i > 0:
+                progress.update_reddit_enrich(i + 1, len(stale))
+            try:
+                enriched = reddit_enrich.try_enrich_reddit_item(dict(item), deadline=deadline, use_cache=use_cache)
+            except Exception as e:
+                progress.show_error(f"Enrich failed for {item.get('url', 'unknown')}: {e}")
+                continue
+            if enriched is None:
+                # Leave it stale so the next run tries again
+                progress.show_error(f"Enrich failed for {item.get('url', 'unknown')}: thread not loaded")
+                continue
+            incremental.mark_refreshed(store, "reddit", key, enriched)
+        progress.end_reddit_enrich()
+
+    incremental.save_store(store)
+    return incremental.items(store, "reddit"), incremental.items(store, "x")
+
+
+def _subreddit_priors() -> dict:
+    """Per-subreddit engagement priors from the history store ({} if unavailable)."""
+    from lib import history
+
+    if not history.enabled():
+        return {}
+    try:
+        return history.subreddit_priors()
+    except Exception:
+        return {}  # Only a scheduling hint
+
+
+def _enrich_top_k(
+    reddit_items: list,
+    enrich_items,
+    top_k: int,
+    from_date: str,
+    to_date: str,
+    date_ctx: dates.DateContext,
+    mock: bool,
+    deadline: Optional[Deadline],
+    use_cache: bool,
+    raw_reddit_enriched: list,
+) -> None:
+    """Fully enrich only the Reddit items that reach the top top_k.
+
+    Scoring needs every thread's real engagement and date (engagement is
+    normalized across all items), but not its comments. One batched
+    submission lookup gives every item those, so the top top_k after scoring
+    and dedupe is exactly the full pipeline's; only those threads get a full
+    fetch for their comments. Threads the lookup missed are fully enriched
+    first, as a full run would, so every score is final before selection.
+
+    Args:
+        reddit_items: Raw Reddit items (updated in place)
+        enrich_items: run_research's enrich_items(indices, fields, emit)
+        top_k: Number of items that can reach the output
+        raw_reddit_enriched: Gets the threads the lookup alone completes
+            (enrich_items adds the fully enriched ones)
+    """
+    from lib import dedupe, http, reddit_enrich
+
+    urls = [item.get("url", "") for item in reddit_items]
+    if mock:
+        submissions = reddit_enrich.fetch_submissions(urls, load_fixture("reddit_thread_sample.json"))
+    elif (deadline and deadline.expired()) or http.is_circuit_open(REDDIT_HOST):
+        submissions = {}
+    else:
+        submissions = reddit_enrich.fetch_submissions(urls, deadline=deadline, use_cache=use_cache)
+
+    missing = []
+    for i, item in enumerate(reddit_items):
+        submission = submissions.get(dedupe.canonical_key(urls[i]))
+        if submission:
+            reddit_items[i] = reddit_enrich.apply_submission(dict(item), submission)
+        else:
+            missing.append(i)
+    if missing:
+        enrich_items(missing, emit=False)
+
+    index = {dedupe.canonical_key(url): i for i, url in enumerate(urls)}
+    top = process_reddit_items(reddit_items, from_date, to_date, date_ctx, top_k=top_k)
+    done = set(missing)
+    selected = [index[key] for key in (dedupe.canonical_key(item.url) for item in top) if key in index]
+    # Keep the looked-up engagement (the full fetch could be a little newer,
+    # which would change scores after selection): copy only the comments
+    to_fetch = [i for i in selected if i not in done]
+    enrich_items(to_fetch, fields=reddit_enrich.COMMENT_FIELDS)
+    # Threads below the cut need nothing beyond the lookup
+    fetched = set(to_fetch) | done
+    raw_reddit_enriched.extend(reddit_items[i] for i in range(len(reddit_items)) if i not in fetched)
+
+
 def run_research(
     topic: str,
     sources: str,
@@ -168,15 +516,62 @@ def run_research(
     depth: str = "default",
     mock: bool = False,
     progress: ui.ProgressDisplay = None,
+    stream: Optional[render.StreamWriter] = None,
+    deadline: Optional[Deadline] = None,
+    fanout: bool = False,
+    date_ctx: Optional[dates.DateContext] = None,
+    use_cache: bool = True,
+    search_from: Optional[str] = None,
+    top_k: Optional[int] = None,
 ) -> tuple:
     """Run the research pipeline.
 
+    search_from narrows the provider searches to start on that date (for
+    incremental runs); streamed items are still judged against the full
+    from_date..to_date window.
+
+    Each stage reads and refreshes its own cache layer (raw Reddit search,
+    raw X search, each enriched thread), so only the parts that are not warm
+    call a provider. use_cache=False (--refresh) skips the reads.
+
+    If stream is given, partial results are written to it as they become
+    available: the scored X section once X search finishes, then each Reddit
+    item as its enrichment completes.
+
+    The Reddit search is streamed (unless LAST30DAYS_STREAM_SEARCH=0): each
+    thread is enriched, and streamed, as soon as the model has written it,
+    while the search is still generating the rest. Streamed requests cannot
+    be hedged, so with hedging on (LAST30DAYS_HEDGE=1) Reddit is only
+    streamed for --emit=stream. The X search has no early consumer and is
+    never streamed.
+
+    Threads are enriched highest expected score first (relevance, date hint
+    and the subreddit's engagement in past runs; see lib/schedule.py), so
+    when the deadline or an open circuit stops enrichment, the threads left
+    unenriched are the least likely to be shown.
+
+    With top_k, only the Reddit threads that reach the top top_k get a full
+    thread fetch (see _enrich_top_k); the rest get engagement and dates from
+    a batched lookup. Early enrichment is skipped, since it cannot know
+    which threads will make the cut.
+
+    If deadline is given, every provider call is clamped to the remaining
+    budget. When it expires (or is cancelled) the run stops early and returns
+    whatever it has: a timed-out search reports an error, and Reddit items
+    that were not enriched yet are kept as-is.
+
     Returns:
         Tuple of (reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error)
 
     Note: web_needed is True when WebSearch should be performed by Claude.
     The script outputs a marker and Claude handles WebSearch in its session.
     """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    from lib import dedupe, extract, hedge, http, normalize, reddit_enrich, schedule, score
+
+    date_ctx = date_ctx or dates.DateContext(from_date, to_date)
     reddit_items = []
     x_items = []
     raw_openai = None
@@ -186,7 +581,7 @@ def run_research(
     x_error = None
 
     # Check if WebSearch is needed (always needed in web-only mode)
-    web_needed = sources in ("all", "web", "reddit-web", "x-web")
+    web_needed = sources in WEB_SEARCH_SOURCES
 
     # Web-only mode: no API calls needed, Claude handles everything
     if sources == "web":
@@ -196,8 +591,68 @@ def run_research(
         return reddit_items, x_items, True, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error
 
     # Determine which searches to run
-    run_reddit = sources in ("both", "reddit", "all", "reddit-web")
-    run_x = sources in ("both", "x", "all", "x-web")
+    run_reddit = sources in REDDIT_SOURCES
+    run_x = sources in X_SOURCES
+
+    # Threads are enriched best first, by expected score, so a deadline or
+    # an open circuit leaves the least promising ones unenriched
+    priors = {} if mock else _subreddit_priors()
+
+    def expected(item: dict) -> float:
+        prior = priors.get(str(item.get("subreddit", "")).lower())
+        return score.expected_reddit_score(item, date_ctx, prior)
+
+    # Streamed searches hand over each Reddit thread as soon as the model has
+    # written it. It is queued for enrichment right away (one at a time, like
+    # the loop below) while the search keeps going; the loop then reuses the
+    # result (each Future holds the enriched item, or None if it was skipped).
+    early = None  # schedule.Scheduler of early enrichment
+    early_lock = threading.Lock()
+    emitted = set()  # Keys already written to the stream
+    on_reddit_item = None
+
+    def emit_reddit(item: dict, current: int, total: Optional[int]):
+        normalized = normalize.filter_by_date_range(
+            normalize.normalize_reddit_items([item], from_date, to_date, date_ctx),
+            from_date, to_date,
+        )
+        if normalized:
+            stream.emit_reddit_item(normalized[0], current, total)
+
+    def enrich_early(key: str, item: dict) -> Optional[dict]:
+        if (deadline and deadline.expired()) or http.is_circuit_open(REDDIT_HOST):
+            return None
+        try:
+            enriched = reddit_enrich.try_enrich_reddit_item(dict(item), deadline=deadline, use_cache=use_cache)
+        except Exception:
+            return None  # The loop below retries and reports it
+        if enriched is None:
+            return None
+        if stream:
+            with early_lock:
+                emitted.add(key)
+                current = len(emitted)
+            emit_reddit(enriched, current, None)
+        return enriched
+
+    if not mock and extract.streaming_enabled():
+        # Early enrichment is worth losing hedging for only when the output
+        # itself shows threads as they are enriched
+        if run_reddit and not top_k and (stream or not hedge.POLICY.enabled):
+            early = schedule.Scheduler(enrich_early, deadline=deadline, name="reddit-enrich")
+
+            def on_reddit_item(item: dict):
+                key = dedupe.canonical_key(item["url"])
+                with early_lock:
+                    if early is None or early.get(key):
+                        return
+                    early.submit(key, item, expected(item))
+                    found = len(early)
+                if progress:
+                    progress.show_found("reddit", found)
+
+        # X posts have no early consumer (the stream shows them once the
+        # search is done), so X keeps the non-streamed, hedged request
 
     # Run Reddit and X searches in parallel
     reddit_future = None
@@ -210,7 +665,7 @@ def run_research(
                 progress.start_reddit()
             reddit_future = executor.submit(
                 _search_reddit, topic, config, selected_models,
-                from_date, to_date, depth, mock
+                search_from or from_date, to_date, depth, mock, deadline, fanout, use_cache, on_reddit_item
             )
 
         if run_x:
@@ -218,63 +673,130 @@ def run_research(
                 progress.start_x()
             x_future = executor.submit(
                 _search_x, topic, config, selected_models,
-                from_date, to_date, depth, mock
+                search_from or from_date, to_date, depth, mock, deadline, use_cache
             )
 
-        # Collect results
-        if reddit_future:
-            try:
-                reddit_items, raw_openai, reddit_error = reddit_future.result()
-                if reddit_error and progress:
-                    progress.show_error(f"Reddit error: {reddit_error}")
-            except Exception as e:
-                reddit_error = f"{type(e).__name__}: {e}"
+        # Collect results as each search finishes, so a streaming consumer
+        # sees X results without waiting on the (slower) Reddit search
+        futures = [f for f in (reddit_future, x_future) if f]
+        for future in as_completed(futures):
+            if future is reddit_future:
+                try:
+                    reddit_items, raw_openai, reddit_error = reddit_future.result()
+                    if reddit_error and progress:
+                        progress.show_error(f"Reddit error: {reddit_error}")
+                except Exception as e:
+                    reddit_error = f"{type(e).__name__}: {e}"
+                    if progress:
+                        progress.show_error(f"Reddit error: {e}")
                 if progress:
-                    progress.show_error(f"Reddit error: {e}")
-            if progress:
-                progress.end_reddit(len(reddit_items))
-
-        if x_future:
-            try:
-                x_items, raw_xai, x_error = x_future.result()
-                if x_error and progress:
-                    progress.show_error(f"X error: {x_error}")
-            except Exception as e:
-                x_error = f"{type(e).__name__}: {e}"
+                    progress.end_reddit(len(reddit_items))
+                if stream and reddit_error:
+                    stream.emit_error("Reddit", reddit_error)
+            else:
+                try:
+                    x_items, raw_xai, x_error = x_future.result()
+                    if x_error and progress:
+                        progress.show_error(f"X error: {x_error}")
+                except Exception as e:
+                    x_error = f"{type(e).__name__}: {e}"
+                    if progress:
+                        progress.show_error(f"X error: {e}")
                 if progress:
-                    progress.show_error(f"X error: {e}")
-            if progress:
-                progress.end_x(len(x_items))
+                    progress.end_x(len(x_items))
+                if stream:
+                    stream.emit_x(process_x_items(x_items, from_date, to_date, date_ctx), x_error)
+
+    # Late items from abandoned fan-out variants are not enriched early, and
+    # queued ones are left to the loop below, which takes them best first
+    with early_lock:
+        pool, early = early, None
+    if pool:
+        pool.close()
+
+    def enrich_items(indices: list, fields: tuple = reddit_enrich.ENRICHED_FIELDS, emit: bool = True):
+        """Enrich reddit_items[i] for each index in order, copying only fields."""
+        total = len(indices)
+        for n, i in enumerate(indices):
+            item = reddit_items[i]
+            key = dedupe.canonical_key(item.get("url", ""))
+            future = pool.get(key) if pool else None
+            enriched = future.result() if future and not future.cancelled() else None
+            if enriched is None:
+                if deadline and deadline.expired():
+                    # Out of budget: keep the remaining items unenriched
+                    if progress:
+                        progress.show_error(f"Deadline reached: {total - n} Reddit threads not enriched")
+                    return
+
+                if not mock and http.is_circuit_open(REDDIT_HOST):
+                    # reddit.com is failing: skip the rest instead of timing out on each
+                    if progress:
+                        progress.show_error(f"Reddit unavailable (circuit open): {total - n} threads not enriched")
+                    return
+
+                if progress and n > 0:
+                    progress.update_reddit_enrich(n + 1, total)
+
+                try:
+                    if mock:
+                        mock_thread = load_fixture("reddit_thread_sample.json")
+                        enriched = reddit_enrich.try_enrich_reddit_item(dict(item), mock_thread)
+                    else:
+                        enriched = reddit_enrich.try_enrich_reddit_item(dict(item), deadline=deadline, use_cache=use_cache)
+                    if enriched is None and progress:
+                        progress.show_error(f"Enrich failed for {item.get('url', 'unknown')}: thread not loaded")
+                except Exception as e:
+                    # Log but don't crash - keep the unenriched item
+                    if progress:
+                        progress.show_error(f"Enrich failed for {item.get('url', 'unknown')}: {e}")
+
+            if enriched is not None:
+                # Copy only the enriched fields: an early copy may come from
+                # another fan-out variant than the better-rated one kept here
+                reddit_items[i] = {**item, **{k: enriched[k] for k in fields if k in enriched}}
+                # Only real enrichments count: the run is complete only if
+                # every thread is in here (see main)
+                raw_reddit_enriched.append(reddit_items[i])
+
+            if stream and emit and key not in emitted:
+                emit_reddit(reddit_items[i], n + 1, total)
 
     # Enrich Reddit items with real data (sequential, but with error handling per-item)
-    if reddit_items:
-        if progress:
-            progress.start_reddit_enrich(1, len(reddit_items))
-
-        for i, item in enumerate(reddit_items):
-            if progress and i > 0:
-                progress.update_reddit_enrich(i + 1, len(reddit_items))
-
-            try:
-                if mock:
-                    mock_thread = load_fixture("reddit_thread_sample.json")
-                    reddit_items[i] = reddit_enrich.enrich_reddit_item(item, mock_thread)
-                else:
-                    reddit_items[i] = reddit_enrich.enrich_reddit_item(item)
-            except Exception as e:
-                # Log but don't crash - keep the unenriched item
-                if progress:
-                    progress.show_error(f"Enrich failed for {item.get('url', 'unknown')}: {e}")
+    try:
+        if reddit_items:
+            if progress:
+                progress.start_reddit_enrich(1, len(reddit_items))
 
-            raw_reddit_enriched.append(reddit_items[i])
+            if top_k:
+                _enrich_top_k(
+                    reddit_items, enrich_items, top_k, from_date, to_date, date_ctx,
+                    mock, deadline, use_cache, raw_reddit_enriched,
+                )
+            else:
+                enrich_items(schedule.by_priority([expected(item) for item in reddit_items]))
 
-        if progress:
-            progress.end_reddit_enrich()
+            if progress:
+                progress.end_reddit_enrich()
+    finally:
+        if pool:
+            pool.close()
 
     return reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error
 
 
-def main():
+def main(
+    argv: Optional[list] = None,
+    use_daemon: bool = True,
+    on_deadline=None,
+):
+    """CLI entry point.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+        use_daemon: Hand the run to a listening daemon if there is one
+        on_deadline: Called with the run's Deadline (lets the daemon cancel it)
+    """
     parser = argparse.ArgumentParser(
         description="Research a topic from the last 30 days on Reddit + X"
     )
@@ -282,9 +804,9 @@ def main():
     parser.add_argument("--mock", action="store_true", help="Use fixtures")
     parser.add_argument(
         "--emit",
-        choices=["compact", "json", "md", "context", "path"],
+        choices=["compact", "json", "md", "context", "path", "stream"],
         default="compact",
-        help="Output mode",
+        help="Output mode (stream: incremental compact blocks as sources complete)",
     )
     parser.add_argument(
         "--sources",
@@ -307,13 +829,87 @@ def main():
         action="store_true",
         help="Enable verbose debug logging",
     )
+    parser.add_argument(
+        "--fanout",
+        action="store_true",
+        help="Search Reddit with several query variants concurrently and merge results",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="End-to-end time budget in seconds; returns partial results when it runs out",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached results and fetch fresh data (the cache is still updated)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only search the days since this topic's last successful run and merge into its stored items",
+    )
+    parser.add_argument(
+        "--top-k",
+        action="store_true",
+        help="Only fully process the items compact/stream/context output shows (same output, fewer thread "
+             "fetches; the saved report keeps only those items and the run is not added to the history store)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=None,
+        help="Token budget for compact/stream/context output: best items by score and source diversity that fit",
+    )
+    parser.add_argument(
+        "--budget-usd",
+        type=float,
+        default=None,
+        help="Budget as input cost in USD (priced at LAST30DAYS_USD_PER_MTOK, default 3.0)",
+    )
     parser.add_argument(
         "--include-web",
         action="store_true",
         help="Include general web search alongside Reddit/X (lower weighted)",
     )
+    parser.add_argument(
+        "--daemon",
+        choices=["serve", "status", "stop"],
+        help="Run (serve), inspect or stop the research daemon",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in-process even if a research daemon is listening",
+    )
+
+    args = parser.parse_args(argv)
 
-    args = parser.parse_args()
+    if args.daemon:
+        from lib import daemon
+
+        if args.daemon == "serve":
+            try:
+                daemon.serve(main)
+            except RuntimeError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            reply = daemon.request({"op": args.daemon})
+            if reply is None:
+                print("No research daemon is running.", file=sys.stderr)
+                sys.exit(1)
+            print(json.dumps(reply, indent=2))
+        return
+
+    # Thin client: let a warm daemon do the work if one is listening
+    if use_daemon and not args.no_daemon and args.topic:
+        from lib import daemon
+
+        code = daemon.run_remote(sys.argv[1:] if argv is None else list(argv))
+        if code is not None:
+            sys.exit(code)
 
     # Enable debug logging if requested
     if args.debug:
@@ -322,6 +918,8 @@ def main():
         from lib import http as http_module
         http_module.DEBUG = True
 
+    from lib import models
+
     # Determine depth
     if args.quick and args.deep:
         print("Error: Cannot use both --quick and --deep", file=sys.stderr)
@@ -333,6 +931,38 @@ def main():
     else:
         depth = "default"
 
+    if args.timeout is not None and not args.timeout > 0:
+        print("Error: --timeout must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    # Top-K mode keeps only the items the output can show
+    top_k = None
+    if args.top_k:
+        if args.emit not in ("compact", "stream", "context"):
+            print("Error: --top-k only works with --emit compact, stream or context", file=sys.stderr)
+            sys.exit(1)
+        if args.incremental:
+            print("Error: Cannot use both --top-k and --incremental", file=sys.stderr)
+            sys.exit(1)
+        top_k = render.COMPACT_LIMIT
+
+    # Token budget for what a model will read
+    budget = args.budget
+    if args.budget is not None or args.budget_usd is not None:
+        from lib import tokens
+
+        if args.budget is not None and args.budget_usd is not None:
+            print("Error: Cannot use both --budget and --budget-usd", file=sys.stderr)
+            sys.exit(1)
+        if args.emit not in ("compact", "stream", "context"):
+            print("Error: --budget only works with --emit compact, stream or context", file=sys.stderr)
+            sys.exit(1)
+        if args.budget_usd is not None:
+            budget = tokens.budget_for_cost(args.budget_usd)
+        if budget <= 0:
+            print("Error: The budget must be positive", file=sys.stderr)
+            sys.exit(1)
+
     if not args.topic:
         print("Error: Please provide a topic to research.", file=sys.stderr)
         print("Usage: python3 last30days.py <topic> [options]", file=sys.stderr)
@@ -361,8 +991,9 @@ def main():
                 print(f"Error: {error}", file=sys.stderr)
                 sys.exit(1)
 
-    # Get date range
-    from_date, to_date = dates.get_date_range(30)
+    # Get date range; "today" is frozen for the rest of the run
+    date_ctx = dates.DateContext.last_days(30)
+    from_date, to_date = date_ctx.from_date, date_ctx.to_date
 
     # Check what keys are missing for promo messaging
     missing_keys = env.get_missing_keys(config)
@@ -409,44 +1040,101 @@ def main():
     else:
         mode = sources
 
-    # Run research
-    reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error = run_research(
-        args.topic,
-        sources,
-        config,
-        selected_models,
-        from_date,
-        to_date,
-        depth,
-        args.mock,
-        progress,
-    )
+    # End-to-end deadline; SIGTERM/SIGINT cancel it so the run stops early
+    # and still writes whatever partial results it has
+    deadline = Deadline(args.timeout)
+    if on_deadline:
+        on_deadline(deadline)
 
-    # Processing phase
-    progress.start_processing()
+    def _cancel(signum, frame):
+        if deadline.cancelled:
+            raise KeyboardInterrupt  # Second signal: stop immediately
+        deadline.cancel()
 
-    # Normalize items
-    normalized_reddit = normalize.normalize_reddit_items(reddit_items, from_date, to_date)
-    normalized_x = normalize.normalize_x_items(x_items, from_date, to_date)
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            signal.signal(sig, _cancel)
+        except (ValueError, OSError):
+            pass
+
+    # Streaming mode writes partial results to stdout as sources complete
+    stream = render.StreamWriter() if args.emit == "stream" else None
+
+    # Scored layer: a warm entry for this exact query skips research entirely
+    scored, scored_age = _load_scored(args, sources, depth, selected_models, from_date, to_date)
+
+    # Incremental mode: search only the days since this topic's last run
+    store = None
+    search_from = from_date
+    if args.incremental and not args.mock and sources != "web":
+        from lib import incremental
+
+        store = incremental.load_store(args.topic, depth)
+        active = [name for name, on in (("reddit", sources in REDDIT_SOURCES), ("x", sources in X_SOURCES)) if on]
+        if not args.refresh:
+            search_from = incremental.search_from(store, active, from_date)
+        if search_from != from_date:
+            stored = sum(len(store[name]["items"]) for name in active)
+            print(f"Note: incremental run, searching {search_from} to {to_date} ({stored} stored items)", file=sys.stderr)
+
+    if scored is not None:
+        progress.show_cached(scored_age)
+        deduped_reddit, deduped_x = scored.reddit, scored.x
+        web_needed = sources in WEB_SEARCH_SOURCES
+        raw_openai, raw_xai, raw_reddit_enriched = None, None, []
+        reddit_error = x_error = None
+        complete = True
+    else:
+        # Run research
+        reddit_items, x_items, web_needed, raw_openai, raw_xai, raw_reddit_enriched, reddit_error, x_error = run_research(
+            args.topic,
+            sources,
+            config,
+            selected_models,
+            from_date,
+            to_date,
+            depth,
+            args.mock,
+            progress,
+            stream,
+            deadline,
+            args.fanout,
+            date_ctx,
+            not args.refresh,
+            search_from,
+            top_k,
+        )
 
-    # Hard date filter: exclude items with verified dates outside the range
-    # This is the safety net - even if prompts let old content through, this filters it
-    filtered_reddit = normalize.filter_by_date_range(normalized_reddit, from_date, to_date)
-    filtered_x = normalize.filter_by_date_range(normalized_x, from_date, to_date)
+        if store is not None:
+            reddit_items, x_items = _update_store(
+                store, sources, reddit_items, x_items, reddit_error, x_error,
+                from_date, to_date, deadline, progress, not args.refresh,
+            )
+
+        if args.debug:
+            http_module.log(f"Rate limiter state: {json.dumps(http_module.get_limiter_state())}")
+            http_module.log(f"Circuit breaker state: {json.dumps(http_module.get_breaker_state())}")
 
-    # Score items
-    scored_reddit = score.score_reddit_items(filtered_reddit)
-    scored_x = score.score_x_items(filtered_x)
+        # Processing phase
+        progress.start_processing()
 
-    # Sort items
-    sorted_reddit = score.sort_items(scored_reddit)
-    sorted_x = score.sort_items(scored_x)
+        deduped_reddit = process_reddit_items(reddit_items, from_date, to_date, date_ctx, top_k)
+        deduped_x = process_x_items(x_items, from_date, to_date, date_ctx, top_k)
+        if top_k and sum(1 for item in deduped_reddit + deduped_x if item.date and item.date >= from_date) < 5:
+            # The "limited recent data" warning counts every item, not just
+            # the top K: process the full lists so it reads the same
+            deduped_reddit = process_reddit_items(reddit_items, from_date, to_date, date_ctx)
+            deduped_x = process_x_items(x_items, from_date, to_date, date_ctx)
 
-    # Dedupe items
-    deduped_reddit = dedupe.dedupe_reddit(sorted_reddit)
-    deduped_x = dedupe.dedupe_x(sorted_x)
+        progress.end_processing()
 
-    progress.end_processing()
+        # Only complete runs are reusable as-is
+        complete = (
+            not reddit_error and not x_error and not deadline.expired()
+            and len(raw_reddit_enriched) == len(reddit_items)
+        )
+        if complete and store is None and not top_k and not args.mock and sources != "web":
+            _save_scored(args, sources, depth, selected_models, from_date, to_date, deduped_reddit, deduped_x)
 
     # Create report
     report = schema.create_report(
@@ -461,21 +1149,39 @@ def main():
     report.x = deduped_x
     report.reddit_error = reddit_error
     report.x_error = x_error
+    if scored is not None:
+        report.from_cache = True
+        report.cache_age_hours = scored_age
+    else:
+        report.top_k = top_k  # Cached results are the full lists
 
     # Generate context snippet
     report.context_snippet_md = render.render_context_snippet(report)
 
-    # Write outputs
-    render.write_outputs(report, raw_openai, raw_xai, raw_reddit_enriched)
+    # Write outputs (run-scoped directory, so concurrent runs don't clobber each other)
+    run_dir = render.write_outputs(report, raw_openai, raw_xai, raw_reddit_enriched)
 
     # Show completion
     if sources == "web":
         progress.show_web_only_complete()
     else:
-        progress.show_complete(len(deduped_reddit), len(deduped_x))
+        progress.show_complete(len(deduped_reddit), len(deduped_x), partial=not complete)
 
     # Output result
-    output_result(report, args.emit, web_needed, args.topic, from_date, to_date, missing_keys)
+    output_result(report, args.emit, web_needed, args.topic, from_date, to_date, missing_keys, run_dir, stream, budget)
+
+    # Append to the local history store (after output, so it never delays
+    # results). Not for --top-k: a store of only the best threads would skew
+    # the subreddit priors
+    if not args.mock and not report.from_cache and not top_k and sources != "web":
+        from lib import history
+
+        if history.enabled():
+            try:
+                history.record_report(report, run_id=run_dir.name if run_dir else None)
+            except Exception as e:
+                if args.debug:
+                    http_module.log(f"History store write failed: {type(e).__name__}: {e}")
 
 
 def output_result(
@@ -486,9 +1192,25 @@ def output_result(
     from_date: str = "",
     to_date: str = "",
     missing_keys: str = "none",
+    run_dir: Optional[Path] = None,
+    stream: Optional[render.StreamWriter] = None,
+    budget: Optional[int] = None,
 ):
-    """Output the result based on emit mode."""
-    if emit_mode == "compact":
+    """Output the result based on emit mode (compact/stream/context cut to budget tokens if given)."""
+    if budget and emit_mode in ("compact", "stream", "context"):
+        if emit_mode == "context":
+            budgeted = render.render_context_budgeted(report, budget)
+        else:
+            budgeted = render.render_compact_budgeted(report, budget, missing_keys=missing_keys)
+        print(f"Note: context budget: {budgeted.summary()}", file=sys.stderr)
+        if emit_mode == "stream":
+            (stream or render.StreamWriter()).emit_final(budgeted.text)
+        else:
+            print(budgeted.text)
+    elif emit_mode == "stream":
+        stream = stream or render.StreamWriter()
+        stream.emit_final(render.render_compact(report, missing_keys=missing_keys))
+    elif emit_mode == "compact":
         print(render.render_compact(report, missing_keys=missing_keys))
     elif emit_mode == "json":
         print(json.dumps(report.to_dict(), indent=2))
@@ -497,7 +1219,7 @@ def output_result(
     elif emit_mode == "context":
         print(report.context_snippet_md)
     elif emit_mode == "path":
-        print(render.get_context_path())
+        print(render.get_context_path(run_dir))
 
     # Output WebSearch instructions if needed
     if web_needed:
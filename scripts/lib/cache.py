@@ -1,11 +1,13 @@
 """Caching utilities for last30days skill."""
 
-import hashlib
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Hashable, Optional, Tuple
 
 CACHE_DIR = Path.home() / ".cache" / "last30days"
 DEFAULT_TTL_HOURS = 24
@@ -19,6 +21,8 @@ def ensure_cache_dir():
 
 def get_cache_key(topic: str, from_date: str, to_date: str, sources: str) -> str:
     """Generate a cache key from query parameters."""
+    import hashlib  # Loads OpenSSL; keep it off the startup path
+
     key_data = f"{topic}|{from_date}|{to_date}|{sources}"
     return hashlib.sha256(key_data.encode()).hexdigest()[:16]
 
@@ -103,13 +107,81 @@ def save_cache(cache_key: str, data: dict):
 
 
 def clear_cache():
-    """Clear all cache files."""
+    """Clear all cache files (including every layer)."""
     if CACHE_DIR.exists():
-        for f in CACHE_DIR.glob("*.json"):
-            try:
-                f.unlink()
-            except OSError:
-                pass
+        for pattern in ("*.json", "*/*.json"):
+            for f in CACHE_DIR.glob(pattern):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+
+
+# Layered cache: each pipeline stage has its own namespace and TTL, so a run
+# reuses whatever stages are still warm and only calls providers for the rest.
+# Engagement numbers move faster than search results, hence the shorter TTLs.
+LAYER_TTL_HOURS = {
+    "openai": DEFAULT_TTL_HOURS,  # Raw Reddit search, per topic/range/depth/model
+    "xai": DEFAULT_TTL_HOURS,  # Raw X search, per topic/range/depth/model
+    "thread": 6,  # Parsed Reddit thread, per post id
+    "scored": 6,  # Final scored items, per topic/range/sources/depth/models
+}
+
+
+def layer_key(*parts: Any) -> str:
+    """Cache key for a layer entry from its identifying parts."""
+    import hashlib  # Loads OpenSSL; keep it off the startup path
+
+    key_data = "|".join("" if p is None else str(p) for p in parts)
+    return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+
+
+def get_layer_path(layer: str, key: str) -> Path:
+    """Get path to a layer entry."""
+    return CACHE_DIR / layer / f"{key}.json"
+
+
+def load_layer(layer: str, key: str, ttl_hours: Optional[float] = None) -> Tuple[Optional[Any], Optional[float]]:
+    """Load a layer entry if it is within TTL.
+
+    Args:
+        layer: Layer name (see LAYER_TTL_HOURS)
+        key: Entry key (see layer_key)
+        ttl_hours: Override the layer's TTL
+
+    Returns:
+        Tuple of (data, age_hours) or (None, None) if missing or stale
+    """
+    path = get_layer_path(layer, key)
+    ttl = LAYER_TTL_HOURS.get(layer, DEFAULT_TTL_HOURS) if ttl_hours is None else ttl_hours
+    if not is_cache_valid(path, ttl):
+        return None, None
+    age = get_cache_age_hours(path)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f), age
+    except (json.JSONDecodeError, OSError):
+        return None, None
+
+
+def save_layer(layer: str, key: str, data: Any):
+    """Save a layer entry.
+
+    Written to a temp file and renamed, so concurrent runs (CLI, daemon,
+    app workers) never read a half-written entry.
+    """
+    path = get_layer_path(layer, key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass  # Silently fail on cache write errors
 
 
 # Model selection cache (longer TTL)
@@ -150,3 +222,66 @@ def set_cached_model(provider: str, model: str):
     cache[provider] = model
     cache['updated_at'] = datetime.now(timezone.utc).isoformat()
     save_model_cache(cache)
+
+
+class MemoryCache:
+    """Thread-safe in-memory LRU cache with a TTL and a size budget.
+
+    Shared by every session of a long-lived process (the Streamlit app).
+    Entries expire after ttl_seconds; when the total size of the stored
+    values exceeds max_bytes, least recently used entries are evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (stored_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] >= self.ttl_seconds:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None):
+        """Store value; size defaults to len() of str/bytes values."""
+        if size is None:
+            size = len(value) if isinstance(value, (str, bytes)) else 1
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return  # Would evict everything else and still not fit
+            self._entries[key] = (self._clock(), size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,433 @@
+"""Research daemon for last30days skill.
+
+A long-running process that serves research runs over a Unix socket, so
+state that is expensive to rebuild survives between runs: imported modules,
+per-host rate limiters and circuit breakers, hedging latency history, the
+Reddit thread cache and model selection.
+
+    python3 last30days.py --daemon=serve    # run in the foreground
+    python3 last30days.py --daemon=status
+    python3 last30days.py --daemon=stop
+
+last30days.py uses a running daemon automatically (unless --no-daemon) and
+falls back to running in-process when none is listening, or when the
+daemon's configuration (API keys, LAST30DAYS_* settings) differs from the
+client's.
+
+Protocol: one JSON object per line in each direction.
+    -> {"op": "research", "argv": [...], "env": {...}, "fingerprint": "..."}
+    <- {"type": "accepted", "job_id": "..."} or {"type": "rejected", "reason": "..."}
+    <- {"type": "stdout" | "stderr", "data": "..."}  (repeated)
+    <- {"type": "exit", "code": 0}
+    -> {"op": "status"}                   <- {"type": "status", ...}
+    -> {"op": "cancel", "job_id": "..."}  <- {"type": "cancel", "ok": true}
+    -> {"op": "stop"}                     <- {"type": "stop", "ok": true}
+
+Research runs one at a time (they share process-wide stdout/stderr and
+environment); later requests queue and show up as such in status.
+"""
+
+import io
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from . import cache
+
+SOCKET_PATH = os.environ.get("LAST30DAYS_DAEMON_SOCKET") or str(cache.CACHE_DIR / "daemon.sock")
+CONNECT_TIMEOUT = 0.5  # Seconds; a live daemon accepts immediately
+
+# Environment that may differ per request (applied for the job's duration);
+# every other LAST30DAYS_* variable must match for the daemon to be used
+PER_REQUEST_ENV = ("LAST30DAYS_RUN_ID", "LAST30DAYS_PROGRESS_EVENTS", "LAST30DAYS_DEBUG")
+# Daemon/client plumbing that doesn't affect research results
+IGNORED_ENV = ("LAST30DAYS_DAEMON_SOCKET",)
+
+EXIT_CANCELLED = 130
+
+
+def _log(msg: str):
+    """Log daemon activity to stderr."""
+    sys.stderr.write(f"[daemon] {msg}\n")
+    sys.stderr.flush()
+
+
+def config_fingerprint() -> str:
+    """Hash of everything a research run's results depend on besides argv.
+
+    Covers the loaded config (API keys, model policy) and LAST30DAYS_*
+    settings, many of which are read once at import time.
+    """
+    import hashlib
+
+    from . import env
+
+    data = {key: value for key, value in env.get_config().items() if value}
+    for key, value in os.environ.items():
+        if key.startswith("LAST30DAYS_") and key not in PER_REQUEST_ENV + IGNORED_ENV:
+            data[key] = value
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _send(sock_file, lock: threading.Lock, message: Dict[str, Any]):
+    """Write one protocol message."""
+    line = (json.dumps(message) + "\n").encode("utf-8")
+    with lock:
+        sock_file.write(line)
+        sock_file.flush()
+
+
+class Job:
+    """One research request, from queued to finished."""
+
+    def __init__(self, argv: List[str], env: Dict[str, str]):
+        self.id = os.urandom(4).hex()
+        self.argv = argv
+        self.env = env
+        self.state = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.exit_code: Optional[int] = None
+        self._deadline = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def attach(self, deadline):
+        """Register the run's Deadline so cancel() can stop it."""
+        with self._lock:
+            self._deadline = deadline
+            if self._cancelled:
+                deadline.cancel()
+
+    def cancel(self):
+        """Cancel the job; a running job stops early with partial results."""
+        with self._lock:
+            self._cancelled = True
+            if self._deadline:
+                self._deadline.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "argv": self.argv,
+            "state": self.state,
+            "cancelled": self._cancelled,
+            "created": round(self.created, 3),
+            "started": round(self.started, 3) if self.started else None,
+        }
+
+
+class _JobStream(io.TextIOBase):
+    """Text stream that forwards writes to the job's client connection."""
+
+    def __init__(self, kind: str, send: Callable[[Dict[str, Any]], None], job: Job):
+        self.kind = kind
+        self._send = send
+        self._job = job
+
+    def write(self, s: str) -> int:
+        if s:
+            try:
+                self._send({"type": self.kind, "data": s})
+            except OSError:
+                # Client went away: nobody will read the result
+                self._job.cancel()
+        return len(s)
+
+    def isatty(self) -> bool:
+        return False
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+
+class Daemon:
+    """Job registry and runner behind the socket server."""
+
+    def __init__(self, main_fn: Callable[..., Any]):
+        """
+        Args:
+            main_fn: last30days main(argv, use_daemon=False, on_deadline=...)
+        """
+        self.main_fn = main_fn
+        self.started = time.time()
+        self.jobs: Dict[str, Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._run_lock = threading.Lock()  # One research run at a time
+
+    def status(self) -> Dict[str, Any]:
+        from . import http
+
+        with self._jobs_lock:
+            jobs = [job.to_dict() for job in self.jobs.values()]
+        return {
+            "type": "status",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 1),
+            "jobs": jobs,
+            "rate_limiters": http.get_limiter_state(),
+            "circuit_breakers": http.get_breaker_state(),
+        }
+
+    def cancel(self, job_id: str) -> bool:
+        with self._jobs_lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def run(self, job: Job, send: Callable[[Dict[str, Any]], None]) -> int:
+        """Run a job (waiting for any running one), streaming its output."""
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+        try:
+            with self._run_lock:
+                if job.cancelled:
+                    return EXIT_CANCELLED
+                job.state = "running"
+                job.started = time.time()
+                job.exit_code = self._run_locked(job, send)
+                return job.exit_code
+        finally:
+            job.state = "done"
+            with self._jobs_lock:
+                self.jobs.pop(job.id, None)
+
+    def _run_locked(self, job: Job, send: Callable[[Dict[str, Any]], None]) -> int:
+        from . import http
+
+        saved_out, saved_err = sys.stdout, sys.stderr
+        saved_debug = http.DEBUG  # --debug turns it on for the process
+        saved_env = {key: os.environ.get(key) for key in PER_REQUEST_ENV}
+        for key in PER_REQUEST_ENV:
+            os.environ.pop(key, None)
+        os.environ.update({k: v for k, v in job.env.items() if k in PER_REQUEST_ENV})
+
+        sys.stdout = _JobStream("stdout", send, job)
+        sys.stderr = _JobStream("stderr", send, job)
+        try:
+            self.main_fn(job.argv, use_daemon=False, on_deadline=job.attach)
+            return 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            print(e.code, file=sys.stderr)
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            sys.stdout.flush()
+            sys.stdout, sys.stderr = saved_out, saved_err
+            http.DEBUG = saved_debug
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def make_server(main_fn: Callable[..., Any], path: str = None):
+    """Bind the daemon's Unix socket server (not yet serving).
+
+    Raises:
+        RuntimeError: If Unix sockets are unsupported or a daemon is already running
+    """
+    import socket
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Daemon mode needs Unix domain sockets, which this platform lacks")
+
+    path = path or SOCKET_PATH
+    if request({"op": "status"}, path) is not None:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    if os.path.exists(path):
+        os.unlink(path)  # Stale socket from a daemon that died
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    daemon = Daemon(main_fn)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lock = threading.Lock()
+
+            def send(message):
+                _send(self.wfile, lock, message)
+
+            line = self.rfile.readline()
+            try:
+                message = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return
+            op = message.get("op") if isinstance(message, dict) else None
+
+            try:
+                if op == "status":
+                    send(daemon.status())
+                elif op == "cancel":
+                    send({"type": "cancel", "ok": daemon.cancel(str(message.get("job_id")))})
+                elif op == "stop":
+                    send({"type": "stop", "ok": True})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                elif op == "research":
+                    self._research(message, send)
+                else:
+                    send({"type": "error", "reason": f"unknown op {op!r}"})
+            except OSError:
+                pass  # Client disconnected
+
+        def _research(self, message, send):
+            if message.get("fingerprint") != config_fingerprint():
+                send({"type": "rejected", "reason": "configuration differs from the daemon's"})
+                return
+            job = Job([str(a) for a in message.get("argv", [])], dict(message.get("env") or {}))
+            send({"type": "accepted", "job_id": job.id})
+            code = daemon.run(job, send)
+            send({"type": "exit", "code": code})
+
+    old_umask = os.umask(0o077)  # Socket is owner-only: jobs use the owner's API keys
+    try:
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    server.research_daemon = daemon
+    return server
+
+
+def serve(main_fn: Callable[..., Any], path: str = None):
+    """Run the daemon in the foreground until stopped (SIGTERM/SIGINT or 'stop')."""
+    from . import ui
+
+    server = make_server(main_fn, path)
+    path = server.server_address
+    # Clients' stderr is a pipe, not this terminal: no spinners
+    ui.IS_TTY = False
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            signal.signal(sig, _stop)
+        except (ValueError, OSError):
+            pass
+
+    _log(f"listening on {path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        _log("stopped")
+
+
+def _connect(path: str):
+    """Connect to the daemon socket, or None if nothing is listening."""
+    if not os.path.exists(path):
+        return None
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def request(message: Dict[str, Any], path: str = None) -> Optional[Dict[str, Any]]:
+    """Send a single-reply request (status/cancel/stop); None if no daemon."""
+    sock = _connect(path or SOCKET_PATH)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as f:
+        try:
+            _send(f, threading.Lock(), message)
+            line = f.readline()
+        except OSError:
+            return None
+    try:
+        return json.loads(line) if line else None
+    except json.JSONDecodeError:
+        return None
+
+
+def run_remote(argv: List[str], path: str = None) -> Optional[int]:
+    """Run research on the daemon, relaying its output to stdout/stderr.
+
+    SIGINT/SIGTERM cancel the remote job (it still returns partial results);
+    a second signal stops waiting.
+
+    Returns:
+        The run's exit code, or None if no daemon accepted the job (the
+        caller should then run in-process)
+    """
+    sock = _connect(path or SOCKET_PATH)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rwb") as f:
+        try:
+            _send(f, threading.Lock(), {
+                "op": "research",
+                "argv": argv,
+                "env": {k: os.environ[k] for k in PER_REQUEST_ENV if k in os.environ},
+                "fingerprint": config_fingerprint(),
+            })
+            reply = json.loads(f.readline() or "null")
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(reply, dict) or reply.get("type") != "accepted":
+            return None
+
+        job_id = reply.get("job_id")
+        cancelled = []
+
+        def _cancel(signum, frame):
+            if cancelled:
+                raise KeyboardInterrupt  # Second signal: stop waiting
+            cancelled.append(signum)
+            request({"op": "cancel", "job_id": job_id}, path)
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                signal.signal(sig, _cancel)
+            except (ValueError, OSError):
+                pass
+
+        for line in f:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = message.get("type")
+            if kind == "stdout":
+                sys.stdout.write(message.get("data", ""))
+                sys.stdout.flush()
+            elif kind == "stderr":
+                sys.stderr.write(message.get("data", ""))
+                sys.stderr.flush()
+            elif kind == "exit":
+                return int(message.get("code") or 0)
+
+    sys.stderr.write("Error: lost connection to the last30days daemon\n")
+    return 1
@@ -1,20 +1,102 @@
 """Date utilities for last30days skill."""
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Tuple
 
+# Timestamp formats tried by parse_date for strings longer than YYYY-MM-DD
+_ISO_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+]
 
-def get_date_range(days: int = 30) -> Tuple[str, str]:
+
+def today_utc() -> date:
+    """Current UTC date."""
+    return datetime.now(timezone.utc).date()
+
+
+def get_date_range(days: int = 30, today: Optional[date] = None) -> Tuple[str, str]:
     """Get the date range for the last N days.
 
+    Args:
+        days: Number of days back from today
+        today: Reference date (default: current UTC date)
+
     Returns:
         Tuple of (from_date, to_date) as YYYY-MM-DD strings
     """
-    today = datetime.now(timezone.utc).date()
+    today = today or today_utc()
     from_date = today - timedelta(days=days)
     return from_date.isoformat(), today.isoformat()
 
 
+@lru_cache(maxsize=4096)
+def date_ordinal(date_str: Optional[str]) -> Optional[int]:
+    """Parse YYYY-MM-DD to a proleptic Gregorian ordinal (None if invalid).
+
+    Cached: the items in a run share a small set of dates, so each distinct
+    string is parsed once.
+    """
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+    except (ValueError, TypeError):
+        return None
+
+
+class DateContext:
+    """Date range and frozen reference date for one research run.
+
+    Created once per run and passed to normalize and score, so every item is
+    judged against the same "today" (no drift across a midnight boundary)
+    and the range bounds are parsed once.
+    """
+
+    def __init__(self, from_date: str, to_date: str, today: Optional[date] = None):
+        """
+        Args:
+            from_date: Start of valid range (YYYY-MM-DD)
+            to_date: End of valid range (YYYY-MM-DD)
+            today: Reference date for recency (default: current UTC date)
+        """
+        self.from_date = from_date
+        self.to_date = to_date
+        self.today = today or today_utc()
+        self.start = date_ordinal(from_date)
+        self.end = date_ordinal(to_date)
+        self.today_ordinal = self.today.toordinal()
+
+    @classmethod
+    def last_days(cls, days: int = 30, today: Optional[date] = None) -> "DateContext":
+        """Context for the last N days, ending on `today`."""
+        today = today or today_utc()
+        from_date, to_date = get_date_range(days, today)
+        return cls(from_date, to_date, today)
+
+    def confidence(self, date_str: Optional[str]) -> str:
+        """'high' if date_str falls inside the range, else 'low'."""
+        ordinal = date_ordinal(date_str)
+        if ordinal is None or self.start is None or self.end is None:
+            return 'low'
+        # Older than range or future date (suspicious) are both 'low'
+        return 'high' if self.start <= ordinal <= self.end else 'low'
+
+    def days_ago(self, date_str: Optional[str]) -> Optional[int]:
+        """Days between date_str and the reference date (None if invalid)."""
+        ordinal = date_ordinal(date_str)
+        if ordinal is None:
+            return None
+        return self.today_ordinal - ordinal
+
+    def recency_score(self, date_str: Optional[str], max_days: int = 30) -> int:
+        """Recency score (0-100) relative to the reference date."""
+        return _recency_from_age(self.days_ago(date_str), max_days)
+
+
 def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     """Parse a date string in various formats.
 
@@ -30,14 +112,9 @@ def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     except (ValueError, TypeError):
         pass
 
-    # Try ISO formats
-    formats = [
-        "%Y-%m-%d",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-    ]
+    # Try ISO formats. A bare date (the common case) can only match one
+    # format, and longer strings can never match it.
+    formats = ["%Y-%m-%d"] if len(date_str) <= 10 else _ISO_FORMATS
 
     for fmt in formats:
         try:
@@ -62,6 +139,8 @@ def timestamp_to_date(ts: Optional[float]) -> Optional[str]:
 def get_date_confidence(date_str: Optional[str], from_date: str, to_date: str) -> str:
     """Determine confidence level for a date.
 
+    Prefer DateContext.confidence when checking many dates against one range.
+
     Args:
         date_str: The date to check (YYYY-MM-DD or None)
         from_date: Start of valid range (YYYY-MM-DD)
@@ -70,24 +149,7 @@ def get_date_confidence(date_str: Optional[str], from_date: str, to_date: str) -
     Returns:
         'high', 'med', or 'low'
     """
-    if not date_str:
-        return 'low'
-
-    try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-        start = datetime.strptime(from_date, "%Y-%m-%d").date()
-        end = datetime.strptime(to_date, "%Y-%m-%d").date()
-
-        if start <= dt <= end:
-            return 'high'
-        elif dt < start:
-            # Older than range
-            return 'low'
-        else:
-            # Future date (suspicious)
-            return 'low'
-    except ValueError:
-        return 'low'
+    return DateContext(from_date, to_date).confidence(date_str)
 
 
 def days_ago(date_str: Optional[str]) -> Optional[int]:
@@ -95,24 +157,14 @@ def days_ago(date_str: Optional[str]) -> Optional[int]:
 
     Returns None if date is invalid or missing.
     """
-    if not date_str:
+    ordinal = date_ordinal(date_str)
+    if ordinal is None:
         return None
+    return today_utc().toordinal() - ordinal
 
-    try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-        today = datetime.now(timezone.utc).date()
-        delta = today - dt
-        return delta.days
-    except ValueError:
-        return None
-
-
-def recency_score(date_str: Optional[str], max_days: int = 30) -> int:
-    """Calculate recency score (0-100).
 
-    0 days ago = 100, max_days ago = 0, clamped.
-    """
-    age = days_ago(date_str)
+def _recency_from_age(age: Optional[int], max_days: int) -> int:
+    """Map an age in days to a 0-100 recency score."""
     if age is None:
         return 0  # Unknown date gets worst score
 
@@ -122,3 +174,11 @@ def recency_score(date_str: Optional[str], max_days: int = 30) -> int:
         return 0
 
     return int(100 * (1 - age / max_days))
+
+
+def recency_score(date_str: Optional[str], max_days: int = 30) -> int:
+    """Calculate recency score (0-100).
+
+    0 days ago = 100, max_days ago = 0, clamped.
+    """
+    return _recency_from_age(days_ago(date_str), max_days)
@@ -0,0 +1,112 @@
+"""End-to-end deadline and cancellation for last30days skill."""
+
+import threading
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the run's time budget is spent or the run was cancelled."""
+
+
+class Deadline:
+    """Time budget plus cancellation token shared by one research run.
+
+    Passed down through run_research, the provider clients and http.request,
+    which shrink their per-call timeouts to whatever budget is left. It also
+    carries the run's allowances of billed extras (see claim).
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        Args:
+            seconds: Total budget in seconds (None = no time limit, cancel only)
+        """
+        # 0 is a budget that is already spent, not "no limit"
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self._cancelled = threading.Event()
+        self._claims_lock = threading.Lock()
+        self._claims = {}  # Allowance name -> units claimed by this run
+        self._children = []  # Cancelled along with this one (see child)
+
+    def child(self) -> "Deadline":
+        """A deadline for part of this run that can be cancelled on its own.
+
+        It shares this run's budget and allowances, and is cancelled when
+        the run is; cancelling it leaves the run alone.
+        """
+        child = Deadline()
+        child.expires_at = self.expires_at
+        child._claims_lock, child._claims = self._claims_lock, self._claims
+        with self._claims_lock:
+            self._children.append(child)
+        if self.cancelled:
+            child.cancel()
+        return child
+
+    def claim(self, name: str, limit: int) -> bool:
+        """Claim one unit of this run's allowance called name, if fewer than limit are taken."""
+        with self._claims_lock:
+            taken = self._claims.get(name, 0)
+            if taken >= limit:
+                return False
+            self._claims[name] = taken + 1
+            return True
+
+    def cancel(self):
+        """Cancel the run (and its children); wakes anything waiting in sleep()."""
+        self._cancelled.set()
+        with self._claims_lock:
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (None if unlimited, 0 if cancelled)."""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """True once the budget is spent or the run is cancelled."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self):
+        """Raise DeadlineExceeded if the run should stop."""
+        if self.cancelled:
+            raise DeadlineExceeded("Research cancelled")
+        if self.expired():
+            raise DeadlineExceeded("Research deadline exceeded")
+
+    def timeout(self, default: float) -> float:
+        """Clamp a per-call timeout to the remaining budget.
+
+        Raises:
+            DeadlineExceeded: If no budget is left
+        """
+        self.check()
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return min(default, remaining)
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleep up to `seconds`, waking early on cancel or expiry.
+
+        Returns:
+            True if the run may continue afterwards
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        if seconds > 0:
+            self._cancelled.wait(seconds)
+        return not self.expired()
+
@@ -1,10 +1,17 @@
 """Near-duplicate detection for last30days skill."""
 
 import re
-from typing import List, Set, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
 
 from . import schema
 
+# Reddit post (t3) id: /comments/<id>/... or the redd.it short link
+REDDIT_POST_ID = re.compile(r'/comments/([a-z0-9]+)(?:[/?#]|$)', re.IGNORECASE)
+REDDIT_SHORT_HOSTS = ("redd.it", "www.redd.it")
+# X/Twitter status id: /<user>/status/<id>, /i/web/status/<id>, /statuses/<id>
+X_STATUS_ID = re.compile(r'/status(?:es)?/(\d+)')
+
 
 def normalize_text(text: str) -> str:
     """Normalize text for comparison.
@@ -19,6 +26,93 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
+def _on_domain(host: str, *domains: str) -> bool:
+    """Whether host is one of domains or a subdomain of one (not e.g. fox.com for x.com)."""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def reddit_post_id(url: str) -> Optional[str]:
+    """Extract the Reddit post id (the t3 id, without prefix) from a URL."""
+    if not url:
+        return None
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    host = (parsed.hostname or "").lower()
+    if host in REDDIT_SHORT_HOSTS:
+        post_id = parsed.path.strip("/").split("/")[0]
+        return post_id.lower() if post_id.isalnum() else None
+    if not _on_domain(host, "reddit.com"):
+        return None
+    match = REDDIT_POST_ID.search(parsed.path)
+    return match.group(1).lower() if match else None
+
+
+def x_status_id(url: str) -> Optional[str]:
+    """Extract the X/Twitter status id from a URL."""
+    if not url:
+        return None
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    host = (parsed.hostname or "").lower()
+    if not _on_domain(host, "x.com", "twitter.com"):
+        return None
+    match = X_STATUS_ID.search(parsed.path)
+    return match.group(1) if match else None
+
+
+def canonical_key(url: str) -> str:
+    """Canonical identity of a Reddit/X URL.
+
+    Host, scheme, case, query string, trailing slash and title slug are all
+    ignored, so e.g. old.reddit.com and www.reddit.com links to the same post
+    map to one key.
+
+    Returns:
+        'reddit:t3_<id>', 'x:<id>', or a normalized host+path for other URLs
+    """
+    post_id = reddit_post_id(url)
+    if post_id:
+        return f"reddit:t3_{post_id}"
+    status_id = x_status_id(url)
+    if status_id:
+        return f"x:{status_id}"
+    try:
+        parsed = urlparse(url or "")
+    except ValueError:
+        return (url or "").lower()
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"url:{host}{parsed.path.lower().rstrip('/')}"
+
+
+def dedupe_by_key(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop raw item dicts that point at the same post/status.
+
+    Order is preserved. When duplicates disagree, the copy with the higher
+    relevance wins, keeping any date the other copy had.
+
+    Args:
+        items: Raw item dicts (with 'url' and optional 'relevance'/'date')
+
+    Returns:
+        Deduplicated list
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        key = canonical_key(item.get("url", ""))
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = item
+        elif item.get("relevance", 0) > existing.get("relevance", 0):
+            merged[key] = {**item, "date": item.get("date") or existing.get("date")}
+    return list(merged.values())
+
+
 def get_ngrams(text: str, n: int = 3) -> Set[str]:
     """Get character n-grams from text."""
     text = normalize_text(text)
@@ -104,6 +198,39 @@ def dedupe_items(
     return [item for idx, item in enumerate(items) if idx not in to_remove]
 
 
+def dedupe_top(
+    items: Iterable[Union[schema.RedditItem, schema.XItem]],
+    k: int,
+    threshold: float = 0.7,
+) -> List[Union[schema.RedditItem, schema.XItem]]:
+    """First k items dedupe_items would keep, comparing only as far as needed.
+
+    dedupe_items drops every item that is a near-duplicate of any
+    higher-ranked one (even one that was itself dropped), so walking the
+    ranked items and comparing each with all items before it keeps exactly
+    the same ones, in the same order. Stops once k are kept: O(m^2) for the
+    m items examined instead of all pairs.
+
+    Args:
+        items: Items ranked best first (e.g. score.iter_sorted)
+        k: Number of items wanted
+        threshold: Similarity threshold
+
+    Returns:
+        Up to k deduplicated items
+    """
+    seen = []
+    kept = []
+    for item in items:
+        ngrams = get_ngrams(get_item_text(item))
+        if not any(jaccard_similarity(other, ngrams) >= threshold for other in seen):
+            kept.append(item)
+            if len(kept) >= k:
+                break
+        seen.append(ngrams)
+    return kept
+
+
 def dedupe_reddit(
     items: List[schema.RedditItem],
     threshold: float = 0.7,
@@ -0,0 +1,352 @@
+"""Provider response extraction for last30days skill.
+
+Shared by the OpenAI (Reddit) and xAI (X) clients:
+- Requests ask for schema-constrained JSON (Responses API `text.format`)
+  where the provider accepts it; a provider that rejects the format is
+  remembered and asked again without it.
+- Output text is pulled from Responses API or chat-completions shaped bodies.
+- Items are recovered one at a time with an incremental JSON scanner, so a
+  truncated response, prose around the JSON or one malformed item loses only
+  the items that are actually broken.
+- Streamed requests (SSE) feed the same scanner with text deltas, so each
+  item is handed on as soon as the model has finished writing it.
+
+Set LAST30DAYS_STRUCTURED_OUTPUT=0 to never request structured output, and
+LAST30DAYS_STREAM_SEARCH=0 to make searches wait for the full response.
+"""
+
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import http
+
+_DECODER = json.JSONDecoder()
+# Start of the items array: `"items": [`
+_ITEMS_ARRAY = re.compile(r'"items"\s*:\s*\[')
+# Boundary between two items of the array: `}, {`
+_ITEM_BOUNDARY = re.compile(r'\}\s*,\s*\{')
+_NEXT_ITEM_OR_END = re.compile(r'[{\]]')
+
+# Providers that rejected a structured-output request this process
+_unsupported = set()
+
+
+def _log(msg: str):
+    sys.stderr.write(f"[EXTRACT] {msg}\n")
+    sys.stderr.flush()
+
+
+def object_schema(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict JSON schema object: every property required, no extras."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def items_format(name: str, item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Responses API `text` parameter asking for {"items": [item, ...]}."""
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": name,
+            "strict": True,
+            "schema": object_schema({"items": {"type": "array", "items": item_schema}}),
+        }
+    }
+
+
+def structured_output_enabled(provider: str) -> bool:
+    """Whether to request structured output from a provider."""
+    if os.environ.get("LAST30DAYS_STRUCTURED_OUTPUT", "1").lower() in ("0", "false", "no", "off"):
+        return False
+    return provider not in _unsupported
+
+
+def streaming_enabled() -> bool:
+    """Whether provider searches should be streamed."""
+    return os.environ.get("LAST30DAYS_STREAM_SEARCH", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _rejects_format(error: http.HTTPError) -> bool:
+    """Whether a request failed because of the `text.format` parameter."""
+    if error.status_code != 400:
+        return False
+    body = (error.body or str(error)).lower()
+    return "format" in body or "schema" in body
+
+
+def _with_format(
+    provider: str,
+    payload: Dict[str, Any],
+    text_format: Optional[Dict[str, Any]],
+    send: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """send(payload + text_format), or send(payload) if the provider rejects it."""
+    if text_format and structured_output_enabled(provider):
+        try:
+            return send({**payload, "text": text_format})
+        except http.HTTPError as e:
+            if not _rejects_format(e):
+                raise
+            _unsupported.add(provider)
+            _log(f"{provider} rejected structured output, retrying without it: {e}")
+    return send(payload)
+
+
+def post(
+    provider: str,
+    url: str,
+    payload: Dict[str, Any],
+    text_format: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """POST a Responses API request, with structured output if supported.
+
+    If the provider rejects `text_format` with a 400, it is not asked for
+    structured output again this process and the request is resent without
+    it (the prompt still asks for the same JSON).
+
+    Args:
+        provider: Provider name ('openai', 'xai')
+        url: Request URL
+        payload: Request body without `text`
+        text_format: `text` parameter to add (see items_format)
+        **kwargs: Passed to http.post
+
+    Returns:
+        Parsed JSON response
+    """
+    return _with_format(provider, payload, text_format, lambda body: http.post(url, body, **kwargs))
+
+
+def response_error(response: Dict[str, Any]) -> Optional[str]:
+    """Error message carried in a response body, if any."""
+    error = response.get("error")
+    if not error:
+        return None
+    return error.get("message", str(error)) if isinstance(error, dict) else str(error)
+
+
+def output_text(response: Dict[str, Any]) -> str:
+    """Model output text of a Responses API (or chat completions) response."""
+    output = response.get("output")
+    if isinstance(output, str):
+        return output
+    if isinstance(output, list):
+        for item in output:
+            text = ""
+            if isinstance(item, dict):
+                if item.get("type") == "message":
+                    for c in item.get("content", []):
+                        if isinstance(c, dict) and c.get("type") == "output_text":
+                            text = c.get("text", "")
+                            break
+                elif "text" in item:
+                    text = item["text"]
+            elif isinstance(item, str):
+                text = item
+            if text:
+                return text
+
+    # Older chat completions format
+    for choice in response.get("choices") or []:
+        if "message" in choice:
+            return choice["message"].get("content", "") or ""
+    return ""
+
+
+class ItemScanner:
+    """Incremental items scanner.
+
+    Feed model output text as it arrives (all at once, or as streamed
+    deltas); each call returns the items completed by that text. Only the
+    unconsumed tail is buffered, so feeding many small deltas stays cheap.
+    """
+
+    def __init__(self):
+        self.found = False  # Whether the items array has started
+        self.done = False  # Whether the items array has ended
+        self._buf = ""
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        if self.done or not text:
+            return []
+        if not self.found:
+            # The key may straddle two chunks: only search the new text plus
+            # a few trailing characters of the old
+            offset = max(0, len(self._buf) - 32)
+            self._buf += text
+            match = _ITEMS_ARRAY.search(self._buf, offset)
+            if match is None:
+                self._buf = self._buf[-32:]
+                return []
+            self.found = True
+            self._buf = self._buf[match.end():]
+        else:
+            self._buf += text
+        return self._scan()
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """Decode array elements from the buffer, keeping any incomplete tail."""
+        text = self._buf
+        end = len(text)
+        pos = 0
+        items = []
+        while pos < end:
+            ch = text[pos]
+            if ch in " \t\r\n,":
+                pos += 1
+            elif ch == "]":
+                self.done = True
+                pos = end
+            elif ch == "{":
+                try:
+                    obj, pos = _DECODER.raw_decode(text, pos)
+                except json.JSONDecodeError:
+                    # Malformed item: resume at the next one. No next one yet
+                    # means it may just be incomplete, so wait for more text.
+                    boundary = _ITEM_BOUNDARY.search(text, pos + 1)
+                    if boundary is None:
+                        break
+                    pos = boundary.end() - 1
+                    continue
+                if isinstance(obj, dict):
+                    items.append(obj)
+            else:
+                # Stray token between items
+                match = _NEXT_ITEM_OR_END.search(text, pos)
+                pos = match.start() if match else end
+        self._buf = text[pos:]
+        return items
+
+
+def _scan_objects(text: str) -> Iterator[Dict[str, Any]]:
+    """Every decodable object with a url anywhere in text (no items array)."""
+    pos = 0
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            return
+        try:
+            obj, pos = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pos = start + 1  # Look inside: nested objects may still decode
+            continue
+        if isinstance(obj, dict) and "url" in obj:
+            yield obj
+
+
+def iter_items(text: str) -> Iterator[Dict[str, Any]]:
+    """Yield each complete item object found in model output text.
+
+    Looks for an `"items": [...]` array and decodes its elements one at a
+    time, skipping malformed ones and stopping at a truncated tail. Without
+    an items array, any object carrying a "url" counts as an item.
+    """
+    scanner = ItemScanner()
+    items = scanner.feed(text)
+    if scanner.found:
+        yield from items
+    else:
+        yield from _scan_objects(text)
+
+
+def parse_items(text: str) -> List[Dict[str, Any]]:
+    """All complete items in model output text (see iter_items)."""
+    return list(iter_items(text)) if text else []
+
+
+def _text_response(text: str) -> Dict[str, Any]:
+    """Responses API shaped body holding only output text."""
+    return {"output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]}
+
+
+def consume_stream(
+    events: Iterable[Tuple[Optional[str], Dict[str, Any]]],
+    on_item: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
+    """Read Responses API stream events, handing each item to on_item as it completes.
+
+    Args:
+        events: (event name, data) pairs, e.g. from http.post_stream
+        on_item: Called with each raw item the moment its JSON closes
+
+    Returns:
+        The final response object (from response.completed/incomplete/failed),
+        or one rebuilt from the streamed text if the stream ended without it
+
+    Raises:
+        http.HTTPError: On a stream-level error event
+    """
+    scanner = ItemScanner()
+    parts = []
+    for event, data in events:
+        kind = data.get("type") or event
+        if kind == "response.output_text.delta":
+            delta = data.get("delta") or ""
+            parts.append(delta)
+            for item in scanner.feed(delta):
+                on_item(item)
+        elif kind in ("response.completed", "response.incomplete", "response.failed"):
+            return data.get("response") or _text_response("".join(parts))
+        elif kind == "error":
+            message = data.get("message") or (data.get("error") or {}).get("message") or json.dumps(data)[:200]
+            raise http.HTTPError(f"Stream error: {message}")
+    return _text_response("".join(parts))
+
+
+def cleaned(
+    clean: Callable[[Any, int], Optional[Dict[str, Any]]],
+    on_item: Callable[[Dict[str, Any]], None],
+) -> Callable[[Dict[str, Any]], None]:
+    """Wrap on_item so it gets items cleaned the way the client's parser does.
+
+    clean(raw_item, index) returns the cleaned item or None to drop it;
+    indexes count raw items, so ids match the parsed final response.
+    """
+    count = [0]
+
+    def handle(item):
+        index = count[0]
+        count[0] += 1
+        clean_item = clean(item, index)
+        if clean_item:
+            on_item(clean_item)
+
+    return handle
+
+
+def stream(
+    provider: str,
+    url: str,
+    payload: Dict[str, Any],
+    on_item: Callable[[Dict[str, Any]], None],
+    text_format: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Streamed counterpart of post(): same request, same final response.
+
+    Items reach on_item while the model is still generating. Structured
+    output is requested and dropped on rejection exactly as in post().
+
+    Args:
+        provider: Provider name ('openai', 'xai')
+        url: Request URL
+        payload: Request body without `text` or `stream`
+        on_item: Called with each raw item as soon as it is complete
+        text_format: `text` parameter to add (see items_format)
+        **kwargs: Passed to http.post_stream
+
+    Returns:
+        The final response object
+    """
+    def send(body):
+        return consume_stream(http.post_stream(url, {**body, "stream": True}, **kwargs), on_item)
+
+    return _with_format(provider, payload, text_format, send)
@@ -0,0 +1,250 @@
+"""Hedged provider requests for last30days skill.
+
+OpenAI web_search and xAI x_search calls have heavy latency tails. When
+hedging is enabled, a call that has not returned by a configurable percentile
+of recent latency gets a duplicate request, and whichever finishes first wins.
+Duplicates are capped per run, since each one is billed.
+
+Enable with LAST30DAYS_HEDGE=1. Tuning:
+    LAST30DAYS_HEDGE_PERCENTILE  Latency percentile that triggers a hedge (default 0.9)
+    LAST30DAYS_HEDGE_MIN_SAMPLES Samples needed before hedging (default 5)
+    LAST30DAYS_HEDGE_MAX_EXTRA   Max duplicate requests per run (default 2)
+"""
+
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from . import cache
+from .deadline import Deadline
+
+# One JSON line per sample, appended: the CLI, the daemon and app workers all
+# record to it, and appends from separate processes don't overwrite each other
+LATENCY_FILE = cache.CACHE_DIR / "latency_history.jsonl"
+MAX_SAMPLES = 50  # Per provider/depth key
+COMPACT_LINES = 2000  # Rewrite the file down to MAX_SAMPLES per key past this
+
+
+def _env_number(name: str, default, cast, valid: Callable[[Any], bool], expected: str):
+    """cast(env var name), or default (with a warning) if malformed or not valid."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        number = None
+    if number is None or not valid(number):
+        sys.stderr.write(f"[HEDGE] Ignoring {name}={value!r} (not {expected}); using {default}\n")
+        return default
+    return number
+
+
+@dataclass
+class HedgePolicy:
+    """When and how often to send duplicate requests."""
+    enabled: bool = False
+    percentile: float = 0.9
+    min_samples: int = 5
+    max_extra: int = 2
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        return cls(
+            enabled=os.environ.get("LAST30DAYS_HEDGE", "").lower() in ("1", "true", "yes"),
+            percentile=_env_number(
+                "LAST30DAYS_HEDGE_PERCENTILE", cls.percentile, float,
+                lambda p: 0 < p <= 1, "a fraction in (0, 1]",
+            ),
+            min_samples=_env_number(
+                "LAST30DAYS_HEDGE_MIN_SAMPLES", cls.min_samples, int,
+                lambda n: n >= 1, "a positive integer",
+            ),
+            max_extra=_env_number(
+                "LAST30DAYS_HEDGE_MAX_EXTRA", cls.max_extra, int,
+                lambda n: n >= 0, "a non-negative integer",
+            ),
+        )
+
+
+POLICY = HedgePolicy.from_env()
+
+_lock = threading.Lock()
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of samples (None if empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _read_samples() -> tuple:
+    """(history, line count) from the latency file, skipping malformed lines."""
+    history: Dict[str, List[float]] = {}
+    lines = 0
+    try:
+        with open(LATENCY_FILE, 'r') as f:
+            for line in f:
+                lines += 1
+                try:
+                    sample = json.loads(line)
+                    history.setdefault(sample["key"], []).append(float(sample["s"]))
+                except (ValueError, KeyError, TypeError):
+                    continue  # A torn or foreign line
+    except OSError:
+        pass
+    return {key: samples[-MAX_SAMPLES:] for key, samples in history.items()}, lines
+
+
+def load_history() -> Dict[str, List[float]]:
+    """Load recorded latencies, keyed by 'provider:depth' (last MAX_SAMPLES each)."""
+    return _read_samples()[0]
+
+
+def _compact():
+    """Rewrite the file keeping the last MAX_SAMPLES per key.
+
+    Runs once every COMPACT_LINES samples or so; a sample another process
+    appends while it runs can be dropped, which only thins the history.
+    """
+    history, lines = _read_samples()
+    if lines <= COMPACT_LINES:
+        return
+    tmp = LATENCY_FILE.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, 'w') as f:
+        for key, samples in history.items():
+            f.writelines(json.dumps({"key": key, "s": s}) + "\n" for s in samples)
+    os.replace(tmp, LATENCY_FILE)
+
+
+def record_latency(key: str, seconds: float):
+    """Append one latency sample to the history.
+
+    Each sample is a single O_APPEND write, so concurrent processes never
+    lose each other's samples.
+    """
+    line = (json.dumps({"key": key, "s": round(seconds, 3)}) + "\n").encode()
+    with _lock:
+        try:
+            cache.ensure_cache_dir()
+            fd = os.open(LATENCY_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size > COMPACT_LINES * len(line):
+                _compact()
+        except OSError:
+            pass  # Silently fail on history write errors
+
+
+def hedge_delay(key: str, policy: HedgePolicy = None) -> Optional[float]:
+    """Seconds to wait before hedging, or None if hedging shouldn't happen."""
+    policy = policy or POLICY
+    if not policy.enabled:
+        return None
+    samples = load_history().get(key, [])
+    if len(samples) < policy.min_samples:
+        return None
+    return percentile(samples, policy.percentile)
+
+
+def _take_budget(policy: HedgePolicy, deadline: Optional[Deadline]) -> bool:
+    """Reserve one duplicate request against the run's spend cap.
+
+    The cap is kept on the run's Deadline, so a long-lived process (daemon,
+    app worker) gets a fresh one per run. A call without a run counts as
+    one on its own.
+    """
+    if deadline is None:
+        return policy.max_extra > 0
+    return deadline.claim("hedge", policy.max_extra)
+
+
+def call(
+    key: str,
+    fn: Callable[[], Any],
+    deadline: Optional[Deadline] = None,
+    policy: HedgePolicy = None,
+) -> Any:
+    """Run fn, hedging with a duplicate call if it is slow.
+
+    Latency of the winning call is recorded under `key` either way, so the
+    history keeps learning even when hedging is off.
+
+    Args:
+        key: Latency history key (e.g. 'openai:default')
+        fn: Zero-argument function making the provider request
+        deadline: Optional run deadline (bounds the wait before hedging and
+            holds the run's duplicate budget)
+        policy: Hedge policy (default: from environment)
+
+    Returns:
+        Result of whichever call finished first successfully
+
+    Raises:
+        deadline.DeadlineExceeded: If the deadline has expired (or the run was
+            cancelled) before a request, primary or duplicate, is sent
+        The last error if every attempt failed
+    """
+    policy = policy or POLICY
+    if deadline:
+        deadline.check()  # Nothing is sent for a run being torn down
+    delay = hedge_delay(key, policy)
+
+    if delay is None:
+        start = time.monotonic()
+        result = fn()
+        record_latency(key, time.monotonic() - start)
+        return result
+
+    # Daemon threads: a losing request must not keep the process alive
+    results: queue.Queue = queue.Queue()
+
+    def _run():
+        start = time.monotonic()
+        try:
+            results.put((True, fn(), time.monotonic() - start))
+        except Exception as e:
+            results.put((False, e, time.monotonic() - start))
+
+    threading.Thread(target=_run, daemon=True).start()
+    in_flight = 1
+
+    wait = delay
+    if deadline and deadline.remaining() is not None:
+        wait = min(wait, deadline.remaining())
+    try:
+        first = results.get(timeout=wait)
+    except queue.Empty:
+        first = None
+        if deadline:
+            # The wait may have ended with the run's budget: then no
+            # duplicate, and no point waiting on the primary either
+            deadline.check()
+        if _take_budget(policy, deadline):
+            threading.Thread(target=_run, daemon=True).start()
+            in_flight += 1
+
+    last_error = None
+    while in_flight:
+        outcome = first if first is not None else results.get()
+        first = None
+        in_flight -= 1
+        ok, value, elapsed = outcome
+        if ok:
+            record_latency(key, elapsed)
+            return value
+        last_error = value
+
+    raise last_error
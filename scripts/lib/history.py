@@ -0,0 +1,408 @@
+"""Historical item store for last30days skill.
+
+Every run appends its Reddit, X and web items (scores, engagement snapshot
+and run metadata) to a local SQLite database with an FTS5 index, so past
+research can be queried without spending API calls (see scripts/history.py).
+
+The store is append-only: an item seen in several runs has one row per run,
+and queries return the latest snapshot of each item unless asked for all.
+
+Set LAST30DAYS_HISTORY=0 to stop recording; LAST30DAYS_HISTORY_DB moves the
+database.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import dedupe, schema, score
+
+_default_db = Path.home() / ".local" / "share" / "last30days" / "history.sqlite3"
+DB_PATH = Path(os.environ["LAST30DAYS_HISTORY_DB"]) if os.environ.get("LAST30DAYS_HISTORY_DB") else _default_db
+
+SOURCES = ("reddit", "x", "web")
+
+PRIOR_WEIGHT = 5  # Pseudo-count pulling thin subreddit priors towards the default
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT,
+    topic TEXT NOT NULL,
+    range_from TEXT,
+    range_to TEXT,
+    mode TEXT,
+    generated_at TEXT,
+    recorded_at TEXT NOT NULL,
+    openai_model TEXT,
+    xai_model TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    run INTEGER NOT NULL REFERENCES runs (id),
+    source TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    url TEXT,
+    title TEXT,
+    body TEXT,
+    subreddit TEXT,
+    author TEXT,
+    domain TEXT,
+    date TEXT,
+    date_confidence TEXT,
+    relevance REAL,
+    score INTEGER,
+    engagement TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_key ON items (item_key, id);
+CREATE INDEX IF NOT EXISTS items_date ON items (date);
+CREATE INDEX IF NOT EXISTS items_subreddit ON items (subreddit COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS items_author ON items (author COLLATE NOCASE);
+-- Kept up to date by record_report so subreddit_priors never scans items:
+-- each Reddit thread's latest engagement subscore, and per-subreddit sums
+CREATE TABLE IF NOT EXISTS reddit_latest (
+    item_key TEXT PRIMARY KEY,
+    subreddit TEXT NOT NULL,
+    engagement REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subreddit_engagement (
+    subreddit TEXT PRIMARY KEY,
+    threads INTEGER NOT NULL,
+    total REAL NOT NULL
+);
+"""
+# PRAGMA user_version once the summary tables above cover every stored row
+_SCHEMA_VERSION = 1
+
+# Full-text index over item text and the run topic; rowid = items.id
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(title, body, topic)"
+
+
+def enabled() -> bool:
+    """Whether runs should be recorded (LAST30DAYS_HISTORY != 0)."""
+    return os.environ.get("LAST30DAYS_HISTORY", "1").lower() not in ("0", "false", "no", "off")
+
+
+def connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """Open (and create if needed) the history database."""
+    path = Path(path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    try:
+        conn.execute(_FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        pass  # SQLite built without FTS5: search() falls back to LIKE
+    if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+        _backfill_summaries(conn)
+    return conn
+
+
+def _backfill_summaries(conn: sqlite3.Connection):
+    """Fill the Reddit summary tables from a store recorded before they existed (once)."""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return  # Another process got here first
+        conn.execute("DELETE FROM reddit_latest")
+        latest = (
+            "SELECT item_key, subreddit, data FROM items"
+            " WHERE id IN (SELECT MAX(id) FROM items WHERE source = 'reddit' GROUP BY item_key)"
+        )
+        try:
+            conn.execute(
+                "INSERT INTO reddit_latest (item_key, subreddit, engagement)"
+                " SELECT item_key, LOWER(COALESCE(subreddit, '')),"
+                f" COALESCE(json_extract(data, '$.subs.engagement'), 0) FROM ({latest})"
+            )
+        except sqlite3.OperationalError:  # SQLite built without JSON functions
+            conn.executemany(
+                "INSERT INTO reddit_latest (item_key, subreddit, engagement) VALUES (?, ?, ?)",
+                (
+                    (row["item_key"], (row["subreddit"] or "").lower(),
+                     (json.loads(row["data"]).get("subs") or {}).get("engagement") or 0)
+                    for row in conn.execute(latest).fetchall()
+                ),
+            )
+        conn.execute("DELETE FROM subreddit_engagement")
+        conn.execute(
+            "INSERT INTO subreddit_engagement (subreddit, threads, total)"
+            " SELECT subreddit, COUNT(*), SUM(engagement) FROM reddit_latest GROUP BY subreddit"
+        )
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+
+def _update_summaries(conn: sqlite3.Connection, item_key: str, subreddit: Optional[str], engagement: float):
+    """Make this snapshot its thread's latest in the Reddit summary tables."""
+    subreddit = (subreddit or "").lower()
+    previous = conn.execute(
+        "SELECT subreddit, engagement FROM reddit_latest WHERE item_key = ?", (item_key,)
+    ).fetchone()
+    if previous is not None:
+        conn.execute(
+            "UPDATE subreddit_engagement SET threads = threads - 1, total = total - ? WHERE subreddit = ?",
+            (previous["engagement"], previous["subreddit"]),
+        )
+    conn.execute(
+        "INSERT OR REPLACE INTO reddit_latest (item_key, subreddit, engagement) VALUES (?, ?, ?)",
+        (item_key, subreddit, engagement),
+    )
+    conn.execute(
+        "INSERT INTO subreddit_engagement (subreddit, threads, total) VALUES (?, 1, ?)"
+        " ON CONFLICT (subreddit) DO UPDATE SET threads = threads + 1, total = total + excluded.total",
+        (subreddit, engagement),
+    )
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'items_fts'").fetchone()
+    return row is not None
+
+
+def _item_row(source: str, item: Any) -> Dict[str, Any]:
+    """Flatten a schema item into the items table's columns."""
+    data = item.to_dict()
+    row = {
+        "source": source,
+        "item_key": dedupe.canonical_key(item.url) or f"{source}:{item.id}",
+        "url": item.url,
+        "subreddit": None,
+        "author": None,
+        "domain": None,
+        "date": item.date,
+        "date_confidence": item.date_confidence,
+        "relevance": item.relevance,
+        "score": item.score,
+        "engagement": json.dumps(data.get("engagement")) if data.get("engagement") else None,
+        "data": json.dumps(data),
+    }
+    if isinstance(item, schema.RedditItem):
+        row.update(
+            title=item.title,
+            body=" ".join([item.why_relevant] + list(item.comment_insights)),
+            subreddit=item.subreddit,
+        )
+    elif isinstance(item, schema.XItem):
+        row.update(title=item.text, body=item.why_relevant, author=item.author_handle.lstrip("@"))
+    else:
+        row.update(title=item.title, body=f"{item.snippet} {item.why_relevant}", domain=item.source_domain)
+    return row
+
+
+def record_report(report: schema.Report, run_id: Optional[str] = None, path: Optional[Path] = None) -> int:
+    """Append a report's items to the store.
+
+    Args:
+        report: Finished report
+        run_id: Run directory name (ties rows to out/runs/<run_id>)
+        path: Database path (default: DB_PATH)
+
+    Returns:
+        Number of items recorded
+    """
+    conn = connect(path)
+    try:
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO runs (run_id, topic, range_from, range_to, mode, generated_at, recorded_at,"
+                " openai_model, xai_model) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, report.topic, report.range_from, report.range_to, report.mode,
+                    report.generated_at, datetime.now(timezone.utc).isoformat(),
+                    report.openai_model_used, report.xai_model_used,
+                ),
+            )
+            run = cur.lastrowid
+            fts = _has_fts(conn)
+            count = 0
+            for source, items in (("reddit", report.reddit), ("x", report.x), ("web", report.web)):
+                for item in items:
+                    row = _item_row(source, item)
+                    columns = ["run"] + list(row)
+                    cur = conn.execute(
+                        f"INSERT INTO items ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                        [run] + list(row.values()),
+                    )
+                    if fts:
+                        conn.execute(
+                            "INSERT INTO items_fts (rowid, title, body, topic) VALUES (?, ?, ?, ?)",
+                            (cur.lastrowid, row["title"], row["body"], report.topic),
+                        )
+                    if source == "reddit":
+                        _update_summaries(conn, row["item_key"], row["subreddit"], item.subs.engagement)
+                    count += 1
+        return count
+    finally:
+        conn.close()
+
+
+def _fts_query(text: str) -> str:
+    """Quote each word so user input can't break FTS5 query syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def search(
+    text: Optional[str] = None,
+    topic: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    source: Optional[str] = None,
+    subreddit: Optional[str] = None,
+    author: Optional[str] = None,
+    limit: int = 25,
+    all_snapshots: bool = False,
+    path: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """Query stored items.
+
+    Args:
+        text: Words that must all appear in the item text or run topic
+        topic: Substring of the run topic (case-insensitive)
+        since: Earliest item date (YYYY-MM-DD)
+        until: Latest item date (YYYY-MM-DD)
+        source: 'reddit', 'x' or 'web'
+        subreddit: Subreddit name (with or without r/)
+        author: X handle (with or without @)
+        limit: Max items returned
+        all_snapshots: Return every recorded snapshot, not just the latest per item
+        path: Database path (default: DB_PATH)
+
+    Returns:
+        Item dicts (the stored item plus source, topic, run_id and recorded_at),
+        best score first
+    """
+    path = Path(path or DB_PATH)
+    if not path.exists():
+        return []
+
+    where, args = [], []
+    conn = connect(path)
+    try:
+        if text:
+            if _has_fts(conn):
+                where.append("i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)")
+                args.append(_fts_query(text))
+            else:
+                for word in text.split():
+                    where.append("(i.title LIKE ? OR i.body LIKE ? OR r.topic LIKE ?)")
+                    args.extend([f"%{word}%"] * 3)
+        if topic:
+            where.append("r.topic LIKE ?")
+            args.append(f"%{topic}%")
+        if since:
+            where.append("i.date >= ?")
+            args.append(since)
+        if until:
+            where.append("i.date <= ?")
+            args.append(until)
+        if source:
+            where.append("i.source = ?")
+            args.append(source)
+        if subreddit:
+            where.append("i.subreddit = ? COLLATE NOCASE")
+            args.append(subreddit.split("/")[-1])
+        if author:
+            where.append("i.author = ? COLLATE NOCASE")
+            args.append(author.lstrip("@"))
+
+        sql = "SELECT i.*, r.topic, r.run_id, r.recorded_at FROM items i JOIN runs r ON r.id = i.run"
+        if not all_snapshots:
+            # Latest snapshot first, filters second: an older snapshot that
+            # matches must not stand in for a newer one that doesn't
+            where.insert(0, "i.id IN (SELECT MAX(id) FROM items GROUP BY item_key)")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY i.score DESC, i.date DESC, i.id DESC LIMIT ?"
+        args.append(limit)
+
+        results = []
+        for row in conn.execute(sql, args):
+            item = json.loads(row["data"])
+            item.update(source=row["source"], topic=row["topic"], run_id=row["run_id"], recorded_at=row["recorded_at"])
+            results.append(item)
+        return results
+    finally:
+        conn.close()
+
+
+def stats(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Counts of runs, item snapshots and distinct items per source."""
+    path = Path(path or DB_PATH)
+    result = {"runs": 0, "items": {source: 0 for source in SOURCES}, "snapshots": 0, "fts": False}
+    if not path.exists():
+        return result
+    conn = connect(path)
+    try:
+        result["runs"] = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        result["snapshots"] = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        for source, count in conn.execute(
+            "SELECT source, COUNT(DISTINCT item_key) FROM items GROUP BY source"
+        ):
+            result["items"][source] = count
+        result["fts"] = _has_fts(conn)
+        return result
+    finally:
+        conn.close()
+
+
+def subreddit_priors(path: Optional[Path] = None) -> Dict[str, float]:
+    """Expected engagement subscore (0-100) of a thread, per subreddit.
+
+    The mean engagement subscore of each subreddit's stored threads (latest
+    snapshot of each), shrunk towards score.DEFAULT_ENGAGEMENT by
+    PRIOR_WEIGHT pseudo-threads so one lucky thread doesn't dominate. Read
+    from the per-subreddit sums record_report keeps, so the cost doesn't
+    grow with the store.
+
+    Args:
+        path: Database path (default: DB_PATH)
+
+    Returns:
+        Dict of lowercased subreddit name -> prior; empty without a store
+    """
+    path = Path(path or DB_PATH)
+    if not path.exists():
+        return {}
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT subreddit, threads, total FROM subreddit_engagement WHERE subreddit != '' AND threads > 0"
+        ).fetchall()
+    finally:
+        conn.close()
+    return {
+        name: (total + PRIOR_WEIGHT * score.DEFAULT_ENGAGEMENT) / (count + PRIOR_WEIGHT)
+        for name, count, total in rows
+    }
+
+
+def render_results(items: List[Dict[str, Any]]) -> str:
+    """Markdown list of search results."""
+    if not items:
+        return "No matching items in history."
+    lines = []
+    for item in items:
+        source = item["source"]
+        engagement = item.get("engagement") or {}
+        if source == "reddit":
+            where = f"r/{item.get('subreddit', '')}"
+            title = item.get("title", "")
+            stats_str = f"{engagement.get('score', '?')}pts, {engagement.get('num_comments', '?')}cmt" if engagement else ""
+        elif source == "x":
+            where = f"@{item.get('author_handle', '').lstrip('@')}"
+            title = item.get("text", "")[:120]
+            stats_str = f"{engagement.get('likes', '?')}likes, {engagement.get('reposts', '?')}rt" if engagement else ""
+        else:
+            where = item.get("source_domain", "")
+            title = item.get("title", "")
+            stats_str = ""
+        meta = " | ".join(part for part in (item.get("date") or "date unknown", stats_str, f"score {item.get('score', 0)}") if part)
+        lines.append(f"- **[{source}]** {where} ({meta}) {title}")
+        lines.append(f"  {item.get('url', '')}  _topic: {item['topic']}_")
+    return "\n".join(lines)
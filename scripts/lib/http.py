@@ -2,12 +2,15 @@
 
 import json
 import os
+import random
+import re
 import sys
+import threading
 import time
-import urllib.error
-import urllib.request
-from typing import Any, Dict, Optional
-from urllib.parse import urlencode
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+from .deadline import Deadline, DeadlineExceeded
 
 DEFAULT_TIMEOUT = 30
 DEBUG = os.environ.get("LAST30DAYS_DEBUG", "").lower() in ("1", "true", "yes")
@@ -20,8 +23,32 @@ def log(msg: str):
         sys.stderr.flush()
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
 USER_AGENT = "last30days-skill/1.0 (Claude Code Skill)"
 
+# Per-host request pacing: (requests per second, burst). Rates adapt at
+# runtime from rate-limit headers and 429s; these are the starting points.
+DEFAULT_HOST_RATE = (5.0, 10)
+HOST_RATES = {
+    "www.reddit.com": (1.0, 5),
+    "api.openai.com": (2.0, 5),
+    "api.x.ai": (2.0, 5),
+}
+MIN_RATE = 0.05  # Never slow a host below one request per 20 s
+
+# Per-host circuit breaker: open after BREAKER_MIN_FAILURES failures that make
+# up at least BREAKER_FAILURE_RATIO of calls in the last BREAKER_WINDOW
+# seconds; stay open for BREAKER_COOLDOWN seconds, then let one probe through.
+BREAKER_WINDOW = 60.0
+BREAKER_MIN_FAILURES = 4
+BREAKER_FAILURE_RATIO = 0.5
+BREAKER_COOLDOWN = 30.0
+
+# Stand-in upstream (see lib/standin.py): when set, requests are sent to this
+# server instead, with the real host as the first path segment. Rate limits
+# and circuit breakers still apply per real host.
+UPSTREAM_ENV = "LAST30DAYS_UPSTREAM"
+
 
 class HTTPError(Exception):
     """HTTP request error with status code."""
@@ -31,6 +58,343 @@ class HTTPError(Exception):
         self.body = body
 
 
+class CircuitOpenError(HTTPError):
+    """Request refused without being sent because the host's circuit is open."""
+
+
+class RateLimiter:
+    """Adaptive token bucket for one host, shared by all threads.
+
+    Tokens refill at `rate` per second up to `capacity`. A 429 halves the
+    rate and blocks the host until Retry-After; successes creep the rate
+    back up (AIMD). Rate-limit headers (Reddit's x-ratelimit-*, OpenAI/xAI's
+    x-ratelimit-*-requests) set the rate directly when present.
+    """
+
+    def __init__(self, host: str, rate: float, capacity: int):
+        self.host = host
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0  # 429s seen
+        self.waited = 0.0  # Total seconds callers spent waiting
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate, self.blocked_until - now)
+            self.waited += wait
+            return wait
+
+    def acquire(self, deadline: Optional[Deadline] = None):
+        """Block until a request may be sent to this host."""
+        wait = self.reserve()
+        if wait > 0:
+            log(f"Rate limit: waiting {wait:.2f}s for {self.host}")
+            _sleep(wait, deadline)
+
+    def on_response(self, status: int, headers: Optional[Any] = None) -> Optional[float]:
+        """Learn from a response. Returns Retry-After seconds, if any."""
+        retry_after = parse_retry_after(headers)
+        with self.lock:
+            now = time.monotonic()
+            learned = _rate_from_headers(headers)
+            if status == 429:
+                self.throttled += 1
+                self.rate = max(MIN_RATE, self.rate / 2)
+                self.tokens = min(self.tokens, 0.0)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, now + retry_after)
+            elif learned is not None:
+                self.rate = max(MIN_RATE, min(self.max_rate, learned))
+            elif status < 400:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+        return retry_after
+
+    def state(self) -> Dict[str, Any]:
+        """Snapshot for instrumentation."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "tokens": round(self.tokens, 2),
+                "blocked_for": round(max(0.0, self.blocked_until - now), 2),
+                "throttled": self.throttled,
+                "waited": round(self.waited, 2),
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host: str) -> RateLimiter:
+    """Get (or create) the shared limiter for a host."""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            rate, capacity = HOST_RATES.get(host, DEFAULT_HOST_RATE)
+            limiter = _limiters[host] = RateLimiter(host, rate, capacity)
+        return limiter
+
+
+def get_limiter_state() -> Dict[str, Dict[str, Any]]:
+    """Current state of every host limiter, keyed by host."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.state() for limiter in limiters}
+
+
+def _header(headers: Optional[Any], name: str) -> Optional[str]:
+    if headers is None:
+        return None
+    try:
+        return headers.get(name)
+    except AttributeError:
+        return None
+
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {"ms": 0.001, "h": 3600, "m": 60, "s": 1}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse '12', '1.5', '6m0s' or '250ms' style durations to seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+def parse_retry_after(headers: Optional[Any]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = _header(headers, "Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _rate_from_headers(headers: Optional[Any]) -> Optional[float]:
+    """Sustainable request rate implied by rate-limit headers, if present."""
+    for remaining_name, reset_name in (
+        ("x-ratelimit-remaining", "x-ratelimit-reset"),  # Reddit
+        ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),  # OpenAI / xAI
+    ):
+        remaining = _header(headers, remaining_name)
+        reset = _header(headers, reset_name)
+        if remaining is None or reset is None:
+            continue
+        try:
+            remaining_f = float(remaining)
+        except ValueError:
+            continue
+        reset_s = _parse_duration(reset)
+        if not reset_s:
+            continue
+        return remaining_f / reset_s
+    return None
+
+
+def _sleep(seconds: float, deadline: Optional[Deadline] = None):
+    if deadline:
+        deadline.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one host.
+
+    Failures are 5xx responses and connection-level errors (timeouts,
+    resets, DNS); 4xx responses, including 429, count as successes since the
+    host is up. While open, calls fail instantly with CircuitOpenError.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host: str,
+        window: float = BREAKER_WINDOW,
+        min_failures: int = BREAKER_MIN_FAILURES,
+        failure_ratio: float = BREAKER_FAILURE_RATIO,
+        cooldown: float = BREAKER_COOLDOWN,
+    ):
+        self.host = host
+        self.window = window
+        self.min_failures = min_failures
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.events: List[Tuple[float, bool]] = []  # (time, ok) within window
+        self.metrics = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self.lock = threading.Lock()
+
+    def _trim(self, now: float):
+        cutoff = now - self.window
+        while self.events and self.events[0][0] < cutoff:
+            self.events.pop(0)
+
+    def check(self):
+        """Fail fast if calls are currently refused (doesn't reserve a probe).
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self.lock:
+            now = time.monotonic()
+            refusing = (
+                (self.state == self.OPEN and now - self.opened_at < self.cooldown)
+                or (self.state == self.HALF_OPEN and self.probe_in_flight)
+            )
+            if refusing:
+                self.metrics["rejected"] += 1
+                raise self._open_error(now)
+
+    def _open_error(self, now: float) -> CircuitOpenError:
+        retry_in = max(0.0, self.cooldown - (now - self.opened_at))
+        return CircuitOpenError(
+            f"Circuit open for {self.host}: too many recent failures "
+            f"(retry in {retry_in:.0f}s)"
+        )
+
+    def allow(self):
+        """Check whether a call may proceed, reserving the half-open probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a half-open probe is
+                already in flight)
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return
+            if self.state != self.CLOSED:
+                self.metrics["rejected"] += 1
+                raise self._open_error(now)
+
+    def record(self, ok: bool):
+        """Record the outcome of a call that was allowed through."""
+        with self.lock:
+            now = time.monotonic()
+            self.metrics["successes" if ok else "failures"] += 1
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+                if ok:
+                    self.state = self.CLOSED
+                    self.events = []
+                else:
+                    self._open(now)
+                return
+
+            self.events.append((now, ok))
+            self._trim(now)
+            failures = sum(1 for _, event_ok in self.events if not event_ok)
+            if (
+                self.state == self.CLOSED
+                and failures >= self.min_failures
+                and failures / len(self.events) >= self.failure_ratio
+            ):
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self.opened_at = now
+        self.metrics["opened"] += 1
+        log(f"Circuit opened for {self.host}")
+
+    def is_open(self) -> bool:
+        """True while calls to this host are being refused."""
+        with self.lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.cooldown
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and metrics for instrumentation."""
+        with self.lock:
+            now = time.monotonic()
+            self._trim(now)
+            return {
+                "state": self.state,
+                "window_calls": len(self.events),
+                "window_failures": sum(1 for _, ok in self.events if not ok),
+                **self.metrics,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Get (or create) the shared circuit breaker for a host."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+def is_circuit_open(url_or_host: str) -> bool:
+    """True if requests to this URL's host are currently being refused."""
+    host = urlparse(url_or_host).netloc.lower() if "://" in url_or_host else url_or_host.lower()
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+    return breaker.is_open() if breaker else False
+
+
+def get_breaker_state() -> Dict[str, Dict[str, Any]]:
+    """Current state and metrics of every host circuit breaker, keyed by host."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.host: breaker.snapshot() for breaker in breakers}
+
+
+def upstream_url(url: str) -> str:
+    """Where a request for url is actually sent (rewritten by LAST30DAYS_UPSTREAM)."""
+    base = os.environ.get(UPSTREAM_ENV)
+    if not base:
+        return url
+    parts = urlparse(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return f"{base.rstrip('/')}/{parts.netloc}{path}"
+
+
 def request(
     method: str,
     url: str,
@@ -38,6 +402,7 @@ def request(
     json_data: Optional[Dict[str, Any]] = None,
     timeout: int = DEFAULT_TIMEOUT,
     retries: int = MAX_RETRIES,
+    deadline: Optional[Deadline] = None,
 ) -> Dict[str, Any]:
     """Make an HTTP request and return JSON response.
 
@@ -48,13 +413,22 @@ def request(
         json_data: Optional JSON body (for POST)
         timeout: Request timeout in seconds
         retries: Number of retries on failure
+        deadline: Optional run deadline; each attempt's timeout is clamped
+            to the remaining budget and retries stop once it is spent
 
     Returns:
         Parsed JSON response
 
     Raises:
         HTTPError: On request failure
+        CircuitOpenError: If the host's circuit breaker is open
+        DeadlineExceeded: If the deadline is spent or the run was cancelled
     """
+    # urllib.request pulls in http.client, ssl and email (~20 ms); only pay
+    # for it once a request is actually made
+    import urllib.error
+    import urllib.request
+
     headers = headers or {}
     headers.setdefault("User-Agent", USER_AGENT)
 
@@ -63,18 +437,37 @@ def request(
         data = json.dumps(json_data).encode('utf-8')
         headers.setdefault("Content-Type", "application/json")
 
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    req = urllib.request.Request(upstream_url(url), data=data, headers=headers, method=method)
 
     log(f"{method} {url}")
     if json_data:
         log(f"Payload keys: {list(json_data.keys())}")
 
+    host = urlparse(url).netloc.lower()
+    limiter = get_limiter(host)
+    breaker = get_breaker(host)
+
     last_error = None
     for attempt in range(retries):
+        # Fail fast while the host is known to be down
+        breaker.check()
+        # Pace requests to this host across all threads
+        limiter.acquire(deadline)
+        attempt_timeout = timeout
+        if deadline:
+            try:
+                attempt_timeout = deadline.timeout(timeout)
+            except DeadlineExceeded:
+                if last_error:
+                    log(f"Deadline reached after: {last_error}")
+                raise
+        breaker.allow()
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as response:
+            with urllib.request.urlopen(req, timeout=attempt_timeout) as response:
                 body = response.read().decode('utf-8')
                 log(f"Response: {response.status} ({len(body)} bytes)")
+                limiter.on_response(response.status, getattr(response, "headers", None))
+                breaker.record(True)
                 return json.loads(body) if body else {}
         except urllib.error.HTTPError as e:
             body = None
@@ -86,18 +479,21 @@ def request(
             if body:
                 log(f"Error body: {body[:500]}")
             last_error = HTTPError(f"HTTP {e.code}: {e.reason}", e.code, body)
+            retry_after = limiter.on_response(e.code, e.headers)
+            breaker.record(e.code < 500)
 
             # Don't retry client errors (4xx) except rate limits
             if 400 <= e.code < 500 and e.code != 429:
                 raise last_error
 
             if attempt < retries - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+                _backoff(attempt, deadline, retry_after)
         except urllib.error.URLError as e:
             log(f"URL Error: {e.reason}")
+            breaker.record(False)
             last_error = HTTPError(f"URL Error: {e.reason}")
             if attempt < retries - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+                _backoff(attempt, deadline)
         except json.JSONDecodeError as e:
             log(f"JSON decode error: {e}")
             last_error = HTTPError(f"Invalid JSON response: {e}")
@@ -105,15 +501,36 @@ def request(
         except (OSError, TimeoutError, ConnectionResetError) as e:
             # Handle socket-level errors (connection reset, timeout, etc.)
             log(f"Connection error: {type(e).__name__}: {e}")
+            breaker.record(False)
             last_error = HTTPError(f"Connection error: {type(e).__name__}: {e}")
             if attempt < retries - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+                _backoff(attempt, deadline)
+        except BaseException:
+            # Anything else (IncompleteRead, a bad body, DeadlineExceeded,
+            # ...) still settles the attempt: a claimed half-open probe that
+            # is never recorded would refuse the host for good
+            breaker.record(False)
+            raise
 
     if last_error:
         raise last_error
     raise HTTPError("Request failed with no error details")
 
 
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Retry delay: Retry-After if given, else jittered exponential backoff."""
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_DELAY)
+    base = min(MAX_RETRY_DELAY, RETRY_DELAY * (2 ** attempt))
+    # "Equal jitter": keep half the delay, randomize the rest
+    return base / 2 + random.uniform(0, base / 2)
+
+
+def _backoff(attempt: int, deadline: Optional[Deadline] = None, retry_after: Optional[float] = None):
+    """Sleep before a retry (cut short by the deadline, if any)."""
+    _sleep(backoff_delay(attempt, retry_after), deadline)
+
+
 def get(url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Dict[str, Any]:
     """Make a GET request."""
     return request("GET", url, headers=headers, **kwargs)
@@ -124,11 +541,135 @@ def post(url: str, json_data: Dict[str, Any], headers: Optional[Dict[str, str]]
     return request("POST", url, headers=headers, json_data=json_data, **kwargs)
 
 
-def get_reddit_json(path: str) -> Dict[str, Any]:
+def parse_sse(lines: Iterable[bytes]) -> Iterator[Tuple[Optional[str], str]]:
+    """Split a server-sent-event byte stream into (event name, data) pairs.
+
+    Comment lines are skipped and multi-line data fields are joined with
+    newlines, per the SSE spec.
+    """
+    event, data = None, []
+    for raw in lines:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = None, []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
+
+def post_stream(
+    url: str,
+    json_data: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    retries: int = MAX_RETRIES,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    """POST a JSON body and yield the server-sent events of the response.
+
+    Connecting follows the same rate limiter, circuit breaker and retry
+    policy as request(); once events have started arriving nothing is
+    retried. `timeout` bounds both each read and the whole stream.
+
+    Yields:
+        (event name, decoded JSON data) per event; the "[DONE]" sentinel
+        ends the stream
+
+    Raises:
+        HTTPError: On request failure, or if the stream breaks or runs too long
+        CircuitOpenError: If the host's circuit breaker is open
+        DeadlineExceeded: If the deadline is spent or the run was cancelled
+    """
+    import urllib.error
+    import urllib.request
+
+    headers = dict(headers or {})
+    headers.setdefault("User-Agent", USER_AGENT)
+    headers.setdefault("Content-Type", "application/json")
+    headers.setdefault("Accept", "text/event-stream")
+    req = urllib.request.Request(
+        upstream_url(url), data=json.dumps(json_data).encode("utf-8"), headers=headers, method="POST"
+    )
+    log(f"POST {url} (stream)")
+
+    host = urlparse(url).netloc.lower()
+    limiter = get_limiter(host)
+    breaker = get_breaker(host)
+    stop_at = time.monotonic() + timeout
+
+    response = None
+    last_error = None
+    for attempt in range(retries):
+        breaker.check()
+        limiter.acquire(deadline)
+        attempt_timeout = deadline.timeout(timeout) if deadline else timeout
+        breaker.allow()
+        try:
+            response = urllib.request.urlopen(req, timeout=attempt_timeout)
+            break
+        except urllib.error.HTTPError as e:
+            body = None
+            try:
+                body = e.read().decode("utf-8")
+            except Exception:
+                pass
+            log(f"HTTP Error {e.code}: {e.reason}")
+            last_error = HTTPError(f"HTTP {e.code}: {e.reason}", e.code, body)
+            retry_after = limiter.on_response(e.code, e.headers)
+            breaker.record(e.code < 500)
+            if 400 <= e.code < 500 and e.code != 429:
+                raise last_error
+            if attempt < retries - 1:
+                _backoff(attempt, deadline, retry_after)
+        except (urllib.error.URLError, OSError) as e:
+            log(f"Connection error: {type(e).__name__}: {e}")
+            breaker.record(False)
+            last_error = HTTPError(f"Connection error: {type(e).__name__}: {e}")
+            if attempt < retries - 1:
+                _backoff(attempt, deadline)
+        except BaseException:
+            breaker.record(False)  # Settle the attempt (see request)
+            raise
+    if response is None:
+        raise last_error or HTTPError("Request failed with no error details")
+
+    breaker.record(True)
+    limiter.on_response(response.status, getattr(response, "headers", None))
+    with response:
+        try:
+            for event, data in parse_sse(response):
+                if deadline:
+                    deadline.check()
+                if time.monotonic() > stop_at:
+                    raise HTTPError(f"Stream exceeded {timeout}s")
+                if data == "[DONE]":
+                    return
+                try:
+                    yield event, json.loads(data)
+                except json.JSONDecodeError:
+                    log(f"Skipping undecodable event {event!r}: {data[:200]}")
+        except (OSError, TimeoutError) as e:
+            log(f"Stream broken: {type(e).__name__}: {e}")
+            raise HTTPError(f"Stream broken: {type(e).__name__}: {e}")
+
+
+def get_reddit_json(path: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Fetch Reddit thread JSON.
 
     Args:
         path: Reddit path (e.g., /r/subreddit/comments/id/title)
+        deadline: Optional run deadline
 
     Returns:
         Parsed JSON response
@@ -149,4 +690,4 @@ def get_reddit_json(path: str) -> Dict[str, Any]:
         "Accept": "application/json",
     }
 
-    return get(url, headers=headers)
+    return get(url, headers=headers, deadline=deadline)
@@ -0,0 +1,183 @@
+"""Incremental ("since last run") research for last30days skill.
+
+Recurring topics keep a per-topic item store. Each run only searches the
+days since the last successful search of each source, merges the new items
+in, re-enriches Reddit threads whose engagement is stale, drops items that
+fell out of the 30-day window, and the full report is rebuilt from the store.
+
+Store layout (one JSON file per topic and depth):
+    {"topic": ..., "depth": ...,
+     "reddit": {"last_success": "YYYY-MM-DD" | null,
+                "items": {canonical_key: {"item": {...}, "first_seen": "YYYY-MM-DD",
+                                          "refreshed_at": unix_ts | null}}},
+     "x": {...same...}}
+"""
+
+import json
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import cache, dates, dedupe
+from .reddit_enrich import ENRICHED_FIELDS
+
+SOURCES = ("reddit", "x")
+ID_PREFIXES = {"reddit": "R", "x": "X"}  # As the search modules number items
+STALE_HOURS = 24  # Re-enrich Reddit threads whose engagement is older than this
+# Re-search this many days before the last successful run, so posts indexed
+# late by the providers are still picked up
+OVERLAP_DAYS = 1
+
+
+def get_store_path(topic: str, depth: str) -> Path:
+    """Path of the item store for a topic (case and whitespace insensitive)."""
+    normalized = " ".join(topic.lower().split())
+    return cache.CACHE_DIR / "topics" / f"{cache.layer_key(normalized, depth)}.json"
+
+
+def load_store(topic: str, depth: str) -> Dict[str, Any]:
+    """Load a topic's item store (empty if none yet or unreadable)."""
+    store = {"topic": topic, "depth": depth}
+    try:
+        with open(get_store_path(topic, depth)) as f:
+            store.update(json.load(f))
+    except (OSError, json.JSONDecodeError):
+        pass
+    for source in SOURCES:
+        store.setdefault(source, {"last_success": None, "items": {}})
+    return store
+
+
+def save_store(store: Dict[str, Any]):
+    """Save a topic's item store (atomically, like cache layers)."""
+    path = get_store_path(store["topic"], store["depth"])
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(store, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def search_from(store: Dict[str, Any], sources: List[str], from_date: str) -> str:
+    """Start date for this run's searches.
+
+    The earliest last-success date among the requested sources (minus the
+    overlap), or the full window's from_date if any of them has never
+    succeeded or last succeeded before the window.
+    """
+    start = None
+    for source in sources:
+        last = store[source]["last_success"]
+        if not last or last < from_date:
+            return from_date
+        candidate = (date.fromisoformat(last) - timedelta(days=OVERLAP_DAYS)).isoformat()
+        start = candidate if start is None else min(start, candidate)
+    return max(start, from_date) if start else from_date
+
+
+def merge(
+    store: Dict[str, Any],
+    source: str,
+    new_items: List[Dict[str, Any]],
+    today: str,
+    now: Optional[float] = None,
+) -> int:
+    """Merge freshly searched items into the store.
+
+    A Reddit item counts as refreshed only if it carries engagement (i.e. it
+    was enriched this run); X items get engagement from the search itself.
+
+    Returns:
+        Number of items not seen before
+    """
+    now = time.time() if now is None else now
+    stored = store[source]["items"]
+    added = 0
+    for item in new_items:
+        key = dedupe.canonical_key(item.get("url", "")) or item.get("id")
+        if not key:
+            continue
+        previous = stored.get(key)
+        fresh = source == "x" or bool(item.get("engagement"))
+        if previous and not fresh:
+            # Keep the enriched copy; take any new search metadata
+            item = {**item, **{k: v for k, v in previous["item"].items() if k in ENRICHED_FIELDS}}
+        stored[key] = {
+            "item": item,
+            "first_seen": previous["first_seen"] if previous else today,
+            "refreshed_at": now if fresh else (previous or {}).get("refreshed_at"),
+        }
+        added += previous is None
+    return added
+
+
+def mark_success(store: Dict[str, Any], source: str, to_date: str):
+    """Record that `source` was searched successfully up to to_date."""
+    store[source]["last_success"] = to_date
+
+
+def stale_items(
+    store: Dict[str, Any],
+    source: str = "reddit",
+    max_age_hours: float = STALE_HOURS,
+    now: Optional[float] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """(key, item) pairs whose engagement is missing or older than max_age_hours.
+
+    Never-enriched items come first, then oldest first, so a run that runs
+    out of budget spends it where it matters most.
+    """
+    now = time.time() if now is None else now
+    cutoff = now - max_age_hours * 3600
+    stale = [
+        (key, entry) for key, entry in store[source]["items"].items()
+        if entry.get("refreshed_at") is None or entry["refreshed_at"] < cutoff
+    ]
+    stale.sort(key=lambda pair: (pair[1].get("refreshed_at") is not None, pair[1].get("refreshed_at") or 0))
+    return [(key, entry["item"]) for key, entry in stale]
+
+
+def mark_refreshed(store: Dict[str, Any], source: str, key: str, item: Dict[str, Any], now: Optional[float] = None):
+    """Replace an item after re-enrichment."""
+    entry = store[source]["items"].get(key)
+    if entry is None:
+        return
+    entry["item"] = item
+    if item.get("engagement"):
+        entry["refreshed_at"] = time.time() if now is None else now
+
+
+def prune(store: Dict[str, Any], from_date: str) -> int:
+    """Drop items that fell out of the window; returns how many.
+
+    Items are aged out by their date, or by when they were first seen if
+    they have no date.
+    """
+    start = dates.date_ordinal(from_date)
+    removed = 0
+    for source in SOURCES:
+        stored = store[source]["items"]
+        for key in list(stored):
+            entry = stored[key]
+            ordinal = dates.date_ordinal(entry["item"].get("date")) or dates.date_ordinal(entry["first_seen"])
+            if ordinal is not None and start is not None and ordinal < start:
+                del stored[key]
+                removed += 1
+    return removed
+
+
+def items(store: Dict[str, Any], source: str) -> List[Dict[str, Any]]:
+    """All stored items for a source (copies, safe to normalize).
+
+    Stored items keep the ids of the search that found them, which repeat
+    across days, so the copies are numbered afresh.
+    """
+    copies = [dict(entry["item"]) for entry in store[source]["items"].values()]
+    for i, item in enumerate(copies):
+        item["id"] = f"{ID_PREFIXES[source]}{i+1}"
+    return copies
@@ -0,0 +1,324 @@
+"""Durable research job queue and worker pool for last30days skill.
+
+Used by the Streamlit app so research runs outside any one browser session:
+submitting a topic returns a job id, a fixed pool of worker threads runs the
+jobs, and results stay in a local SQLite database so a user can close the tab
+and come back to finished research.
+
+Jobs that were running when the process died are requeued on startup.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+DEFAULT_WORKERS = 3
+# Concurrent jobs per upstream API; a job holds a slot for each provider it uses
+DEFAULT_PROVIDER_LIMITS = {"openai": 2, "xai": 2}
+MAX_ATTEMPTS = 2  # A job interrupted this many times is failed, not requeued
+RESULT_TTL_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    params TEXT NOT NULL,
+    owner TEXT,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    progress TEXT,
+    partial TEXT,
+    output TEXT,
+    log TEXT,
+    message TEXT,
+    code INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, created);
+"""
+
+
+def providers_for_sources(sources: str) -> Tuple[str, ...]:
+    """Upstream APIs a run with this --sources value may call."""
+    if sources == "reddit":
+        return ("openai",)
+    if sources == "x":
+        return ("xai",)
+    return ("openai", "xai")
+
+
+class JobStore:
+    """SQLite-backed job table.
+
+    One connection is shared by the process's threads behind a lock; claims
+    run in an IMMEDIATE transaction so several app processes can share a
+    database file without running a job twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, args: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, args)
+
+    def submit(self, topic: str, params: Dict[str, Any], owner: Optional[str] = None) -> str:
+        """Queue a research job and return its id."""
+        job_id = uuid.uuid4().hex[:12]
+        self._execute(
+            "INSERT INTO jobs (id, topic, params, owner, state, created) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, topic, json.dumps(params), owner, QUEUED, time.time()),
+        )
+        return job_id
+
+    def record(self, topic: str, params: Dict[str, Any], owner: Optional[str], output: str,
+               log: str = "", code: Optional[int] = 0, message: Optional[str] = None) -> str:
+        """Add an already finished job (e.g. served from a cache) and return its id."""
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, topic, params, owner, state, created, started, finished, output, log, code, message)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, topic, json.dumps(params), owner, DONE, now, now, now, output, log, code, message),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job as a dict, or None if unknown."""
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list(self, owner: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs first, optionally only one owner's."""
+        if owner is None:
+            rows = self._execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,))
+        else:
+            rows = self._execute(
+                "SELECT * FROM jobs WHERE owner = ? ORDER BY created DESC LIMIT ?", (owner, limit)
+            )
+        return [_row_to_job(row) for row in rows.fetchall()]
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job running and return it (None if the queue is empty)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE state = ? ORDER BY created LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                started = time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET state = ?, started = ?, attempts = attempts + 1 WHERE id = ?",
+                    (RUNNING, started, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = _row_to_job(row)
+        job.update(state=RUNNING, started=started, attempts=job["attempts"] + 1)
+        return job
+
+    def update_progress(self, job_id: str, progress: Optional[str] = None, partial: Optional[str] = None):
+        """Record a running job's latest status line and/or partial output."""
+        if progress is not None:
+            self._execute("UPDATE jobs SET progress = ? WHERE id = ?", (progress, job_id))
+        if partial is not None:
+            self._execute("UPDATE jobs SET partial = ? WHERE id = ?", (partial, job_id))
+
+    def finish(self, job_id: str, state: str, output: str = "", log: str = "",
+               code: Optional[int] = None, message: Optional[str] = None):
+        """Store a job's result and final state."""
+        self._execute(
+            "UPDATE jobs SET state = ?, finished = ?, output = ?, log = ?, code = ?, message = ?,"
+            " partial = NULL WHERE id = ?",
+            (state, time.time(), output, log, code, message, job_id),
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job now, or ask its worker to stop a running one.
+
+        Returns:
+            False if the job is unknown or already finished
+        """
+        cur = self._execute(
+            "UPDATE jobs SET state = ?, finished = ? WHERE id = ? AND state = ?",
+            (CANCELLED, time.time(), job_id, QUEUED),
+        )
+        if cur.rowcount:
+            return True
+        cur = self._execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND state = ?", (job_id, RUNNING)
+        )
+        return bool(cur.rowcount)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        row = self._execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def requeue_interrupted(self, max_attempts: int = MAX_ATTEMPTS) -> int:
+        """Requeue jobs left running by a dead process; fail ones that keep dying.
+
+        Only call this when no other process is working on the database.
+
+        Returns:
+            Number of jobs requeued
+        """
+        self._execute(
+            "UPDATE jobs SET state = ?, finished = ?, message = ? WHERE state = ? AND attempts >= ?",
+            (FAILED, time.time(), "Interrupted too many times", RUNNING, max_attempts),
+        )
+        cur = self._execute(
+            "UPDATE jobs SET state = ?, started = NULL, progress = NULL, partial = NULL WHERE state = ?",
+            (QUEUED, RUNNING),
+        )
+        return cur.rowcount
+
+    def prune(self, max_age_days: float = RESULT_TTL_DAYS) -> int:
+        """Delete finished jobs older than max_age_days; returns how many."""
+        cutoff = time.time() - max_age_days * 86400
+        placeholders = ", ".join("?" * len(FINISHED_STATES))
+        cur = self._execute(
+            f"DELETE FROM jobs WHERE state IN ({placeholders}) AND created < ?",
+            (*FINISHED_STATES, cutoff),
+        )
+        return cur.rowcount
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    job["params"] = json.loads(job["params"] or "{}")
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    return job
+
+
+class JobContext:
+    """What a runner gets besides the job: progress reporting and cancellation."""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self._store = store
+        self.job_id = job_id
+
+    def progress(self, message: str):
+        self._store.update_progress(self.job_id, progress=message)
+
+    def partial(self, text: str):
+        self._store.update_progress(self.job_id, partial=text)
+
+    def cancelled(self) -> bool:
+        return self._store.cancel_requested(self.job_id)
+
+
+# Runner result: (output, log, exit code, optional message for the user)
+Runner = Callable[[Dict[str, Any], JobContext], Tuple[str, str, int, Optional[str]]]
+
+
+class WorkerPool:
+    """Fixed pool of threads running queued jobs with per-provider caps.
+
+    Each worker claims the oldest queued job, then takes one slot per
+    provider the job uses (always in the same order, so two jobs can't
+    deadlock) before calling the runner.
+    """
+
+    def __init__(self, store: JobStore, runner: Runner, workers: int = DEFAULT_WORKERS,
+                 provider_limits: Optional[Dict[str, int]] = None, poll_interval: float = 0.5):
+        self.store = store
+        self.runner = runner
+        self.workers = workers
+        self.poll_interval = poll_interval
+        limits = DEFAULT_PROVIDER_LIMITS if provider_limits is None else provider_limits
+        self._slots = {name: threading.BoundedSemaphore(limit) for name, limit in limits.items()}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start the worker threads (idempotent)."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"last30days-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming jobs and wait for running ones to finish."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, topic: str, params: Dict[str, Any], owner: Optional[str] = None) -> str:
+        """Queue a job and wake an idle worker; returns the job id."""
+        job_id = self.store.submit(topic, params, owner)
+        self._wake.set()
+        return job_id
+
+    def _work(self):
+        while not self._stop.is_set():
+            job = self.store.claim()
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict[str, Any]):
+        providers = sorted(p for p in providers_for_sources(job["params"].get("sources", "auto")) if p in self._slots)
+        held = []
+        try:
+            for provider in providers:
+                self._slots[provider].acquire()
+                held.append(provider)
+            context = JobContext(self.store, job["id"])
+            if context.cancelled():
+                self.store.finish(job["id"], CANCELLED)
+                return
+            try:
+                output, log, code, message = self.runner(job, context)
+            except Exception as e:
+                self.store.finish(job["id"], FAILED, log=f"{type(e).__name__}: {e}", code=-1)
+                return
+            if context.cancelled():
+                state = CANCELLED
+            elif code == 0:
+                state = DONE
+            else:
+                state = FAILED
+                if output and not message:
+                    # Partial output is kept and shown, but not as a success
+                    message = f"Research did not finish (exit code {code}); showing partial results."
+            self.store.finish(job["id"], state, output, log, code, message)
+        finally:
+            for provider in reversed(held):
+                self._slots[provider].release()
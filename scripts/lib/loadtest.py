@@ -0,0 +1,469 @@
+"""End-to-end load testing for last30days skill.
+
+Drives N concurrent research runs against the local API stand-in (see
+lib/standin.py) and measures what a host running them would see:
+throughput, end-to-end latency percentiles, peak resident memory, open
+sockets and threads.
+
+Runs can be executed three ways:
+- "subprocess": one `last30days.py --no-daemon` process per run, as the
+  Streamlit app's job workers do;
+- "inprocess": last30days.main on threads of this process, sharing rate
+  limiters, breakers and caches;
+- "daemon": client processes handing runs to one research daemon.
+
+Each concurrency level is a closed loop: `concurrency` workers each start a
+new run as soon as their previous one finishes, until `runs` have been made.
+The report is plain JSON (with the git commit) so runs from different
+commits can be compared (see compare).
+"""
+
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from . import standin
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+MAIN_SCRIPT = SCRIPTS_DIR / "last30days.py"
+MODES = ("subprocess", "inprocess", "daemon")
+SAMPLE_INTERVAL = 0.05  # Seconds between resource samples
+DAEMON_START_TIMEOUT = 15.0
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+@dataclass
+class LoadConfig:
+    """What to run and how hard."""
+    mode: str = "subprocess"
+    concurrency: List[int] = field(default_factory=lambda: [1, 4])
+    runs: Optional[int] = None  # Runs per level (default: 2 x concurrency)
+    topic: str = "load test"
+    args: List[str] = field(default_factory=lambda: ["--emit", "compact"])
+    upstream: Optional[str] = None  # External stand-in URL (default: start one)
+    latency: str = "lognormal:0.3,0.5"  # Stand-in latency when it is started here
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    run_timeout: float = 300.0
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """p-th quantile (0-1) of values, linearly interpolated; None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def latency_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99, mean and max of latencies in seconds."""
+    summary = {f"p{int(p * 100)}": percentile(values, p) for p in PERCENTILES}
+    summary["mean"] = sum(values) / len(values) if values else None
+    summary["max"] = max(values) if values else None
+    return {k: round(v, 4) if v is not None else None for k, v in summary.items()}
+
+
+def stats_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Stand-in counters accumulated between two stats() snapshots.
+
+    Gauges (in_flight, max_in_flight) are taken from after as they are.
+    """
+    delta = {}
+    for key, value in after.items():
+        if isinstance(value, dict):
+            delta[key] = stats_delta(before.get(key) or {}, value)
+        elif key in ("in_flight", "max_in_flight") or not isinstance(value, (int, float)):
+            delta[key] = value
+        else:
+            delta[key] = value - before.get(key, 0)
+    return delta
+
+
+def _proc_status(pid: int) -> Dict[str, int]:
+    """RSS (kB) and thread count of a process from /proc (Linux)."""
+    result = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    result["rss_kb"] = int(line.split()[1])
+                elif line.startswith("Threads:"):
+                    result["threads"] = int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return result
+
+
+def _socket_count(pid: int) -> Optional[int]:
+    """Open sockets of a process (Linux), None if unavailable."""
+    try:
+        fds = os.listdir(f"/proc/{pid}/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/{pid}/fd/{fd}").startswith("socket:"):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+class ResourceSampler:
+    """Samples the summed RSS, sockets and threads of a set of processes.
+
+    pids() is called at every sample, so processes can come and go. Where
+    /proc is unavailable only RSS from getrusage is reported.
+    """
+
+    def __init__(self, pids: Callable[[], List[int]], interval: float = SAMPLE_INTERVAL):
+        self._pids = pids
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadtest-sampler", daemon=True)
+        self.peak = {"rss_mb": None, "sockets": None, "threads": None}
+        self.samples = 0
+
+    def __enter__(self) -> "ResourceSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def sample(self):
+        rss_kb, threads, sockets = 0, 0, 0
+        seen = False
+        for pid in self._pids():
+            status = _proc_status(pid)
+            if not status:
+                continue
+            seen = True
+            rss_kb += status.get("rss_kb", 0)
+            threads += status.get("threads", 0)
+            sockets += _socket_count(pid) or 0
+        if not seen:
+            return
+        self.samples += 1
+        for name, value in (("rss_mb", round(rss_kb / 1024, 1)), ("threads", threads), ("sockets", sockets)):
+            if self.peak[name] is None or value > self.peak[name]:
+                self.peak[name] = value
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self._interval)
+        self.sample()
+
+
+def _run_env(base: Dict[str, str], upstream: str, workdir: Path) -> Dict[str, str]:
+    """Environment of a research run: stand-in upstream, isolated state."""
+    env = dict(base)
+    env.update({
+        "HOME": str(workdir / "home"),
+        "LAST30DAYS_UPSTREAM": upstream,
+        "LAST30DAYS_OUTPUT_DIR": str(workdir / "out"),
+        "LAST30DAYS_HISTORY": "0",
+        "LAST30DAYS_DAEMON_SOCKET": str(workdir / "daemon.sock"),
+        "OPENAI_API_KEY": "loadtest",
+        "XAI_API_KEY": "loadtest",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    })
+    return env
+
+
+class _Level:
+    """One concurrency level's closed loop of runs."""
+
+    def __init__(self, concurrency: int, runs: int, run_once: Callable[[int], int]):
+        self.concurrency = concurrency
+        self.runs = runs
+        self._run_once = run_once
+        self._next = 0
+        self._lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.failures = 0
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                if self._next >= self.runs:
+                    return
+                index = self._next
+                self._next += 1
+            start = time.perf_counter()
+            try:
+                code = self._run_once(index)
+            except Exception:
+                code = -1
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if code == 0:
+                    self.latencies.append(elapsed)
+                else:
+                    self.failures += 1
+
+    def run(self) -> float:
+        """Run every worker to completion; returns the wall time."""
+        workers = [
+            threading.Thread(target=self._worker, name=f"loadtest-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return time.perf_counter() - start
+
+
+class _Children:
+    """Live child processes, for the sampler."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pids = set()
+
+    def add(self, pid: int):
+        with self._lock:
+            self._pids.add(pid)
+
+    def remove(self, pid: int):
+        with self._lock:
+            self._pids.discard(pid)
+
+    def __call__(self) -> List[int]:
+        with self._lock:
+            return list(self._pids)
+
+
+def _subprocess_runner(config: LoadConfig, env: Dict[str, str], children: _Children, daemon: bool):
+    argv = [sys.executable, str(MAIN_SCRIPT)]
+
+    def run_once(index: int) -> int:
+        args = argv + [f"{config.topic} {index}", "--refresh"] + list(config.args)
+        if not daemon:
+            args.append("--no-daemon")
+        proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        children.add(proc.pid)
+        try:
+            return proc.wait(timeout=config.run_timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            return -1
+        finally:
+            children.remove(proc.pid)
+
+    return run_once
+
+
+def _inprocess_runner(config: LoadConfig):
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    import last30days
+
+    def run_once(index: int) -> int:
+        try:
+            last30days.main([f"{config.topic} {index}", "--refresh"] + list(config.args), use_daemon=False)
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+        return 0
+
+    return run_once
+
+
+def _start_daemon(env: Dict[str, str], socket_path: str) -> subprocess.Popen:
+    from . import daemon
+
+    proc = subprocess.Popen(
+        [sys.executable, str(MAIN_SCRIPT), "--daemon", "serve"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    stop_at = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < stop_at:
+        if daemon.request({"op": "status"}, socket_path) is not None:
+            return proc
+        if proc.poll() is not None:
+            break
+        time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("Research daemon did not start")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(config: LoadConfig, log: Callable[[str], None] = lambda msg: None) -> Dict[str, Any]:
+    """Run every concurrency level and return the report.
+
+    Raises:
+        ValueError: On an unknown mode
+        RuntimeError: If the daemon (daemon mode) does not start
+    """
+    if config.mode not in MODES:
+        raise ValueError(f"Unknown mode: {config.mode}")
+
+    server = None
+    upstream = config.upstream
+    if not upstream:
+        server = standin.start(standin.Config(
+            default=standin.Profile(config.latency, config.error_rate, config.throttle_rate, retry_after=0.2),
+            recordings=Path(tempfile.gettempdir()) / "last30days-loadtest-none",
+        ))
+        upstream = server.url
+
+    report = {
+        "commit": _git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "config": {**asdict(config), "upstream": config.upstream or "local stand-in"},
+        "levels": [],
+    }
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="last30days-loadtest-") as tmp:
+            workdir = Path(tmp)
+            env = _run_env(os.environ, upstream, workdir)
+            for concurrency in config.concurrency:
+                runs = config.runs or 2 * concurrency
+                log(f"{config.mode}: {runs} runs at concurrency {concurrency}")
+                before = server.stats() if server is not None else None
+                level = _run_level(config, concurrency, runs, env, workdir)
+                if server is not None:
+                    level["standin"] = stats_delta(before, server.stats())
+                report["levels"].append(level)
+                log(f"  {level['throughput_per_min']} runs/min, p50 {level['latency_s']['p50']}s, "
+                    f"p95 {level['latency_s']['p95']}s, {level['failed']} failed")
+    finally:
+        if server is not None:
+            server.stop()
+    return report
+
+
+def _run_level(config: LoadConfig, concurrency: int, runs: int, env: Dict[str, str], workdir: Path) -> Dict[str, Any]:
+    children = _Children()
+    daemon_proc = None
+    if config.mode == "inprocess":
+        run_once = _inprocess_runner(config)
+        pids = lambda: [os.getpid()]  # noqa: E731
+    else:
+        if config.mode == "daemon":
+            daemon_proc = _start_daemon(env, env["LAST30DAYS_DAEMON_SOCKET"])
+            children.add(daemon_proc.pid)
+        run_once = _subprocess_runner(config, env, children, daemon=config.mode == "daemon")
+        pids = children
+
+    level = _Level(concurrency, runs, run_once)
+    try:
+        if config.mode == "inprocess":
+            with _inprocess_environment(env), ResourceSampler(pids) as sampler:
+                wall = level.run()
+        else:
+            with ResourceSampler(pids) as sampler:
+                wall = level.run()
+    finally:
+        if daemon_proc is not None:
+            from . import daemon
+
+            daemon.request({"op": "stop"}, env["LAST30DAYS_DAEMON_SOCKET"])
+            try:
+                daemon_proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                daemon_proc.kill()
+
+    completed = len(level.latencies)
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "completed": completed,
+        "failed": level.failures,
+        "wall_s": round(wall, 3),
+        "throughput_per_min": round(completed / wall * 60, 2) if wall else None,
+        "latency_s": latency_summary(level.latencies),
+        "peak_rss_mb": sampler.peak["rss_mb"],
+        "peak_sockets": sampler.peak["sockets"],
+        "peak_threads": sampler.peak["threads"],
+    }
+
+
+@contextmanager
+def _inprocess_environment(env: Dict[str, str]):
+    """Point this process's research runs at the stand-in and a scratch dir."""
+    from . import cache, render
+
+    keys = ("LAST30DAYS_UPSTREAM", "LAST30DAYS_HISTORY", "OPENAI_API_KEY", "XAI_API_KEY")
+    saved_env = {k: os.environ.get(k) for k in keys}
+    saved_paths = (cache.CACHE_DIR, cache.MODEL_CACHE_FILE, render.OUTPUT_DIR)
+    workdir = Path(env["LAST30DAYS_OUTPUT_DIR"]).parent
+    os.environ.update({k: env[k] for k in keys})
+    cache.CACHE_DIR = workdir / "cache"
+    cache.MODEL_CACHE_FILE = cache.CACHE_DIR / "model_selection.json"
+    render.OUTPUT_DIR = workdir / "out"
+    try:
+        # Runs print their reports and progress; keep the console for the tool
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            yield
+    finally:
+        cache.CACHE_DIR, cache.MODEL_CACHE_FILE, render.OUTPUT_DIR = saved_paths
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> str:
+    """Markdown table of the change from baseline to current, per concurrency level."""
+    metrics = (
+        ("throughput_per_min", lambda l: l.get("throughput_per_min")),
+        ("p50_s", lambda l: l["latency_s"].get("p50")),
+        ("p95_s", lambda l: l["latency_s"].get("p95")),
+        ("p99_s", lambda l: l["latency_s"].get("p99")),
+        ("peak_rss_mb", lambda l: l.get("peak_rss_mb")),
+        ("peak_sockets", lambda l: l.get("peak_sockets")),
+        ("peak_threads", lambda l: l.get("peak_threads")),
+    )
+    before = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    lines = [
+        f"Baseline {baseline.get('commit') or '?'} -> current {current.get('commit') or '?'}",
+        "",
+        "| concurrency | metric | baseline | current | change |",
+        "|---|---|---|---|---|",
+    ]
+    for level in current.get("levels", []):
+        old = before.get(level["concurrency"])
+        if old is None:
+            continue
+        for name, get in metrics:
+            a, b = get(old), get(level)
+            if a is None or b is None:
+                change = "n/a"
+            elif a == 0:
+                change = "same" if b == 0 else "new"
+            else:
+                change = f"{(b - a) / a * 100:+.1f}%"
+            lines.append(f"| {level['concurrency']} | {name} | {a} | {b} | {change} |")
+    return "\n".join(lines)
@@ -3,9 +3,11 @@
 import json
 import re
 import sys
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from . import http
+from . import dedupe, extract, hedge, http
+from .deadline import Deadline
 
 
 def _log_error(msg: str):
@@ -66,6 +68,17 @@ Return JSON:
 }}"""
 
 
+# Structured-output schema of one returned thread (mirrors the prompt's JSON)
+REDDIT_ITEM_SCHEMA = extract.object_schema({
+    "title": {"type": "string"},
+    "url": {"type": "string"},
+    "subreddit": {"type": "string"},
+    "date": {"type": ["string", "null"]},
+    "why_relevant": {"type": "string"},
+    "relevance": {"type": "number"},
+})
+
+
 def _extract_core_subject(topic: str) -> str:
     """Extract core subject from verbose query for retry."""
     noise = ['best', 'top', 'how to', 'tips for', 'practices', 'features',
@@ -76,6 +89,134 @@ def _extract_core_subject(topic: str) -> str:
     return ' '.join(result[:3]) or topic  # Keep max 3 words
 
 
+# Fan-out: concurrent query variants merged by URL
+FANOUT_MAX_WORKERS = 3
+FANOUT_MAX_VARIANTS = 4
+# Extra angles on the core subject, to surface threads the main query misses
+FANOUT_ANGLES = ["recommendations", "problems", "experience"]
+
+
+def build_query_variants(topic: str, max_variants: int = FANOUT_MAX_VARIANTS) -> List[str]:
+    """Build query variants for fan-out search.
+
+    Order: the original topic, the core subject, a subreddit-targeted
+    variant, then the core subject with a few alternative angles.
+
+    Args:
+        topic: Original search topic
+        max_variants: Maximum number of variants
+
+    Returns:
+        De-duplicated list of query strings
+    """
+    core = _extract_core_subject(topic)
+    variants = [topic, core]
+    slug = re.sub(r'[^a-z0-9]', '', core.lower())
+    if slug:
+        variants.append(f"{core} (e.g. r/{slug} and related subreddits)")
+    variants.extend(f"{core} {angle}" for angle in FANOUT_ANGLES)
+
+    seen = set()
+    result = []
+    for v in variants:
+        key = v.lower().strip()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(v)
+    return result[:max_variants]
+
+
+def search_reddit_fanout(
+    api_key: str,
+    model: str,
+    topic: str,
+    from_date: str,
+    to_date: str,
+    depth: str = "default",
+    max_workers: int = FANOUT_MAX_WORKERS,
+    target: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run several query variants concurrently and merge results by post id.
+
+    Stops early once `target` unique items are found: queued variants are
+    dropped and running ones cancelled through their own child deadline.
+    A streamed variant stops at its next event. A non-streamed one can only
+    stop between attempts, so its current request still completes and is
+    billed. Variant failures are logged and skipped.
+
+    Args:
+        api_key: OpenAI API key
+        model: Model to use
+        topic: Search topic
+        from_date: Start date (YYYY-MM-DD)
+        to_date: End date (YYYY-MM-DD)
+        depth: Research depth - "quick", "default", or "deep"
+        max_workers: Concurrency cap for variant searches
+        target: Stop once this many unique items are found (default: depth minimum)
+        deadline: Optional run deadline
+        on_item: Stream each variant, calling this with every item as it
+            arrives (the same thread may arrive from several variants)
+
+    Returns:
+        Tuple of (merged item dicts, raw responses)
+
+    Raises:
+        http.HTTPError: If every variant failed
+    """
+    if target is None:
+        target = DEPTH_CONFIG.get(depth, DEPTH_CONFIG["default"])[0]
+
+    variants = build_query_variants(topic)
+    merged: Dict[str, Dict[str, Any]] = {}
+    raws = []
+    errors = []
+
+    # Cancelled once the merge has enough, so variants still running stop
+    # (and free their rate-limiter slots) instead of finishing unread
+    variants_deadline = deadline.child() if deadline else Deadline()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            executor.submit(
+                search_reddit, api_key, model, variant, from_date, to_date,
+                depth=depth, deadline=variants_deadline, on_item=on_item,
+            ): variant
+            for variant in variants
+        }
+        for future in as_completed(futures):
+            try:
+                raw = future.result()
+            except Exception as e:
+                errors.append(e)
+                _log_error(f"Fan-out variant failed ({futures[future]!r}): {e}")
+                continue
+            raws.append(raw)
+            for item in parse_reddit_response(raw):
+                key = dedupe.canonical_key(item["url"])
+                existing = merged.get(key)
+                if existing is None:
+                    merged[key] = item
+                elif item["relevance"] > existing["relevance"]:
+                    # Same thread from several variants: keep the best-rated copy
+                    merged[key] = {**item, "date": item["date"] or existing["date"]}
+            if len(merged) >= target:
+                break
+    finally:
+        # Don't wait for variants we no longer need
+        variants_deadline.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not raws and errors:
+        raise errors[-1]
+
+    items = list(merged.values())
+    for i, item in enumerate(items):
+        item["id"] = f"R{i+1}"
+    return items, raws
+
+
 def search_reddit(
     api_key: str,
     model: str,
@@ -85,6 +226,8 @@ def search_reddit(
     depth: str = "default",
     mock_response: Optional[Dict] = None,
     _retry: bool = False,
+    deadline: Optional[Deadline] = None,
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     """Search Reddit for relevant threads using OpenAI Responses API.
 
@@ -96,9 +239,12 @@ def search_reddit(
         to_date: End date (YYYY-MM-DD) - only include threads before this
         depth: Research depth - "quick", "default", or "deep"
         mock_response: Mock response for testing
+        deadline: Optional run deadline (clamps the request timeout)
+        on_item: Stream the response, calling this with each cleaned item
+            as soon as the model has written it
 
     Returns:
-        Raw API response
+        Raw API response (the same final response either way)
     """
     if mock_response is not None:
         return mock_response
@@ -135,7 +281,24 @@ def search_reddit(
         ),
     }
 
-    return http.post(OPENAI_RESPONSES_URL, payload, headers=headers, timeout=timeout)
+    text_format = extract.items_format("reddit_threads", REDDIT_ITEM_SCHEMA)
+    if on_item is not None:
+        # Streamed: each thread reaches on_item while the model is still
+        # writing. Not hedged, since a duplicate request would replay items.
+        return extract.stream(
+            "openai", OPENAI_RESPONSES_URL, payload, extract.cleaned(_clean_item, on_item),
+            text_format=text_format, headers=headers, timeout=timeout, deadline=deadline,
+        )
+
+    # Hedged when enabled: a slow call gets a duplicate request, first one wins
+    return hedge.call(
+        f"openai:{depth}",
+        lambda: extract.post(
+            "openai", OPENAI_RESPONSES_URL, payload, text_format=text_format,
+            headers=headers, timeout=timeout, deadline=deadline,
+        ),
+        deadline=deadline,
+    )
 
 
 def parse_reddit_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -147,84 +310,59 @@ def parse_reddit_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
     Returns:
         List of item dicts
     """
-    items = []
-
     # Check for API errors first
-    if "error" in response and response["error"]:
-        error = response["error"]
-        err_msg = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+    err_msg = extract.response_error(response)
+    if err_msg:
         _log_error(f"OpenAI API error: {err_msg}")
         if http.DEBUG:
             _log_error(f"Full error response: {json.dumps(response, indent=2)[:1000]}")
-        return items
-
-    # Try to find the output text
-    output_text = ""
-    if "output" in response:
-        output = response["output"]
-        if isinstance(output, str):
-            output_text = output
-        elif isinstance(output, list):
-            for item in output:
-                if isinstance(item, dict):
-                    if item.get("type") == "message":
-                        content = item.get("content", [])
-                        for c in content:
-                            if isinstance(c, dict) and c.get("type") == "output_text":
-                                output_text = c.get("text", "")
-                                break
-                    elif "text" in item:
-                        output_text = item["text"]
-                elif isinstance(item, str):
-                    output_text = item
-                if output_text:
-                    break
-
-    # Also check for choices (older format)
-    if not output_text and "choices" in response:
-        for choice in response["choices"]:
-            if "message" in choice:
-                output_text = choice["message"].get("content", "")
-                break
+        return []
 
+    output_text = extract.output_text(response)
     if not output_text:
         print(f"[REDDIT WARNING] No output text found in OpenAI response. Keys present: {list(response.keys())}", flush=True)
-        return items
+        return []
 
-    # Extract JSON from the response
-    json_match = re.search(r'\{[\s\S]*"items"[\s\S]*\}', output_text)
-    if json_match:
-        try:
-            data = json.loads(json_match.group())
-            items = data.get("items", [])
-        except json.JSONDecodeError:
-            pass
+    # Recover every complete item, even from truncated or noisy output
+    items = extract.parse_items(output_text)
 
     # Validate and clean items
     clean_items = []
     for i, item in enumerate(items):
-        if not isinstance(item, dict):
-            continue
-
-        url = item.get("url", "")
-        if not url or "reddit.com" not in url:
-            continue
-
-        clean_item = {
-            "id": f"R{i+1}",
-            "title": str(item.get("title", "")).strip(),
-            "url": url,
-            "subreddit": str(item.get("subreddit", "")).strip().lstrip("r/"),
-            "date": item.get("date"),
-            "why_relevant": str(item.get("why_relevant", "")).strip(),
-            "relevance": min(1.0, max(0.0, float(item.get("relevance", 0.5)))),
-        }
+        clean_item = _clean_item(item, i)
+        if clean_item:
+            clean_items.append(clean_item)
 
-        # Validate date format
-        if clean_item["date"]:
-            if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
-                clean_item["date"] = None
+    return clean_items
 
-        clean_items.append(clean_item)
 
-    return clean_items
+def _clean_item(item: Any, index: int) -> Optional[Dict[str, Any]]:
+    """Validate one raw item; None if it is not a usable Reddit thread."""
+    if not isinstance(item, dict):
+        return None
+
+    url = item.get("url", "")
+    if not url or "reddit.com" not in url:
+        return None
+
+    try:
+        relevance = min(1.0, max(0.0, float(item.get("relevance", 0.5))))
+    except (TypeError, ValueError):
+        relevance = 0.5
+
+    clean_item = {
+        "id": f"R{index+1}",
+        "title": str(item.get("title", "")).strip(),
+        "url": url,
+        "subreddit": str(item.get("subreddit", "")).strip().lstrip("r/"),
+        "date": item.get("date"),
+        "why_relevant": str(item.get("why_relevant", "")).strip(),
+        "relevance": relevance,
+    }
+
+    # Validate date format
+    if clean_item["date"]:
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
+            clean_item["date"] = None
+
+    return clean_item
@@ -1,10 +1,28 @@
 """Reddit thread enrichment with real engagement metrics."""
 
 import re
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from . import http, dates
+from . import cache, dates, dedupe, http
+from .deadline import Deadline
+
+# Thread JSON fetched by this process, keyed by dedupe.canonical_key, as
+# (fetched_at, data). Bounded so a long-lived daemon doesn't serve stale
+# engagement numbers or grow without limit.
+THREAD_CACHE_TTL = 3600  # Seconds
+THREAD_CACHE_MAX = 2000  # Entries
+_thread_cache: Dict[str, Tuple[float, Any]] = {}
+_thread_cache_lock = threading.Lock()
+
+# Fields enrich_reddit_item adds or corrects
+ENRICHED_FIELDS = ("engagement", "top_comments", "comment_insights", "date")
+# The ones only a full thread fetch provides (the rest come with the submission)
+COMMENT_FIELDS = ("top_comments", "comment_insights")
+
+BY_ID_BATCH = 100  # Max posts per /by_id request
 
 
 def extract_reddit_path(url: str) -> Optional[str]:
@@ -25,12 +43,17 @@ def extract_reddit_path(url: str) -> Optional[str]:
         return None
 
 
-def fetch_thread_data(url: str, mock_data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+def fetch_thread_data(
+    url: str,
+    mock_data: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+) -> Optional[Dict[str, Any]]:
     """Fetch Reddit thread JSON data.
 
     Args:
         url: Reddit thread URL
         mock_data: Mock data for testing
+        deadline: Optional run deadline
 
     Returns:
         Thread data dict or None on failure
@@ -38,16 +61,37 @@ def fetch_thread_data(url: str, mock_data: Optional[Dict] = None) -> Optional[Di
     if mock_data is not None:
         return mock_data
 
-    path = extract_reddit_path(url)
+    # Fetch by post id so every URL variant (old./www./redd.it, slug,
+    # query string) hits the same endpoint and cache entry
+    post_id = dedupe.reddit_post_id(url)
+    path = f"/comments/{post_id}" if post_id else extract_reddit_path(url)
     if not path:
         return None
 
+    key = dedupe.canonical_key(url)
+    with _thread_cache_lock:
+        cached = _thread_cache.get(key)
+        if cached and time.monotonic() - cached[0] < THREAD_CACHE_TTL:
+            return cached[1]
+
     try:
-        data = http.get_reddit_json(path)
-        return data
+        data = http.get_reddit_json(path, deadline=deadline)
     except http.HTTPError:
         return None
 
+    with _thread_cache_lock:
+        _thread_cache.pop(key, None)
+        while len(_thread_cache) >= THREAD_CACHE_MAX:
+            del _thread_cache[next(iter(_thread_cache))]  # Oldest first
+        _thread_cache[key] = (time.monotonic(), data)
+    return data
+
+
+def clear_thread_cache():
+    """Forget thread data fetched by this process."""
+    with _thread_cache_lock:
+        _thread_cache.clear()
+
 
 def parse_thread_data(data: Any) -> Dict[str, Any]:
     """Parse Reddit thread JSON into structured data.
@@ -175,42 +219,161 @@ def extract_comment_insights(comments: List[Dict], limit: int = 7) -> List[str]:
     return insights
 
 
+def load_parsed_thread(
+    url: str,
+    mock_thread_data: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+    use_cache: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """Parsed thread data, from the on-disk "thread" cache layer when warm.
+
+    Fetched threads are saved to the layer by post id, so later runs (other
+    topics, depths or source selections) that surface the same post skip
+    the fetch.
+
+    Args:
+        url: Reddit thread URL
+        mock_thread_data: Mock data for testing (never cached)
+        deadline: Optional run deadline
+        use_cache: Read the cache layer (False still writes it, for --refresh)
+
+    Returns:
+        Parsed thread (see parse_thread_data) or None on failure
+    """
+    key = dedupe.canonical_key(url)
+    if mock_thread_data is None and use_cache:
+        parsed, _ = cache.load_layer("thread", key)
+        if parsed is not None:
+            return parsed
+
+    thread_data = fetch_thread_data(url, mock_thread_data, deadline)
+    if not thread_data:
+        return None
+
+    parsed = parse_thread_data(thread_data)
+    if mock_thread_data is None and parsed.get("submission"):
+        cache.save_layer("thread", key, parsed)
+    return parsed
+
+
+def fetch_submissions(
+    urls: List[str],
+    mock_thread_data: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+    use_cache: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """Submission data (engagement and creation time) for many threads at once.
+
+    Warm "thread" cache layer entries are used as-is, as enrich_reddit_item
+    would; the rest come from /by_id listings, up to BY_ID_BATCH posts per
+    request, instead of one thread fetch each.
+
+    Args:
+        urls: Reddit thread URLs
+        mock_thread_data: Mock thread JSON for testing (its submission is used for every URL)
+        deadline: Optional run deadline
+        use_cache: Read the cache layer
+
+    Returns:
+        Dict of dedupe.canonical_key -> submission dict (see parse_thread_data);
+        threads that could not be looked up are missing
+    """
+    if mock_thread_data is not None:
+        submission = parse_thread_data(mock_thread_data).get("submission")
+        return {dedupe.canonical_key(url): submission for url in urls} if submission else {}
+
+    found = {}
+    pending = {}  # Post id -> canonical key
+    for url in urls:
+        key = dedupe.canonical_key(url)
+        if use_cache:
+            parsed, _ = cache.load_layer("thread", key)
+            if parsed and parsed.get("submission"):
+                found[key] = parsed["submission"]
+                continue
+        post_id = dedupe.reddit_post_id(url)
+        if post_id:
+            pending[post_id.lower()] = key
+
+    ids = list(pending)
+    for start in range(0, len(ids), BY_ID_BATCH):
+        names = ",".join(f"t3_{post_id}" for post_id in ids[start:start + BY_ID_BATCH])
+        try:
+            listing = http.get_reddit_json(f"/by_id/{names}", deadline=deadline)
+        except http.HTTPError:
+            continue
+        children = listing.get("data", {}).get("children", []) if isinstance(listing, dict) else []
+        for child in children:
+            data = child.get("data", {})
+            key = pending.get(str(data.get("id", "")).lower())
+            if key:
+                found[key] = {
+                    "score": data.get("score"),
+                    "num_comments": data.get("num_comments"),
+                    "upvote_ratio": data.get("upvote_ratio"),
+                    "created_utc": data.get("created_utc"),
+                    "permalink": data.get("permalink"),
+                    "title": data.get("title"),
+                    "selftext": data.get("selftext", "")[:500],
+                }
+    return found
+
+
+def apply_submission(item: Dict[str, Any], submission: Dict[str, Any]) -> Dict[str, Any]:
+    """Set an item's engagement and date from its submission data."""
+    item["engagement"] = {
+        "score": submission.get("score"),
+        "num_comments": submission.get("num_comments"),
+        "upvote_ratio": submission.get("upvote_ratio"),
+    }
+
+    # Update date from actual data
+    created_utc = submission.get("created_utc")
+    if created_utc:
+        item["date"] = dates.timestamp_to_date(created_utc)
+    return item
+
+
 def enrich_reddit_item(
     item: Dict[str, Any],
     mock_thread_data: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """Enrich a Reddit item with real engagement data.
 
     Args:
         item: Reddit item dict
         mock_thread_data: Mock data for testing
+        deadline: Optional run deadline
+        use_cache: Read cached thread data (see load_parsed_thread)
 
     Returns:
-        Enriched item dict
+        Enriched item dict (item unchanged if the thread could not be loaded)
     """
+    enriched = try_enrich_reddit_item(item, mock_thread_data, deadline, use_cache)
+    return item if enriched is None else enriched
+
+
+def try_enrich_reddit_item(
+    item: Dict[str, Any],
+    mock_thread_data: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+    use_cache: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """enrich_reddit_item, returning None if the thread could not be loaded."""
     url = item.get("url", "")
 
-    # Fetch thread data
-    thread_data = fetch_thread_data(url, mock_thread_data)
-    if not thread_data:
-        return item
+    parsed = load_parsed_thread(url, mock_thread_data, deadline, use_cache)
+    if not parsed:
+        return None
 
-    parsed = parse_thread_data(thread_data)
     submission = parsed.get("submission")
     comments = parsed.get("comments", [])
 
-    # Update engagement metrics
+    # Update engagement metrics and date
     if submission:
-        item["engagement"] = {
-            "score": submission.get("score"),
-            "num_comments": submission.get("num_comments"),
-            "upvote_ratio": submission.get("upvote_ratio"),
-        }
-
-        # Update date from actual data
-        created_utc = submission.get("created_utc")
-        if created_utc:
-            item["date"] = dates.timestamp_to_date(created_utc)
+        apply_submission(item, submission)
 
     # Get top comments
     top_comments = get_top_comments(comments)
@@ -2,21 +2,170 @@
 
 import json
 import os
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from . import schema
+from . import schema, tokens
 
 # Override with LAST30DAYS_OUTPUT_DIR if ~/.local is not writable (e.g. in Streamlit or restricted envs)
 _default_out = Path.home() / ".local" / "share" / "last30days" / "out"
 OUTPUT_DIR = Path(os.environ["LAST30DAYS_OUTPUT_DIR"]) if os.environ.get("LAST30DAYS_OUTPUT_DIR") else _default_out
 
+# Each run writes to OUTPUT_DIR/runs/<timestamp>-<run_id>-<slug>/ so concurrent
+# runs never clobber each other. OUTPUT_DIR/latest points at the newest run.
+RUNS_DIRNAME = "runs"
+LATEST_NAME = "latest"
+LATEST_FILE = "LATEST"  # Fallback pointer where symlinks are unavailable
+
+
+def _env_count(name: str, default: int) -> int:
+    """Non-negative integer from env var name, or default (with a warning) if malformed."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if count < 0:
+        sys.stderr.write(f"[RENDER] Ignoring {name}={value!r} (not a non-negative integer); using {default}\n")
+        return default
+    return count
+
+
+# Retention policy for run directories (override via env)
+RUN_KEEP_COUNT = _env_count("LAST30DAYS_KEEP_RUNS", 20)
+RUN_MAX_AGE_DAYS = _env_count("LAST30DAYS_RUN_MAX_AGE_DAYS", 14)
+
+COMPACT_LIMIT = 15  # Items per source in compact (and streamed) output
+
 
 def ensure_output_dir():
     """Ensure output directory exists."""
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def slugify(topic: str, max_len: int = 40) -> str:
+    """Make a filesystem-safe slug from a topic."""
+    slug = re.sub(r'[^a-z0-9]+', '-', topic.lower()).strip('-')
+    return slug[:max_len].rstrip('-') or "topic"
+
+
+def new_run_id() -> str:
+    """Get the run id from LAST30DAYS_RUN_ID, or generate a fresh one."""
+    run_id = os.environ.get("LAST30DAYS_RUN_ID", "").strip()
+    if run_id:
+        return re.sub(r'[^A-Za-z0-9_-]+', '', run_id)[:32] or os.urandom(4).hex()
+    return os.urandom(4).hex()
+
+
+def get_runs_dir() -> Path:
+    """Get the directory holding per-run output directories."""
+    return OUTPUT_DIR / RUNS_DIRNAME
+
+
+def create_run_dir(topic: str, run_id: Optional[str] = None) -> Path:
+    """Create a fresh run-scoped output directory.
+
+    Args:
+        topic: Research topic (used for the slug)
+        run_id: Optional run id (default: LAST30DAYS_RUN_ID or random)
+
+    Returns:
+        Path to the new run directory
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    name = f"{stamp}-{run_id or new_run_id()}-{slugify(topic)}"
+    run_dir = get_runs_dir() / name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    return run_dir
+
+
+def update_latest(run_dir: Path):
+    """Point OUTPUT_DIR/latest at run_dir (atomic replace)."""
+    ensure_output_dir()
+    link = OUTPUT_DIR / LATEST_NAME
+    tmp = OUTPUT_DIR / f".{LATEST_NAME}.{os.urandom(4).hex()}"
+    target = Path(RUNS_DIRNAME) / run_dir.name
+    try:
+        os.symlink(target, tmp, target_is_directory=True)
+        os.replace(tmp, link)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        # No symlink support - write the run name to a pointer file instead
+        pointer_tmp = OUTPUT_DIR / f".{LATEST_FILE}.{os.urandom(4).hex()}"
+        try:
+            pointer_tmp.write_text(run_dir.name)
+            os.replace(pointer_tmp, OUTPUT_DIR / LATEST_FILE)
+        except OSError:
+            pass
+
+
+def get_latest_run_dir() -> Optional[Path]:
+    """Resolve the latest run directory, or None if there is none."""
+    link = OUTPUT_DIR / LATEST_NAME
+    if link.is_dir():
+        return link.resolve()
+    pointer = OUTPUT_DIR / LATEST_FILE
+    try:
+        run_dir = get_runs_dir() / pointer.read_text().strip()
+        if run_dir.is_dir():
+            return run_dir
+    except OSError:
+        pass
+    return None
+
+
+def gc_runs(
+    keep: int = RUN_KEEP_COUNT,
+    max_age_days: int = RUN_MAX_AGE_DAYS,
+    protect: Optional[Path] = None,
+) -> List[Path]:
+    """Delete old run directories.
+
+    The newest `keep` runs are always kept; older ones are removed once they
+    exceed `max_age_days`, or unconditionally when max_age_days is 0. The
+    latest run and `protect` are never removed.
+
+    Returns:
+        List of removed run directories
+    """
+    runs_dir = get_runs_dir()
+    if not runs_dir.is_dir():
+        return []
+
+    # Names start with a UTC timestamp, so sorting by name is sorting by age
+    runs = sorted((p for p in runs_dir.iterdir() if p.is_dir()), key=lambda p: p.name, reverse=True)
+    latest = get_latest_run_dir()
+    keep_names = {p.name for p in (latest, protect) if p is not None}
+    now = datetime.now(timezone.utc).timestamp()
+
+    removed = []
+    for run_dir in runs[keep:]:
+        if run_dir.name in keep_names:
+            continue
+        if max_age_days:
+            try:
+                age_days = (now - run_dir.stat().st_mtime) / 86400
+            except OSError:
+                continue
+            if age_days < max_age_days:
+                continue
+        import shutil  # Only needed when there is something to collect
+
+        shutil.rmtree(run_dir, ignore_errors=True)
+        removed.append(run_dir)
+    return removed
+
+
 def _assess_data_freshness(report: schema.Report) -> dict:
     """Assess how much data is actually from the last 30 days."""
     reddit_recent = sum(1 for r in report.reddit if r.date and r.date >= report.range_from)
@@ -37,18 +186,103 @@ def _assess_data_freshness(report: schema.Report) -> dict:
     }
 
 
-def render_compact(report: schema.Report, limit: int = 15, missing_keys: str = "none") -> str:
-    """Render compact output for Claude to synthesize.
+def render_reddit_item_compact(item: schema.RedditItem, show_score: bool = True) -> List[str]:
+    """Render one Reddit item in compact format.
 
     Args:
-        report: Report data
-        limit: Max items per source
-        missing_keys: 'both', 'reddit', 'x', or 'none'
+        item: Reddit item
+        show_score: Include the score (False for unscored streamed items)
 
     Returns:
-        Compact markdown string
+        List of lines (ending with a blank line)
     """
     lines = []
+    eng_str = ""
+    if item.engagement:
+        eng = item.engagement
+        parts = []
+        if eng.score is not None:
+            parts.append(f"{eng.score}pts")
+        if eng.num_comments is not None:
+            parts.append(f"{eng.num_comments}cmt")
+        if parts:
+            eng_str = f" [{', '.join(parts)}]"
+
+    date_str = f" ({item.date})" if item.date else " (date unknown)"
+    conf_str = f" [date:{item.date_confidence}]" if item.date_confidence != "high" else ""
+    score_str = f" (score:{item.score})" if show_score else ""
+
+    lines.append(f"**{item.id}**{score_str} r/{item.subreddit}{date_str}{conf_str}{eng_str}")
+    lines.append(f"  {item.title}")
+    lines.append(f"  {item.url}")
+    lines.append(f"  *{item.why_relevant}*")
+
+    # Top comment insights
+    if item.comment_insights:
+        lines.append(f"  Insights:")
+        for insight in item.comment_insights[:3]:
+            lines.append(f"    - {insight}")
+
+    lines.append("")
+    return lines
+
+
+def render_x_item_compact(item: schema.XItem) -> List[str]:
+    """Render one X item in compact format.
+
+    Args:
+        item: X item
+
+    Returns:
+        List of lines (ending with a blank line)
+    """
+    lines = []
+    eng_str = ""
+    if item.engagement:
+        eng = item.engagement
+        parts = []
+        if eng.likes is not None:
+            parts.append(f"{eng.likes}likes")
+        if eng.reposts is not None:
+            parts.append(f"{eng.reposts}rt")
+        if parts:
+            eng_str = f" [{', '.join(parts)}]"
+
+    date_str = f" ({item.date})" if item.date else " (date unknown)"
+    conf_str = f" [date:{item.date_confidence}]" if item.date_confidence != "high" else ""
+
+    lines.append(f"**{item.id}** (score:{item.score}) @{item.author_handle}{date_str}{conf_str}{eng_str}")
+    lines.append(f"  {item.text[:200]}...")
+    lines.append(f"  {item.url}")
+    lines.append(f"  *{item.why_relevant}*")
+    lines.append("")
+    return lines
+
+
+def render_web_item_compact(item: schema.WebSearchItem) -> List[str]:
+    """Render one web result in compact format.
+
+    Args:
+        item: Web search item
+
+    Returns:
+        List of lines (ending with a blank line)
+    """
+    date_str = f" ({item.date})" if item.date else " (date unknown)"
+    conf_str = f" [date:{item.date_confidence}]" if item.date_confidence != "high" else ""
+    return [
+        f"**{item.id}** [WEB] (score:{item.score}) {item.source_domain}{date_str}{conf_str}",
+        f"  {item.title}",
+        f"  {item.url}",
+        f"  {item.snippet[:150]}...",
+        f"  *{item.why_relevant}*",
+        "",
+    ]
+
+
+def _compact_header(report: schema.Report, missing_keys: str) -> List[str]:
+    """Title, freshness/mode/cache notices and run details of compact output."""
+    lines = []
 
     # Header
     lines.append(f"## Research Results: {report.topic}")
@@ -96,104 +330,293 @@ def render_compact(report: schema.Report, limit: int = 15, missing_keys: str = "
         lines.append("*💡 Tip: Add OPENAI_API_KEY for Reddit data and better triangulation.*")
         lines.append("")
 
-    # Reddit items
-    if report.reddit_error:
-        lines.append("### Reddit Threads")
-        lines.append("")
-        lines.append(f"**ERROR:** {report.reddit_error}")
-        lines.append("")
-    elif report.mode in ("both", "reddit-only") and not report.reddit:
-        lines.append("### Reddit Threads")
-        lines.append("")
-        lines.append("*No relevant Reddit threads found for this topic.*")
-        lines.append("")
-    elif report.reddit:
-        lines.append("### Reddit Threads")
-        lines.append("")
-        for item in report.reddit[:limit]:
-            eng_str = ""
-            if item.engagement:
-                eng = item.engagement
-                parts = []
-                if eng.score is not None:
-                    parts.append(f"{eng.score}pts")
-                if eng.num_comments is not None:
-                    parts.append(f"{eng.num_comments}cmt")
-                if parts:
-                    eng_str = f" [{', '.join(parts)}]"
-
-            date_str = f" ({item.date})" if item.date else " (date unknown)"
-            conf_str = f" [date:{item.date_confidence}]" if item.date_confidence != "high" else ""
-
-            lines.append(f"**{item.id}** (score:{item.score}) r/{item.subreddit}{date_str}{conf_str}{eng_str}")
-            lines.append(f"  {item.title}")
-            lines.append(f"  {item.url}")
-            lines.append(f"  *{item.why_relevant}*")
-
-            # Top comment insights
-            if item.comment_insights:
-                lines.append(f"  Insights:")
-                for insight in item.comment_insights[:3]:
-                    lines.append(f"    - {insight}")
+    return lines
 
-            lines.append("")
 
-    # X items
-    if report.x_error:
-        lines.append("### X Posts")
-        lines.append("")
-        lines.append(f"**ERROR:** {report.x_error}")
-        lines.append("")
-    elif report.mode in ("both", "x-only", "all", "x-web") and not report.x:
-        lines.append("### X Posts")
-        lines.append("")
-        lines.append("*No relevant X posts found for this topic.*")
-        lines.append("")
-    elif report.x:
-        lines.append("### X Posts")
-        lines.append("")
-        for item in report.x[:limit]:
-            eng_str = ""
-            if item.engagement:
-                eng = item.engagement
-                parts = []
-                if eng.likes is not None:
-                    parts.append(f"{eng.likes}likes")
-                if eng.reposts is not None:
-                    parts.append(f"{eng.reposts}rt")
-                if parts:
-                    eng_str = f" [{', '.join(parts)}]"
-
-            date_str = f" ({item.date})" if item.date else " (date unknown)"
-            conf_str = f" [date:{item.date_confidence}]" if item.date_confidence != "high" else ""
-
-            lines.append(f"**{item.id}** (score:{item.score}) @{item.author_handle}{date_str}{conf_str}{eng_str}")
-            lines.append(f"  {item.text[:200]}...")
-            lines.append(f"  {item.url}")
-            lines.append(f"  *{item.why_relevant}*")
-            lines.append("")
+def _compact_sections(report: schema.Report) -> List[tuple]:
+    """(source, heading, notice lines, items, item renderer) per compact section.
 
-    # Web items (if any - populated by Claude)
-    if report.web_error:
-        lines.append("### Web Results")
-        lines.append("")
-        lines.append(f"**ERROR:** {report.web_error}")
+    A section with notice lines (an error, or no results where some were
+    expected) shows only those; one with neither notice nor items is omitted.
+    """
+    sections = []
+    for source, heading, error, expected, items, render_item in (
+        ("Reddit", "### Reddit Threads", report.reddit_error, ("both", "reddit-only"),
+         report.reddit, render_reddit_item_compact),
+        ("X", "### X Posts", report.x_error, ("both", "x-only", "all", "x-web"),
+         report.x, render_x_item_compact),
+        ("Web", "### Web Results", report.web_error, (), report.web, render_web_item_compact),
+    ):
+        notice = []
+        if error:
+            notice = [f"**ERROR:** {error}", ""]
+        elif report.mode in expected and not items:
+            noun = "Reddit threads" if source == "Reddit" else "X posts"
+            notice = [f"*No relevant {noun} found for this topic.*", ""]
+        if notice or items:
+            sections.append((source, heading, notice, [] if notice else items, render_item))
+    return sections
+
+
+def render_compact(report: schema.Report, limit: int = COMPACT_LIMIT, missing_keys: str = "none") -> str:
+    """Render compact output for Claude to synthesize.
+
+    Args:
+        report: Report data
+        limit: Max items per source
+        missing_keys: 'both', 'reddit', 'x', or 'none'
+
+    Returns:
+        Compact markdown string
+    """
+    lines = _compact_header(report, missing_keys)
+    for source, heading, notice, items, render_item in _compact_sections(report):
+        lines.append(heading)
         lines.append("")
-    elif report.web:
-        lines.append("### Web Results")
+        lines.extend(notice)
+        for item in items[:limit]:
+            lines.extend(render_item(item))
+    return "\n".join(lines)
+
+
+# Budgeted output (--budget). Items are taken greedily by score, each source's
+# next item discounted by DIVERSITY_DECAY per item already taken from it, so
+# one busy source cannot crowd out the others. An item that does not fit in
+# full is shown in its brief form if that fits.
+DIVERSITY_DECAY = 0.85
+BRIEF_LINES = 3  # Lines of an item's compact form kept in its brief form (id, title/text, URL)
+
+
+@dataclass
+class BudgetedOutput:
+    """Output cut to a token budget, with what it cost."""
+    text: str
+    tokens_used: int  # Estimated (see tokens.count)
+    budget: int
+    shown: Dict[str, int] = field(default_factory=dict)  # Items per source
+    brief: int = 0  # Items shown in brief form
+    omitted: Dict[str, int] = field(default_factory=dict)  # Items per source left out
+
+    def summary(self) -> str:
+        """One line on tokens used and items left out."""
+        text = f"{self.tokens_used:,} of {self.budget:,} tokens (~${tokens.cost_usd(self.tokens_used):.4f})"
+        left_out = _left_out(self.omitted)
+        return f"{text}; left out {left_out}" if left_out else text
+
+
+def _left_out(omitted: Dict[str, int]) -> str:
+    return ", ".join(f"{n} {source}" for source, n in omitted.items() if n)
+
+
+def _budget_footer(omitted: Dict[str, int]) -> List[str]:
+    return [f"*{_left_out(omitted)} lower-ranked item(s) left out to fit the context budget.*", ""]
+
+
+def _fill_budget(
+    queues: Dict[str, list],
+    forms: Callable[[str, Any], Tuple[List[str], List[str]]],
+    available: int,
+) -> Tuple[Dict[str, List[Tuple[Any, List[str]]]], Dict[str, int], int]:
+    """Pick items for a token budget, by score and source diversity.
+
+    Args:
+        queues: Items per source, best first (consumed)
+        forms: (full lines, brief lines) of an item
+        available: Tokens left for items
+
+    Returns:
+        ((item, lines) picked per source, items left out per source, brief count)
+    """
+    picked = {source: [] for source in queues}
+    omitted = {source: 0 for source in queues}
+    brief = 0
+    while any(queues.values()):
+        source = max(
+            (s for s in queues if queues[s]),
+            key=lambda s: queues[s][0].score * DIVERSITY_DECAY ** len(picked[s]),
+        )
+        item = queues[source].pop(0)
+        full, short = forms(source, item)
+        for form in (full, short):
+            cost = tokens.count("\n" + "\n".join(form))  # Joined to the lines before it
+            if cost <= available:
+                available -= cost
+                picked[source].append((item, form))
+                brief += form is short
+                break
+        else:
+            omitted[source] += 1
+    return picked, omitted, brief
+
+
+def render_compact_budgeted(
+    report: schema.Report,
+    budget: int,
+    limit: int = COMPACT_LIMIT,
+    missing_keys: str = "none",
+) -> BudgetedOutput:
+    """Render compact output that fits in an estimated token budget.
+
+    The header, section headings and error notices are always shown, and
+    items are never more than limit per source (so --top-k output stays the
+    same). Within that, items fill the budget by score and source diversity.
+
+    Args:
+        report: Report data
+        budget: Token budget for the whole output
+        limit: Max items per source
+        missing_keys: 'both', 'reddit', 'x', or 'none'
+
+    Returns:
+        BudgetedOutput
+    """
+    header = _compact_header(report, missing_keys)
+    sections = _compact_sections(report)
+    renderers = {source: render_item for source, _, _, _, render_item in sections}
+
+    def forms(source, item):
+        full = renderers[source](item)
+        return full, full[:BRIEF_LINES] + [""]
+
+    # Reserve room for the footer at its longest
+    fixed = header + _budget_footer({source: 999 for source in renderers})
+    for _, heading, notice, _, _ in sections:
+        fixed += [heading, ""] + notice
+    picked, omitted, brief = _fill_budget(
+        {source: list(items[:limit]) for source, _, _, items, _ in sections},
+        forms,
+        budget - tokens.count("\n".join(fixed)),
+    )
+
+    lines = list(header)
+    for source, heading, notice, _, _ in sections:
+        lines.append(heading)
         lines.append("")
-        for item in report.web[:limit]:
-            date_str = f" ({item.date})" if item.date else " (date unknown)"
-            conf_str = f" [date:{item.date_confidence}]" if item.date_confidence != "high" else ""
-
-            lines.append(f"**{item.id}** [WEB] (score:{item.score}) {item.source_domain}{date_str}{conf_str}")
-            lines.append(f"  {item.title}")
-            lines.append(f"  {item.url}")
-            lines.append(f"  {item.snippet[:150]}...")
-            lines.append(f"  *{item.why_relevant}*")
-            lines.append("")
+        lines.extend(notice)
+        for _, form in picked[source]:
+            lines.extend(form)
+    if any(omitted.values()):
+        lines.extend(_budget_footer(omitted))
+    text = "\n".join(lines)
+    return BudgetedOutput(
+        text=text,
+        tokens_used=tokens.count(text),
+        budget=budget,
+        shown={source: len(entries) for source, entries in picked.items()},
+        brief=brief,
+        omitted=omitted,
+    )
+
+
+# Streaming output (--emit=stream). Each block is wrapped in HTML comment
+# markers so consumers can split the stream while it is still being written,
+# and the markers stay invisible when the output is rendered as markdown.
+STREAM_BEGIN = "<!-- last30days:{kind} begin{attrs} -->"
+STREAM_END = "<!-- last30days:{kind} end -->"
+
+
+def render_stream_block(kind: str, body: str, **attrs) -> str:
+    """Wrap body in stream delimiters.
 
-    return "\n".join(lines)
+    Args:
+        kind: Block kind ('x', 'reddit-item', 'final', ...)
+        body: Block content
+        **attrs: Extra key=value attributes for the begin marker
+
+    Returns:
+        Delimited block string
+    """
+    attr_str = "".join(f" {k}={v}" for k, v in attrs.items() if v is not None)
+    return "\n".join([
+        STREAM_BEGIN.format(kind=kind, attrs=attr_str),
+        body.rstrip("\n"),
+        STREAM_END.format(kind=kind),
+    ])
+
+
+_STREAM_BLOCK_RE = re.compile(
+    r'^<!-- last30days:(?P<kind>[\w-]+) begin(?P<attrs>[^>]*?) -->\n(?P<body>.*?)\n<!-- last30days:(?P=kind) end -->$',
+    re.MULTILINE | re.DOTALL,
+)
+
+
+def parse_stream_blocks(text: str) -> List[dict]:
+    """Parse complete --emit=stream blocks out of (possibly partial) output.
+
+    Returns:
+        List of dicts with 'kind', 'attrs' and 'body', in stream order
+    """
+    blocks = []
+    for match in _STREAM_BLOCK_RE.finditer(text):
+        attrs = dict(
+            part.split("=", 1) for part in match.group("attrs").split() if "=" in part
+        )
+        blocks.append({"kind": match.group("kind"), "attrs": attrs, "body": match.group("body")})
+    return blocks
+
+
+class StreamWriter:
+    """Thread-safe writer for incremental --emit=stream output."""
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.lock = threading.Lock()
+        self.seq = 0
+
+    def emit(self, kind: str, body: str, **attrs):
+        """Write one delimited block and flush immediately."""
+        with self.lock:
+            self.seq += 1
+            self.out.write(render_stream_block(kind, body, seq=self.seq, **attrs) + "\n\n")
+            self.out.flush()
+
+    def emit_x(self, items: List[schema.XItem], error: Optional[str] = None, limit: int = COMPACT_LIMIT):
+        """Emit the scored X section."""
+        lines = ["### X Posts", ""]
+        if error:
+            lines.append(f"**ERROR:** {error}")
+        elif not items:
+            lines.append("*No relevant X posts found for this topic.*")
+        for item in items[:limit]:
+            lines.extend(render_x_item_compact(item))
+        self.emit("x", "\n".join(lines), count=len(items))
+
+    def emit_reddit_item(self, item: schema.RedditItem, current: int, total: Optional[int] = None):
+        """Emit one enriched (not yet scored) Reddit item.
+
+        total is None while the search is still running and the count of
+        threads is not known yet.
+        """
+        body = "\n".join(render_reddit_item_compact(item, show_score=False))
+        self.emit("reddit-item", body, n=f"{current}/{total}" if total else str(current))
+
+    def emit_error(self, source: str, error: str):
+        """Emit a source error as soon as it is known."""
+        self.emit("error", f"**{source} ERROR:** {error}", source=source.lower())
+
+    def emit_final(self, body: str):
+        """Emit the final consolidated block."""
+        self.emit("final", body)
+
+
+def _context_head(report: schema.Report) -> List[str]:
+    return [
+        f"# Context: {report.topic} (Last 30 Days)",
+        "",
+        f"*Generated: {report.generated_at[:10]} | Sources: {report.mode}*",
+        "",
+        "## Key Sources",
+        "",
+    ]
+
+
+_CONTEXT_TAIL = [
+    "",
+    "## Summary",
+    "",
+    "*See full report for best practices, prompt pack, and detailed sources.*",
+    "",
+]
 
 
 def render_context_snippet(report: schema.Report) -> str:
@@ -205,15 +628,7 @@ def render_context_snippet(report: schema.Report) -> str:
     Returns:
         Context markdown string
     """
-    lines = []
-    lines.append(f"# Context: {report.topic} (Last 30 Days)")
-    lines.append("")
-    lines.append(f"*Generated: {report.generated_at[:10]} | Sources: {report.mode}*")
-    lines.append("")
-
-    # Key sources summary
-    lines.append("## Key Sources")
-    lines.append("")
+    lines = _context_head(report)
 
     all_items = []
     for item in report.reddit[:5]:
@@ -227,15 +642,49 @@ def render_context_snippet(report: schema.Report) -> str:
     for score, source, text, url in all_items[:7]:
         lines.append(f"- [{source}] {text}")
 
-    lines.append("")
-    lines.append("## Summary")
-    lines.append("")
-    lines.append("*See full report for best practices, prompt pack, and detailed sources.*")
-    lines.append("")
-
+    lines.extend(_CONTEXT_TAIL)
     return "\n".join(lines)
 
 
+def render_context_budgeted(report: schema.Report, budget: int, limit: int = COMPACT_LIMIT) -> BudgetedOutput:
+    """Render the context snippet with as many key sources as fit in a token budget.
+
+    Key sources are shown in full with their URL, or cut to 50 characters
+    when only that fits, picked by score and source diversity.
+
+    Args:
+        report: Report data
+        budget: Token budget for the whole snippet
+        limit: Max items per source
+
+    Returns:
+        BudgetedOutput
+    """
+    head = _context_head(report)
+    queues = {"Reddit": report.reddit[:limit], "X": report.x[:limit], "Web": report.web[:limit]}
+
+    def forms(source, item):
+        text = item.text if source == "X" else item.title
+        return [f"- [{source}] {text} ({item.url})"], [f"- [{source}] {text[:50]}..."]
+
+    picked, omitted, brief = _fill_budget(
+        {source: list(items) for source, items in queues.items()},
+        forms,
+        budget - tokens.count("\n".join(head + _CONTEXT_TAIL)),
+    )
+    # Best first across sources, as in the unbudgeted snippet
+    chosen = sorted((entry for entries in picked.values() for entry in entries), key=lambda e: -e[0].score)
+    text = "\n".join(head + [form[0] for _, form in chosen] + _CONTEXT_TAIL)
+    return BudgetedOutput(
+        text=text,
+        tokens_used=tokens.count(text),
+        budget=budget,
+        shown={source: len(entries) for source, entries in picked.items()},
+        brief=brief,
+        omitted=omitted,
+    )
+
+
 def render_full_report(report: schema.Report) -> str:
     """Render full markdown report.
 
@@ -253,6 +702,8 @@ def render_full_report(report: schema.Report) -> str:
     lines.append(f"**Generated:** {report.generated_at}")
     lines.append(f"**Date Range:** {report.range_from} to {report.range_to}")
     lines.append(f"**Mode:** {report.mode}")
+    if report.top_k:
+        lines.append(f"**Truncated:** top {report.top_k} items per source only (--top-k)")
     lines.append("")
 
     # Models
@@ -344,43 +795,56 @@ def write_outputs(
     raw_openai: Optional[dict] = None,
     raw_xai: Optional[dict] = None,
     raw_reddit_enriched: Optional[list] = None,
-):
-    """Write all output files.
+    run_dir: Optional[Path] = None,
+) -> Path:
+    """Write all output files to a run-scoped directory.
 
     Args:
         report: Report data
         raw_openai: Raw OpenAI API response
         raw_xai: Raw xAI API response
         raw_reddit_enriched: Raw enriched Reddit thread data
+        run_dir: Target directory (default: a new run dir for report.topic)
+
+    Returns:
+        Path to the run directory the outputs were written to
     """
-    ensure_output_dir()
+    if run_dir is None:
+        run_dir = create_run_dir(report.topic)
+    run_dir.mkdir(parents=True, exist_ok=True)
 
     # report.json
-    with open(OUTPUT_DIR / "report.json", 'w') as f:
+    with open(run_dir / "report.json", 'w') as f:
         json.dump(report.to_dict(), f, indent=2)
 
     # report.md
-    with open(OUTPUT_DIR / "report.md", 'w') as f:
+    with open(run_dir / "report.md", 'w') as f:
         f.write(render_full_report(report))
 
     # last30days.context.md
-    with open(OUTPUT_DIR / "last30days.context.md", 'w') as f:
+    with open(run_dir / "last30days.context.md", 'w') as f:
         f.write(render_context_snippet(report))
 
     # Raw responses
     if raw_openai:
-        with open(OUTPUT_DIR / "raw_openai.json", 'w') as f:
+        with open(run_dir / "raw_openai.json", 'w') as f:
             json.dump(raw_openai, f, indent=2)
 
     if raw_xai:
-        with open(OUTPUT_DIR / "raw_xai.json", 'w') as f:
+        with open(run_dir / "raw_xai.json", 'w') as f:
             json.dump(raw_xai, f, indent=2)
 
     if raw_reddit_enriched:
-        with open(OUTPUT_DIR / "raw_reddit_threads_enriched.json", 'w') as f:
+        with open(run_dir / "raw_reddit_threads_enriched.json", 'w') as f:
             json.dump(raw_reddit_enriched, f, indent=2)
 
+    update_latest(run_dir)
+    gc_runs(protect=run_dir)
+
+    return run_dir
+
 
-def get_context_path() -> str:
-    """Get path to context file."""
-    return str(OUTPUT_DIR / "last30days.context.md")
+def get_context_path(run_dir: Optional[Path] = None) -> str:
+    """Get path to context file (defaults to the latest run)."""
+    run_dir = run_dir or get_latest_run_dir() or (OUTPUT_DIR / LATEST_NAME)
+    return str(run_dir / "last30days.context.md")
@@ -0,0 +1,123 @@
+"""Priority-ordered enrichment scheduling for last30days skill.
+
+Reddit threads come back from the search in whatever order the model wrote
+them, which says little about how they will rank. Enrichment work is
+ordered by each thread's expected score instead (relevance, date hint and a
+subreddit prior, see score.expected_reddit_score), so when the deadline or
+an open circuit cuts enrichment short, the threads left unenriched are the
+ones least likely to be shown.
+
+A Scheduler runs submitted work on its own worker threads, highest
+priority first, while items are still arriving (streamed searches);
+by_priority orders a finished list for the caller to work through.
+"""
+
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .deadline import Deadline
+
+IDLE_POLL = 0.5  # Seconds between deadline checks while the queue is empty
+
+
+def by_priority(priorities: Sequence[float]) -> List[int]:
+    """Indices of priorities, highest first (ties keep their order)."""
+    return sorted(range(len(priorities)), key=lambda i: -priorities[i])
+
+
+class Scheduler:
+    """Runs work(key, item) for submitted items, highest priority first.
+
+    Each key is queued once and gets a concurrent.futures.Future. Workers
+    stop starting new work once the deadline has expired, cancelling what
+    is still queued; close() does the same on demand, so the caller can take
+    over the pending items itself.
+    """
+
+    def __init__(
+        self,
+        work: Callable[[str, Dict[str, Any]], Any],
+        workers: int = 1,
+        deadline: Optional[Deadline] = None,
+        name: str = "scheduler",
+    ):
+        self._work = work
+        self._deadline = deadline
+        self._heap = []  # (-priority, seq, key, item, future)
+        self._futures: Dict[str, Future] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True).start()
+
+    def submit(self, key: str, item: Dict[str, Any], priority: float) -> Future:
+        """Queue work for key (once; later submissions get the same Future)."""
+        with self._cond:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = Future()
+                if self._closed:
+                    future.cancel()
+                else:
+                    heapq.heappush(self._heap, (-priority, next(self._seq), key, item, future))
+                    self._cond.notify()
+            return future
+
+    def get(self, key: str) -> Optional[Future]:
+        """Future of key's work, if it was submitted."""
+        with self._cond:
+            return self._futures.get(key)
+
+    def __len__(self) -> int:
+        """Number of submitted keys."""
+        with self._cond:
+            return len(self._futures)
+
+    def pending(self) -> int:
+        """Number of queued, not yet started items."""
+        with self._cond:
+            return len(self._heap)
+
+    def close(self):
+        """Stop taking work and cancel whatever has not started.
+
+        Work already running finishes; its Future still gets the result.
+        """
+        with self._cond:
+            self._closed = True
+            self._cancel_queued()
+            self._cond.notify_all()
+
+    def _cancel_queued(self):
+        for entry in self._heap:
+            entry[-1].cancel()
+        self._heap.clear()
+
+    def _next(self) -> Optional[tuple]:
+        """Highest-priority queued entry; None once closed."""
+        with self._cond:
+            while True:
+                if self._heap and self._deadline and self._deadline.expired():
+                    self._cancel_queued()
+                if self._heap:
+                    return heapq.heappop(self._heap)
+                if self._closed:
+                    return None
+                self._cond.wait(IDLE_POLL)
+
+    def _run(self):
+        while True:
+            entry = self._next()
+            if entry is None:
+                return
+            _, _, key, item, future = entry
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._work(key, item))
+            except BaseException as e:
+                future.set_exception(e)
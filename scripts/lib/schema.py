@@ -192,6 +192,9 @@ class Report:
     # Cache info
     from_cache: bool = False
     cache_age_hours: Optional[float] = None
+    # Set by --top-k runs: only the top top_k items per source were fully
+    # processed, so the report is not the full result
+    top_k: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         d = {
@@ -221,6 +224,8 @@ class Report:
             d['from_cache'] = self.from_cache
         if self.cache_age_hours is not None:
             d['cache_age_hours'] = self.cache_age_hours
+        if self.top_k:
+            d['top_k'] = self.top_k
         return d
 
     @classmethod
@@ -313,6 +318,7 @@ class Report:
             web_error=data.get('web_error'),
             from_cache=data.get('from_cache', False),
             cache_age_hours=data.get('cache_age_hours'),
+            top_k=data.get('top_k'),
         )
 
 
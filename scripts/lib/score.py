@@ -1,7 +1,8 @@
 """Popularity-aware scoring for last30days skill."""
 
+import heapq
 import math
-from typing import List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from . import dates, schema
 
@@ -101,11 +102,15 @@ def normalize_to_100(values: List[float], default: float = 50) -> List[float]:
     return result
 
 
-def score_reddit_items(items: List[schema.RedditItem]) -> List[schema.RedditItem]:
+def score_reddit_items(
+    items: List[schema.RedditItem],
+    ctx: Optional[dates.DateContext] = None,
+) -> List[schema.RedditItem]:
     """Compute scores for Reddit items.
 
     Args:
         items: List of Reddit items
+        ctx: Run date context for recency (default: today)
 
     Returns:
         Items with updated scores
@@ -113,6 +118,8 @@ def score_reddit_items(items: List[schema.RedditItem]) -> List[schema.RedditItem
     if not items:
         return items
 
+    ctx = ctx or dates.DateContext.last_days()
+
     # Compute raw engagement scores
     eng_raw = [compute_reddit_engagement_raw(item.engagement) for item in items]
 
@@ -124,7 +131,7 @@ def score_reddit_items(items: List[schema.RedditItem]) -> List[schema.RedditItem
         rel_score = int(item.relevance * 100)
 
         # Recency subscore
-        rec_score = dates.recency_score(item.date)
+        rec_score = ctx.recency_score(item.date)
 
         # Engagement subscore
         if eng_normalized[i] is not None:
@@ -161,11 +168,47 @@ def score_reddit_items(items: List[schema.RedditItem]) -> List[schema.RedditItem
     return items
 
 
-def score_x_items(items: List[schema.XItem]) -> List[schema.XItem]:
+def expected_reddit_score(
+    item: Dict[str, Any],
+    ctx: dates.DateContext,
+    prior: Optional[float] = None,
+) -> float:
+    """Preliminary score of a raw, not yet enriched Reddit item.
+
+    Used to decide which threads to enrich first. Relevance and the model's
+    date hint are weighted as in score_reddit_items; engagement is unknown
+    until the thread is fetched, so the subreddit's prior (0-100, see
+    history.subreddit_priors) stands in for it.
+
+    Args:
+        item: Raw Reddit item dict
+        ctx: Run date context
+        prior: Expected engagement subscore (default: DEFAULT_ENGAGEMENT)
+
+    Returns:
+        Expected score (0-100)
+    """
+    try:
+        relevance = min(1.0, max(0.0, float(item.get("relevance", 0.5))))
+    except (TypeError, ValueError):
+        relevance = 0.5
+    engagement = DEFAULT_ENGAGEMENT if prior is None else prior
+    return (
+        WEIGHT_RELEVANCE * int(relevance * 100) +
+        WEIGHT_RECENCY * ctx.recency_score(item.get("date")) +
+        WEIGHT_ENGAGEMENT * engagement
+    )
+
+
+def score_x_items(
+    items: List[schema.XItem],
+    ctx: Optional[dates.DateContext] = None,
+) -> List[schema.XItem]:
     """Compute scores for X items.
 
     Args:
         items: List of X items
+        ctx: Run date context for recency (default: today)
 
     Returns:
         Items with updated scores
@@ -173,6 +216,8 @@ def score_x_items(items: List[schema.XItem]) -> List[schema.XItem]:
     if not items:
         return items
 
+    ctx = ctx or dates.DateContext.last_days()
+
     # Compute raw engagement scores
     eng_raw = [compute_x_engagement_raw(item.engagement) for item in items]
 
@@ -184,7 +229,7 @@ def score_x_items(items: List[schema.XItem]) -> List[schema.XItem]:
         rel_score = int(item.relevance * 100)
 
         # Recency subscore
-        rec_score = dates.recency_score(item.date)
+        rec_score = ctx.recency_score(item.date)
 
         # Engagement subscore
         if eng_normalized[i] is not None:
@@ -221,7 +266,10 @@ def score_x_items(items: List[schema.XItem]) -> List[schema.XItem]:
     return items
 
 
-def score_websearch_items(items: List[schema.WebSearchItem]) -> List[schema.WebSearchItem]:
+def score_websearch_items(
+    items: List[schema.WebSearchItem],
+    ctx: Optional[dates.DateContext] = None,
+) -> List[schema.WebSearchItem]:
     """Compute scores for WebSearch items WITHOUT engagement metrics.
 
     Uses reweighted formula: 55% relevance + 45% recency - 15pt source penalty.
@@ -234,6 +282,7 @@ def score_websearch_items(items: List[schema.WebSearchItem]) -> List[schema.WebS
 
     Args:
         items: List of WebSearch items
+        ctx: Run date context for recency (default: today)
 
     Returns:
         Items with updated scores
@@ -241,12 +290,14 @@ def score_websearch_items(items: List[schema.WebSearchItem]) -> List[schema.WebS
     if not items:
         return items
 
+    ctx = ctx or dates.DateContext.last_days()
+
     for item in items:
         # Relevance subscore (model-provided, convert to 0-100)
         rel_score = int(item.relevance * 100)
 
         # Recency subscore
-        rec_score = dates.recency_score(item.date)
+        rec_score = ctx.recency_score(item.date)
 
         # Store subscores (engagement is 0 for WebSearch - no data)
         item.subs = schema.SubScores(
@@ -278,6 +329,29 @@ def score_websearch_items(items: List[schema.WebSearchItem]) -> List[schema.WebS
     return items
 
 
+def sort_key(item: Union[schema.RedditItem, schema.XItem, schema.WebSearchItem]) -> tuple:
+    """Ranking key: score (descending), then date, then source priority."""
+    # Primary: score descending (negate for descending)
+    score = -item.score
+
+    # Secondary: date descending (recent first)
+    date = item.date or "0000-00-00"
+    date_key = -int(date.replace("-", ""))
+
+    # Tertiary: source priority (Reddit > X > WebSearch)
+    if isinstance(item, schema.RedditItem):
+        source_priority = 0
+    elif isinstance(item, schema.XItem):
+        source_priority = 1
+    else:  # WebSearchItem
+        source_priority = 2
+
+    # Quaternary: title/text for stability
+    text = getattr(item, "title", "") or getattr(item, "text", "")
+
+    return (score, date_key, source_priority, text)
+
+
 def sort_items(items: List[Union[schema.RedditItem, schema.XItem, schema.WebSearchItem]]) -> List:
     """Sort items by score (descending), then date, then source priority.
 
@@ -287,25 +361,22 @@ def sort_items(items: List[Union[schema.RedditItem, schema.XItem, schema.WebSear
     Returns:
         Sorted items
     """
-    def sort_key(item):
-        # Primary: score descending (negate for descending)
-        score = -item.score
+    return sorted(items, key=sort_key)
 
-        # Secondary: date descending (recent first)
-        date = item.date or "0000-00-00"
-        date_key = -int(date.replace("-", ""))
 
-        # Tertiary: source priority (Reddit > X > WebSearch)
-        if isinstance(item, schema.RedditItem):
-            source_priority = 0
-        elif isinstance(item, schema.XItem):
-            source_priority = 1
-        else:  # WebSearchItem
-            source_priority = 2
+def iter_sorted(items: List[Union[schema.RedditItem, schema.XItem, schema.WebSearchItem]]) -> Iterator:
+    """Yield items in sort_items order, lazily.
 
-        # Quaternary: title/text for stability
-        text = getattr(item, "title", "") or getattr(item, "text", "")
+    Heapifies once (O(n)) and pays O(log n) per item taken, so a consumer
+    that only needs the first few items never sorts the rest. Ties keep
+    input order, exactly as the stable sort does.
+    """
+    heap = [(sort_key(item), i, item) for i, item in enumerate(items)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
 
-        return (score, date_key, source_priority, text)
 
-    return sorted(items, key=sort_key)
+def top_items(items: List[Union[schema.RedditItem, schema.XItem, schema.WebSearchItem]], k: int) -> List:
+    """The first k items of sort_items(items), by heap selection."""
+    return heapq.nsmallest(k, items, key=sort_key)
@@ -0,0 +1,540 @@
+"""Local stand-in for the OpenAI, xAI and Reddit APIs.
+
+Serves recorded responses for `/v1/responses` (plain and streamed),
+`/v1/models` and Reddit thread / `by_id` `.json` endpoints, so the whole
+pipeline (http.request, retries, rate limiting, streaming, concurrency) can
+run end-to-end on an isolated machine. Point a run at it with
+
+    LAST30DAYS_UPSTREAM=http://127.0.0.1:8787
+
+which makes http.py send every request to the stand-in, with the real host
+as the first path segment (e.g. /api.openai.com/v1/responses).
+
+Responses come from, in order:
+- a recording of the exact same request;
+- another recording for the same kind of endpoint on the same host;
+- the repo's fixtures/ files (thread and by_id replies are rewritten to the
+  requested post ids).
+
+Record mode forwards each request to the real API and saves the reply
+(streamed requests are forwarded unstreamed and re-streamed locally).
+
+Each route kind ('responses', 'models', 'reddit') has a Profile of latency
+distribution, 5xx error rate and 429 rate (see parse_latency for the
+latency syntax). GET /__standin/stats returns request and fault counts.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import cache, extract
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "fixtures"
+RECORDINGS_DIR = cache.CACHE_DIR / "recordings"
+DEFAULT_PORT = 8787
+
+ROUTES = ("responses", "models", "reddit")
+STREAM_CHUNK = 48  # Characters of output text per streamed delta
+STREAM_TTFB_SHARE = 0.3  # Share of a streamed reply's latency before its first event
+
+_THREAD_PATH = re.compile(r'/comments/([a-z0-9]+)', re.I)
+_BY_ID_PATH = re.compile(r'/by_id/([^/?]+?)(?:\.json)?(?:\?|$)', re.I)
+_DATE = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency sampler (seconds) from a spec string.
+
+    Specs: "0.2" (fixed), "uniform:LOW,HIGH", "normal:MEAN,SD",
+    "lognormal:MEDIAN,SIGMA" (heavy tail, like real model APIs) and
+    "exp:MEAN". Samples are never negative.
+
+    Raises:
+        ValueError: On an unknown or malformed spec
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        value = float(kind)
+        return lambda rng: max(0.0, value)
+    args = [float(p) for p in params.split(",")]
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng: max(0.0, rng.uniform(*args))
+    if kind == "normal" and len(args) == 2:
+        return lambda rng: max(0.0, rng.gauss(*args))
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(args[0]) if args[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, args[1])
+    if kind == "exp" and len(args) == 1:
+        return lambda rng: rng.expovariate(1 / args[0]) if args[0] > 0 else 0.0
+    raise ValueError(f"Unknown latency spec: {spec!r}")
+
+
+@dataclass
+class Profile:
+    """Simulated behaviour of one route kind."""
+    latency: str = "0"
+    error_rate: float = 0.0  # Share of requests answered 503
+    throttle_rate: float = 0.0  # Share of requests answered 429
+    retry_after: float = 1.0  # Retry-After (seconds) sent with each 429
+
+    def __post_init__(self):
+        self.sample_latency = parse_latency(self.latency)
+
+
+@dataclass
+class Config:
+    """Stand-in settings: a default Profile plus per-route overrides."""
+    default: Profile = field(default_factory=Profile)
+    routes: Dict[str, Profile] = field(default_factory=dict)
+    recordings: Path = RECORDINGS_DIR
+    record: bool = False
+    forward_to: str = "https://{host}"  # Where record mode sends requests
+    seed: Optional[int] = None
+
+    def profile(self, route: str) -> Profile:
+        return self.routes.get(route, self.default)
+
+    @classmethod
+    def from_file(cls, path: Path, **kwargs) -> "Config":
+        """Load {"default": {...}, "reddit": {...}, ...} Profile fields from JSON."""
+        data = json.loads(Path(path).read_text())
+        default = Profile(**data.get("default", {}))
+        routes = {
+            route: Profile(**{**asdict(default), **data[route]})
+            for route in ROUTES if route in data
+        }
+        return cls(default=default, routes=routes, **kwargs)
+
+
+def route_of(host: str, path: str) -> str:
+    """Route kind of a request: 'responses', 'models', 'reddit' or 'other'."""
+    if host.endswith("reddit.com"):
+        return "reddit"
+    path = path.split("?", 1)[0]
+    if path.endswith("/responses"):
+        return "responses"
+    if path.endswith("/models"):
+        return "models"
+    return "other"
+
+
+def _family(host: str, path: str) -> str:
+    """Recordings that can stand in for each other share a family."""
+    route = route_of(host, path)
+    if route == "reddit":
+        return "reddit:by_id" if _BY_ID_PATH.search(path) else "reddit:thread"
+    return f"{host}:{route}"
+
+
+def request_key(method: str, host: str, path: str, body: Optional[Dict[str, Any]]) -> str:
+    """Recording key of a request (the stream flag does not count)."""
+    body = {k: v for k, v in (body or {}).items() if k != "stream"}
+    blob = json.dumps([method, host, path, body], sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+
+class Recordings:
+    """Recorded replies on disk, indexed by request key and by family."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._by_family: Dict[str, List[Dict[str, Any]]] = {}
+        self._turn: Dict[str, int] = {}
+        if self.root.exists():
+            for path in sorted(self.root.glob("*/*.json")):
+                try:
+                    self._index(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def _index(self, entry: Dict[str, Any]):
+        self._by_key[entry["key"]] = entry
+        self._by_family.setdefault(_family(entry["host"], entry["path"]), []).append(entry)
+
+    def exact(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recording of exactly this request."""
+        with self._lock:
+            return self._by_key.get(key)
+
+    def similar(self, family: str) -> Optional[Dict[str, Any]]:
+        """The next successful recording of a family (round robin)."""
+        with self._lock:
+            entries = [e for e in self._by_family.get(family, []) if e["status"] == 200]
+            if not entries:
+                return None
+            turn = self._turn.get(family, 0)
+            self._turn[family] = turn + 1
+            return entries[turn % len(entries)]
+
+    def save(self, key: str, method: str, host: str, path: str, status: int, body: Any):
+        entry = {
+            "key": key, "method": method, "host": host, "path": path,
+            "status": status, "body": body, "recorded_at": time.time(),
+        }
+        target = self.root / host / f"{key}.json"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry))
+        tmp.replace(target)
+        with self._lock:
+            self._index(entry)
+
+
+def _fixture(name: str) -> Any:
+    try:
+        return _fresh_dates(json.loads((FIXTURES_DIR / name).read_text()))
+    except (OSError, ValueError):
+        return None
+
+
+def _fresh_dates(data: Any) -> Any:
+    """Fixture data with its dates moved forward so the newest is yesterday.
+
+    Fixtures are frozen in time; without this every fixture item would fall
+    outside the 30-day window and be filtered out before scoring.
+    """
+    yesterday = date.today() - timedelta(days=1)
+    text = json.dumps(data)
+    found = []
+    for match in _DATE.finditer(text):
+        try:
+            found.append(date(*map(int, match.groups())))
+        except ValueError:
+            continue
+    if found:
+        shift = yesterday - max(found)
+
+        def moved(match):
+            try:
+                return (date(*map(int, match.groups())) + shift).isoformat()
+            except ValueError:
+                return match.group(0)
+
+        data = json.loads(_DATE.sub(moved, text))
+
+    stamps = []
+
+    def walk(node, apply=None):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "created_utc" and isinstance(value, (int, float)):
+                    if apply:
+                        node[key] = apply(value)
+                    else:
+                        stamps.append(value)
+                else:
+                    walk(value, apply)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value, apply)
+
+    walk(data)
+    if stamps:
+        newest = date.fromtimestamp(max(stamps))
+        offset = (yesterday - newest).days * 86400
+        walk(data, lambda value: value + offset)
+    return data
+
+
+def _with_post_id(thread: Any, post_id: str) -> Any:
+    """Thread listing JSON rewritten to carry post_id."""
+    thread = json.loads(json.dumps(thread))
+    try:
+        submission = thread[0]["data"]["children"][0]["data"]
+    except (IndexError, KeyError, TypeError):
+        return thread
+    submission["id"] = post_id
+    submission["name"] = f"t3_{post_id}"
+    return thread
+
+
+def _by_id_listing(thread: Any, names: str) -> Dict[str, Any]:
+    """/by_id listing for the requested t3_ names, built from a thread."""
+    children = []
+    for name in names.split(","):
+        post_id = name.split("_", 1)[-1]
+        listing = _with_post_id(thread, post_id)
+        try:
+            children.append(listing[0]["data"]["children"][0])
+        except (IndexError, KeyError, TypeError):
+            continue
+    return {"kind": "Listing", "data": {"children": children}}
+
+
+def fixture_reply(host: str, path: str) -> Optional[Any]:
+    """Reply built from the repo's fixtures/ files, if one fits."""
+    route = route_of(host, path)
+    if route == "responses":
+        return _fixture("xai_sample.json" if "x.ai" in host else "openai_sample.json")
+    if route == "models":
+        return _fixture("models_xai_sample.json" if "x.ai" in host else "models_openai_sample.json")
+    if route == "reddit":
+        thread = _fixture("reddit_thread_sample.json")
+        if thread is None:
+            return None
+        by_id = _BY_ID_PATH.search(path)
+        if by_id:
+            return _by_id_listing(thread, by_id.group(1))
+        match = _THREAD_PATH.search(path)
+        return _with_post_id(thread, match.group(1)) if match else thread
+    return None
+
+
+def sse_events(response: Dict[str, Any]) -> List[str]:
+    """Server-sent events replaying a Responses API reply as a stream."""
+    text = extract.output_text(response)
+    events = []
+    for start in range(0, len(text), STREAM_CHUNK):
+        delta = {"type": "response.output_text.delta", "delta": text[start:start + STREAM_CHUNK]}
+        events.append(f"event: response.output_text.delta\ndata: {json.dumps(delta)}\n\n")
+    completed = {"type": "response.completed", "response": response}
+    events.append(f"event: response.completed\ndata: {json.dumps(completed)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return events
+
+
+class StandIn:
+    """Decides each reply: faults, latency, then a recorded or fixture body."""
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.recordings = Recordings(self.config.recordings)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": {route: 0 for route in ROUTES + ("other",)},
+            "throttled": 0, "errors": 0, "streams": 0, "recorded": 0, "fixtures": 0, "missing": 0,
+            "in_flight": 0, "max_in_flight": 0,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self._stats[name] += delta
+            if name == "in_flight":
+                self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._stats["in_flight"])
+
+    def _roll(self, route: str) -> Tuple[Optional[int], float]:
+        """(injected status or None, latency) for one request."""
+        profile = self.config.profile(route)
+        with self._lock:
+            self._stats["requests"][route] += 1
+            roll = self._rng.random()
+            latency = profile.sample_latency(self._rng)
+        if roll < profile.throttle_rate:
+            self._count("throttled")
+            return 429, latency
+        if roll < profile.throttle_rate + profile.error_rate:
+            self._count("errors")
+            return 503, latency
+        return None, latency
+
+    def reply(
+        self, method: str, host: str, path: str, body: Optional[Dict[str, Any]], headers: Dict[str, str],
+    ) -> Tuple[int, Any]:
+        """(status, JSON body) for a request, from recordings, upstream or fixtures."""
+        key = request_key(method, host, path, body)
+        if self.config.record:
+            status, data = forward(method, self.config.forward_to.format(host=host) + path, body, headers)
+            if status < 500 and status != 429:
+                self.recordings.save(key, method, host, path, status, data)
+                self._count("recorded")
+            return status, data
+        entry = self.recordings.exact(key)
+        if entry is not None:
+            return entry["status"], entry["body"]
+
+        # Stand in with a recording of another request of the same kind
+        data = None
+        if route_of(host, path) == "reddit":
+            entry = self.recordings.similar("reddit:thread")
+            by_id = _BY_ID_PATH.search(path)
+            thread = _THREAD_PATH.search(path)
+            if entry is not None and by_id:
+                data = _by_id_listing(entry["body"], by_id.group(1))
+            elif entry is not None and thread:
+                data = _with_post_id(entry["body"], thread.group(1))
+        else:
+            entry = self.recordings.similar(_family(host, path))
+            data = entry["body"] if entry is not None else None
+        if data is not None:
+            return 200, data
+
+        data = fixture_reply(host, path)
+        if data is None:
+            self._count("missing")
+            return 404, {"error": {"message": f"No recording for {method} {host}{path}"}}
+        self._count("fixtures")
+        return 200, data
+
+
+def forward(
+    method: str, url: str, body: Optional[Dict[str, Any]], headers: Dict[str, str],
+) -> Tuple[int, Any]:
+    """Send a request to the real API (unstreamed) and return (status, JSON body)."""
+    import urllib.error
+    import urllib.request
+
+    data = None
+    if body is not None:
+        data = json.dumps({k: v for k, v in body.items() if k != "stream"}).encode("utf-8")
+    keep = {k: v for k, v in headers.items() if k.lower() in ("authorization", "content-type", "user-agent")}
+    req = urllib.request.Request(url, data=data, headers=keep, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=300) as response:
+            raw = response.read().decode("utf-8")
+            return response.status, json.loads(raw) if raw else {}
+    except urllib.error.HTTPError as e:
+        raw = e.read().decode("utf-8", "replace")
+        try:
+            return e.code, json.loads(raw)
+        except ValueError:
+            return e.code, {"error": {"message": raw[:500]}}
+    except (urllib.error.URLError, OSError) as e:
+        return 502, {"error": {"message": f"Upstream unreachable: {e}"}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    standin: StandIn = None
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _send_json(self, status: int, data: Any, extra: Optional[Dict[str, str]] = None):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method: str):
+        if self.path.startswith("/__standin/stats"):
+            self._send_json(200, self.standin.stats())
+            return
+        host, _, rest = self.path.lstrip("/").partition("/")
+        path = "/" + rest
+        length = int(self.headers.get("Content-Length") or 0)
+        body = None
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                self._send_json(400, {"error": {"message": "Body is not JSON"}})
+                return
+
+        standin = self.standin
+        route = route_of(host, path)
+        standin._count("in_flight")
+        try:
+            fault, latency = standin._roll(route if route in ROUTES else "other")
+            streamed = bool(body and body.get("stream")) and route == "responses"
+            if fault == 429:
+                time.sleep(min(latency, 0.05))
+                retry_after = standin.config.profile(route).retry_after
+                self._send_json(429, {"error": {"message": "Rate limit exceeded (stand-in)"}},
+                                {"Retry-After": f"{retry_after:g}"})
+                return
+            if fault:
+                time.sleep(latency)
+                self._send_json(fault, {"error": {"message": "Service unavailable (stand-in)"}})
+                return
+            if not streamed:
+                time.sleep(latency)
+                status, data = standin.reply(method, host, path, body, dict(self.headers))
+                self._send_json(status, data)
+                return
+
+            time.sleep(latency * STREAM_TTFB_SHARE)
+            status, data = standin.reply(method, host, path, body, dict(self.headers))
+            if status != 200:
+                self._send_json(status, data)
+                return
+            standin._count("streams")
+            events = sse_events(data)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            pause = latency * (1 - STREAM_TTFB_SHARE) / max(1, len(events))
+            for event in events:
+                self.wfile.write(event.encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(pause)
+            self.close_connection = True
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            standin._count("in_flight", -1)
+
+
+class Server:
+    """A running stand-in (see start)."""
+
+    def __init__(self, httpd: ThreadingHTTPServer, standin: StandIn):
+        self.httpd = httpd
+        self.standin = standin
+        self.thread = threading.Thread(
+            target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="standin", daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self) -> Dict[str, Any]:
+        return self.standin.stats()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "Server":
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def start(config: Optional[Config] = None, host: str = "127.0.0.1", port: int = 0) -> Server:
+    """Serve the stand-in on a background thread (port 0 picks a free port).
+
+    Returns:
+        Server; set LAST30DAYS_UPSTREAM to its url to use it
+    """
+    standin = StandIn(config)
+    handler = type("StandInHandler", (_Handler,), {"standin": standin})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    server = Server(httpd, standin)
+    server.thread.start()
+    return server
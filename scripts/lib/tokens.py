@@ -0,0 +1,48 @@
+"""Token estimates and input cost for last30days skill.
+
+Compact and context output is read by a model (the skill's Claude session,
+or the Streamlit app's Claude step) which pays per input token. There is no
+tokenizer in the standard library, so count() estimates: runs of up to
+TOKEN_LETTERS letters, groups of up to three digits, each other non-space
+character and each run of newlines count as one token. Against BPE
+tokenizers this errs a little high on English prose and URLs, so output
+sized to a budget stays within it.
+"""
+
+import functools
+import math
+import os
+import re
+
+TOKEN_LETTERS = 8
+_TOKEN_RE = re.compile(r"[A-Za-z]{1,%d}|\d{1,3}|\n+|[^\sA-Za-z\d]" % TOKEN_LETTERS)
+
+# Input price used to turn a cost budget into tokens: Claude Sonnet's
+# $3 per million input tokens, or LAST30DAYS_USD_PER_MTOK
+DEFAULT_USD_PER_MTOK = 3.0
+COUNT_CACHE_SIZE = 4096  # Rendered items whose counts are remembered
+
+
+@functools.lru_cache(maxsize=COUNT_CACHE_SIZE)
+def count(text: str) -> int:
+    """Estimated number of tokens in text (cached per distinct text)."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def usd_per_mtok() -> float:
+    """Input price per million tokens (LAST30DAYS_USD_PER_MTOK or the default)."""
+    try:
+        price = float(os.environ.get("LAST30DAYS_USD_PER_MTOK") or DEFAULT_USD_PER_MTOK)
+    except ValueError:
+        return DEFAULT_USD_PER_MTOK
+    return price if price > 0 else DEFAULT_USD_PER_MTOK
+
+
+def cost_usd(tokens: int) -> float:
+    """Input cost of tokens in US dollars."""
+    return tokens * usd_per_mtok() / 1_000_000
+
+
+def budget_for_cost(usd: float) -> int:
+    """Most tokens that cost at most usd."""
+    return max(0, math.floor(usd * 1_000_000 / usd_per_mtok()))
@@ -1,15 +1,46 @@
 """Terminal UI utilities for last30days skill."""
 
+import json
 import os
 import sys
 import time
 import threading
 import random
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # Check if we're in a real terminal (not captured by Claude Code)
 IS_TTY = sys.stderr.isatty()
 
+# Structured progress events: one JSON object per stderr line, prefixed so
+# consumers (e.g. the Streamlit app) can pick them out of the human log.
+# Enable with LAST30DAYS_PROGRESS_EVENTS=1.
+EVENT_PREFIX = "@@last30days-event "
+_event_lock = threading.Lock()
+
+
+def events_enabled() -> bool:
+    """Whether progress events are on (read per run, so a daemon can vary it)."""
+    return os.environ.get("LAST30DAYS_PROGRESS_EVENTS", "").lower() in ("1", "true", "yes")
+
+
+def emit_event(event: str, **fields):
+    """Write one structured progress event to stderr."""
+    payload = {"event": event, "ts": round(time.time(), 3), **fields}
+    with _event_lock:
+        sys.stderr.write(EVENT_PREFIX + json.dumps(payload) + "\n")
+        sys.stderr.flush()
+
+
+def parse_event(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a stderr line into a progress event, or None if it isn't one."""
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        event = json.loads(line[len(EVENT_PREFIX):])
+    except json.JSONDecodeError:
+        return None
+    return event if isinstance(event, dict) else None
+
 # ANSI color codes
 class Colors:
     PURPLE = '\033[95m'
@@ -186,13 +217,28 @@ class Spinner:
 class ProgressDisplay:
     """Progress display for research phases."""
 
-    def __init__(self, topic: str, show_banner: bool = True):
+    def __init__(self, topic: str, show_banner: bool = True, events: Optional[bool] = None):
         self.topic = topic
         self.spinner: Optional[Spinner] = None
         self.start_time = time.time()
+        self.events = events_enabled() if events is None else events
+        self.phase_start: Dict[str, float] = {}
 
         if show_banner:
             self._show_banner()
+        self._event("run_start", topic=topic)
+
+    def _event(self, event: str, **fields):
+        """Emit a structured event (no-op unless events are enabled)."""
+        if self.events:
+            emit_event(event, elapsed=round(time.time() - self.start_time, 2), **fields)
+
+    def _phase_begin(self, phase: str):
+        self.phase_start[phase] = time.time()
+
+    def _phase_duration(self, phase: str) -> Optional[float]:
+        started = self.phase_start.get(phase)
+        return round(time.time() - started, 2) if started else None
 
     def _show_banner(self):
         if IS_TTY:
@@ -204,15 +250,24 @@ class ProgressDisplay:
         sys.stderr.flush()
 
     def start_reddit(self):
+        self._phase_begin("reddit")
+        self._event("source_start", source="reddit")
         msg = random.choice(REDDIT_MESSAGES)
         self.spinner = Spinner(f"{Colors.YELLOW}Reddit{Colors.RESET} {msg}", Colors.YELLOW)
         self.spinner.start()
 
     def end_reddit(self, count: int):
+        self._event("source_end", source="reddit", count=count, duration=self._phase_duration("reddit"))
         if self.spinner:
             self.spinner.stop(f"{Colors.YELLOW}Reddit{Colors.RESET} Found {count} threads")
 
+    def show_found(self, source: str, count: int):
+        """A streamed search has returned `count` items so far."""
+        self._event("source_item", source=source, count=count)
+
     def start_reddit_enrich(self, current: int, total: int):
+        self._phase_begin("enrich")
+        self._event("enrich_start", source="reddit", current=current, total=total)
         if self.spinner:
             self.spinner.stop()
         msg = random.choice(ENRICHING_MESSAGES)
@@ -220,34 +275,44 @@ class ProgressDisplay:
         self.spinner.start()
 
     def update_reddit_enrich(self, current: int, total: int):
+        self._event("enrich_progress", source="reddit", current=current, total=total)
         if self.spinner:
             msg = random.choice(ENRICHING_MESSAGES)
             self.spinner.update(f"{Colors.YELLOW}Reddit{Colors.RESET} [{current}/{total}] {msg}")
 
     def end_reddit_enrich(self):
+        self._event("enrich_end", source="reddit", duration=self._phase_duration("enrich"))
         if self.spinner:
             self.spinner.stop(f"{Colors.YELLOW}Reddit{Colors.RESET} Enriched with engagement data")
 
     def start_x(self):
+        self._phase_begin("x")
+        self._event("source_start", source="x")
         msg = random.choice(X_MESSAGES)
         self.spinner = Spinner(f"{Colors.CYAN}X{Colors.RESET} {msg}", Colors.CYAN)
         self.spinner.start()
 
     def end_x(self, count: int):
+        self._event("source_end", source="x", count=count, duration=self._phase_duration("x"))
         if self.spinner:
             self.spinner.stop(f"{Colors.CYAN}X{Colors.RESET} Found {count} posts")
 
     def start_processing(self):
+        self._phase_begin("processing")
+        self._event("processing_start")
         msg = random.choice(PROCESSING_MESSAGES)
         self.spinner = Spinner(f"{Colors.PURPLE}Processing{Colors.RESET} {msg}", Colors.PURPLE)
         self.spinner.start()
 
     def end_processing(self):
+        self._event("processing_end", duration=self._phase_duration("processing"))
         if self.spinner:
             self.spinner.stop()
 
-    def show_complete(self, reddit_count: int, x_count: int):
+    def show_complete(self, reddit_count: int, x_count: int, partial: bool = False):
+        """Show completion; partial marks a run with errors, failed enrichment or an expired deadline."""
         elapsed = time.time() - self.start_time
+        self._event("complete", reddit=reddit_count, x=x_count, partial=partial)
         if IS_TTY:
             sys.stderr.write(f"\n{Colors.GREEN}{Colors.BOLD}✓ Research complete{Colors.RESET} ")
             sys.stderr.write(f"{Colors.DIM}({elapsed:.1f}s){Colors.RESET}\n")
@@ -258,6 +323,7 @@ class ProgressDisplay:
         sys.stderr.flush()
 
     def show_cached(self, age_hours: float = None):
+        self._event("cached", age_hours=age_hours)
         if age_hours is not None:
             age_str = f" ({age_hours:.1f}h old)"
         else:
@@ -266,23 +332,27 @@ class ProgressDisplay:
         sys.stderr.flush()
 
     def show_error(self, message: str):
+        self._event("error", message=message)
         sys.stderr.write(f"{Colors.RED}✗ Error:{Colors.RESET} {message}\n")
         sys.stderr.flush()
 
     def start_web_only(self):
         """Show web-only mode indicator."""
+        self._event("source_start", source="web")
         msg = random.choice(WEB_ONLY_MESSAGES)
         self.spinner = Spinner(f"{Colors.GREEN}Web{Colors.RESET} {msg}", Colors.GREEN)
         self.spinner.start()
 
     def end_web_only(self):
         """End web-only spinner."""
+        self._event("source_end", source="web", count=0)
         if self.spinner:
             self.spinner.stop(f"{Colors.GREEN}Web{Colors.RESET} Claude will search the web")
 
     def show_web_only_complete(self):
         """Show completion for web-only mode."""
         elapsed = time.time() - self.start_time
+        self._event("complete", reddit=0, x=0, web_only=True)
         if IS_TTY:
             sys.stderr.write(f"\n{Colors.GREEN}{Colors.BOLD}✓ Ready for web search{Colors.RESET} ")
             sys.stderr.write(f"{Colors.DIM}({elapsed:.1f}s){Colors.RESET}\n")
@@ -35,6 +35,106 @@ MONTH_MAP = {
 }
 
 
+_MONTH_NAMES = (
+    r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
+    r'jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+)
+
+# Date patterns embedded in URL paths, highest priority first. The trailing
+# separator is a lookahead so adjacent candidates don't swallow each other.
+URL_DATE_RE = re.compile(
+    r'/(?=\d{4})(?:'
+    r'(?P<slash_y>\d{4})/(?P<slash_m>\d{2})/(?P<slash_d>\d{2})(?=/)'     # /2026/01/24/
+    r'|(?P<dash_y>\d{4})-(?P<dash_m>\d{2})-(?P<dash_d>\d{2})(?=[-/])'    # /2026-01-24/
+    r'|(?P<compact_y>\d{4})(?P<compact_m>\d{2})(?P<compact_d>\d{2})(?=/)'  # /20260124/
+    r')'
+)
+URL_DATE_KINDS = ("slash", "dash", "compact")
+
+# Absolute and relative date phrases in (lowercased) text, highest priority
+# first. The shared prefix (word boundary, then a character that can start
+# some alternative) lets the scanner skip most positions without trying each
+# branch.
+SNIPPET_DATE_RE = re.compile(
+    r'\b(?=[0-9adfjlmnosty])(?:'
+    r'(?P<mdy_m>' + _MONTH_NAMES + r')\s+(?P<mdy_d>\d{1,2})(?:st|nd|rd|th)?,?\s*(?P<mdy_y>\d{4})\b'
+    r'|(?P<dmy_d>\d{1,2})(?:st|nd|rd|th)?\s+(?P<dmy_m>' + _MONTH_NAMES + r')\s+(?P<dmy_y>\d{4})\b'
+    r'|(?P<iso_y>\d{4})-(?P<iso_m>\d{2})-(?P<iso_d>\d{2})\b'
+    r'|(?P<yesterday>yesterday)'
+    r'|(?P<today>today)'
+    r'|(?P<days>\d+)\s*days?\s*ago\b'
+    r'|(?P<hours>\d+)\s*hours?\s*ago\b'
+    r'|(?P<last_week>last week)'
+    r'|(?P<this_week>this week)'
+    r')'
+)
+SNIPPET_DATE_KINDS = (
+    "mdy", "dmy", "iso", "yesterday", "today", "days", "hours", "last_week", "this_week",
+)
+
+ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Fixed offsets (days before today) for relative phrases
+_RELATIVE_OFFSETS = {"yesterday": 1, "today": 0, "hours": 0, "last_week": 7, "this_week": 3}
+
+
+def _valid_ymd(year: str, month, day: str) -> Optional[str]:
+    """Format a date candidate as YYYY-MM-DD if it is in range."""
+    if 2020 <= int(year) <= 2030 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return None
+
+
+def _match_kind(match: re.Match) -> str:
+    """Name of the alternative that matched ('mdy_y' -> 'mdy')."""
+    kind = match.lastgroup
+    return kind[:-2] if kind[-2:] in ("_y", "_m", "_d") else kind
+
+
+def _url_candidate(match: re.Match) -> Tuple[int, Optional[str]]:
+    """(priority, date) for one URL_DATE_RE match."""
+    kind = _match_kind(match)
+    date = _valid_ymd(match.group(f"{kind}_y"), match.group(f"{kind}_m"), match.group(f"{kind}_d"))
+    return URL_DATE_KINDS.index(kind), date
+
+
+def _snippet_candidate(match: re.Match, today: datetime) -> Tuple[int, Optional[str]]:
+    """(priority, date) for one SNIPPET_DATE_RE match."""
+    kind = _match_kind(match)
+    priority = SNIPPET_DATE_KINDS.index(kind)
+
+    if kind in ("mdy", "dmy", "iso"):
+        month = match.group(f"{kind}_m")
+        if kind != "iso":
+            month = MONTH_MAP.get(month[:3])
+            if not month:
+                return priority, None
+        return priority, _valid_ymd(match.group(f"{kind}_y"), month, match.group(f"{kind}_d"))
+
+    if kind == "days":
+        days = int(match.group("days"))
+        if days > 60:  # Reasonable range
+            return priority, None
+    else:
+        days = _RELATIVE_OFFSETS[kind]
+    return priority, (today - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _best_match(matches, candidate) -> Optional[str]:
+    """Pick the valid candidate from the highest-priority pattern.
+
+    Stops as soon as a top-priority pattern yields a valid date.
+    """
+    best_priority, best_date = None, None
+    for match in matches:
+        priority, date = candidate(match)
+        if date and (best_priority is None or priority < best_priority):
+            best_priority, best_date = priority, date
+            if priority == 0:
+                break
+    return best_date
+
+
 def extract_date_from_url(url: str) -> Optional[str]:
     """Try to extract a date from URL path.
 
@@ -49,31 +149,12 @@ def extract_date_from_url(url: str) -> Optional[str]:
     Returns:
         Date string in YYYY-MM-DD format, or None
     """
-    # Pattern 1: /YYYY/MM/DD/ (most common)
-    match = re.search(r'/(\d{4})/(\d{2})/(\d{2})/', url)
-    if match:
-        year, month, day = match.groups()
-        if 2020 <= int(year) <= 2030 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
-            return f"{year}-{month}-{day}"
-
-    # Pattern 2: /YYYY-MM-DD/ or /YYYY-MM-DD-
-    match = re.search(r'/(\d{4})-(\d{2})-(\d{2})[-/]', url)
-    if match:
-        year, month, day = match.groups()
-        if 2020 <= int(year) <= 2030 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
-            return f"{year}-{month}-{day}"
-
-    # Pattern 3: /YYYYMMDD/ (compact)
-    match = re.search(r'/(\d{4})(\d{2})(\d{2})/', url)
-    if match:
-        year, month, day = match.groups()
-        if 2020 <= int(year) <= 2030 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
-            return f"{year}-{month}-{day}"
-
-    return None
+    if not url:
+        return None
+    return _best_match(URL_DATE_RE.finditer(url), _url_candidate)
 
 
-def extract_date_from_snippet(text: str) -> Optional[str]:
+def extract_date_from_snippet(text: str, today: Optional[datetime] = None) -> Optional[str]:
     """Try to extract a date from text snippet or title.
 
     Looks for patterns like:
@@ -84,83 +165,18 @@ def extract_date_from_snippet(text: str) -> Optional[str]:
 
     Args:
         text: Text to parse
+        today: Reference date for relative phrases (default: now)
 
     Returns:
         Date string in YYYY-MM-DD format, or None
     """
     if not text:
         return None
-
-    text_lower = text.lower()
-
-    # Pattern 1: Month DD, YYYY (e.g., "January 24, 2026")
-    match = re.search(
-        r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
-        r'jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
-        r'\s+(\d{1,2})(?:st|nd|rd|th)?,?\s*(\d{4})\b',
-        text_lower
+    today = today or datetime.now()
+    return _best_match(
+        SNIPPET_DATE_RE.finditer(text.lower()),
+        lambda match: _snippet_candidate(match, today),
     )
-    if match:
-        month_str, day, year = match.groups()
-        month = MONTH_MAP.get(month_str[:3])
-        if month and 2020 <= int(year) <= 2030 and 1 <= int(day) <= 31:
-            return f"{year}-{month:02d}-{int(day):02d}"
-
-    # Pattern 2: DD Month YYYY (e.g., "24 January 2026")
-    match = re.search(
-        r'\b(\d{1,2})(?:st|nd|rd|th)?\s+'
-        r'(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
-        r'jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
-        r'\s+(\d{4})\b',
-        text_lower
-    )
-    if match:
-        day, month_str, year = match.groups()
-        month = MONTH_MAP.get(month_str[:3])
-        if month and 2020 <= int(year) <= 2030 and 1 <= int(day) <= 31:
-            return f"{year}-{month:02d}-{int(day):02d}"
-
-    # Pattern 3: YYYY-MM-DD (ISO format)
-    match = re.search(r'\b(\d{4})-(\d{2})-(\d{2})\b', text)
-    if match:
-        year, month, day = match.groups()
-        if 2020 <= int(year) <= 2030 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
-            return f"{year}-{month}-{day}"
-
-    # Pattern 4: Relative dates ("3 days ago", "yesterday", etc.)
-    today = datetime.now()
-
-    if "yesterday" in text_lower:
-        date = today - timedelta(days=1)
-        return date.strftime("%Y-%m-%d")
-
-    if "today" in text_lower:
-        return today.strftime("%Y-%m-%d")
-
-    # "N days ago"
-    match = re.search(r'\b(\d+)\s*days?\s*ago\b', text_lower)
-    if match:
-        days = int(match.group(1))
-        if days <= 60:  # Reasonable range
-            date = today - timedelta(days=days)
-            return date.strftime("%Y-%m-%d")
-
-    # "N hours ago" -> today
-    match = re.search(r'\b(\d+)\s*hours?\s*ago\b', text_lower)
-    if match:
-        return today.strftime("%Y-%m-%d")
-
-    # "last week" -> ~7 days ago
-    if "last week" in text_lower:
-        date = today - timedelta(days=7)
-        return date.strftime("%Y-%m-%d")
-
-    # "this week" -> ~3 days ago (middle of week)
-    if "this week" in text_lower:
-        date = today - timedelta(days=3)
-        return date.strftime("%Y-%m-%d")
-
-    return None
 
 
 def extract_date_signals(
@@ -170,7 +186,8 @@ def extract_date_signals(
 ) -> Tuple[Optional[str], str]:
     """Extract date from any available signal.
 
-    Tries URL first (most reliable), then snippet, then title.
+    Tries URL first (most reliable), then snippet, then title. Each signal
+    is a single scan of one precompiled pattern.
 
     Args:
         url: Page URL
@@ -188,15 +205,13 @@ def extract_date_signals(
     if url_date:
         return url_date, "high"
 
-    # Try snippet
-    snippet_date = extract_date_from_snippet(snippet)
-    if snippet_date:
-        return snippet_date, "med"
+    today = datetime.now()
 
-    # Try title
-    title_date = extract_date_from_snippet(title)
-    if title_date:
-        return title_date, "med"
+    # Try snippet, then title
+    for text in (snippet, title):
+        text_date = extract_date_from_snippet(text, today)
+        if text_date:
+            return text_date, "med"
 
     return None, "low"
 
@@ -301,7 +316,7 @@ def parse_websearch_results(
         date = result.get("date")  # Use provided date if available
         date_confidence = "low"
 
-        if date and re.match(r'^\d{4}-\d{2}-\d{2}$', str(date)):
+        if date and ISO_DATE_RE.match(str(date)):
             # Provided date is valid
             date_confidence = "med"
         else:
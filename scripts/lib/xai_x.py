@@ -3,9 +3,10 @@
 import json
 import re
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from . import http
+from . import extract, hedge, http
+from .deadline import Deadline
 
 
 def _log_error(msg: str):
@@ -54,6 +55,24 @@ Rules:
 - Include diverse voices/accounts if applicable
 - Prefer posts with substantive content, not just links"""
 
+_COUNT = {"type": ["integer", "null"]}
+
+# Structured-output schema of one returned post (mirrors the prompt's JSON)
+X_ITEM_SCHEMA = extract.object_schema({
+    "text": {"type": "string"},
+    "url": {"type": "string"},
+    "author_handle": {"type": "string"},
+    "date": {"type": ["string", "null"]},
+    "engagement": {
+        "anyOf": [
+            extract.object_schema({"likes": _COUNT, "reposts": _COUNT, "replies": _COUNT, "quotes": _COUNT}),
+            {"type": "null"},
+        ]
+    },
+    "why_relevant": {"type": "string"},
+    "relevance": {"type": "number"},
+})
+
 
 def search_x(
     api_key: str,
@@ -63,6 +82,8 @@ def search_x(
     to_date: str,
     depth: str = "default",
     mock_response: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     """Search X for relevant posts using xAI API with live search.
 
@@ -74,9 +95,12 @@ def search_x(
         to_date: End date (YYYY-MM-DD)
         depth: Research depth - "quick", "default", or "deep"
         mock_response: Mock response for testing
+        deadline: Optional run deadline (clamps the request timeout)
+        on_item: Stream the response, calling this with each cleaned item
+            as soon as the model has written it
 
     Returns:
-        Raw API response
+        Raw API response (the same final response either way)
     """
     if mock_response is not None:
         return mock_response
@@ -111,7 +135,24 @@ def search_x(
         ],
     }
 
-    return http.post(XAI_RESPONSES_URL, payload, headers=headers, timeout=timeout)
+    text_format = extract.items_format("x_posts", X_ITEM_SCHEMA)
+    if on_item is not None:
+        # Streamed: each post reaches on_item while the model is still
+        # writing. Not hedged, since a duplicate request would replay items.
+        return extract.stream(
+            "xai", XAI_RESPONSES_URL, payload, extract.cleaned(_clean_item, on_item),
+            text_format=text_format, headers=headers, timeout=timeout, deadline=deadline,
+        )
+
+    # Hedged when enabled: a slow call gets a duplicate request, first one wins
+    return hedge.call(
+        f"xai:{depth}",
+        lambda: extract.post(
+            "xai", XAI_RESPONSES_URL, payload, text_format=text_format,
+            headers=headers, timeout=timeout, deadline=deadline,
+        ),
+        deadline=deadline,
+    )
 
 
 def parse_x_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -123,95 +164,78 @@ def parse_x_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
     Returns:
         List of item dicts
     """
-    items = []
-
     # Check for API errors first
-    if "error" in response and response["error"]:
-        error = response["error"]
-        err_msg = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+    err_msg = extract.response_error(response)
+    if err_msg:
         _log_error(f"xAI API error: {err_msg}")
         if http.DEBUG:
             _log_error(f"Full error response: {json.dumps(response, indent=2)[:1000]}")
-        return items
-
-    # Try to find the output text
-    output_text = ""
-    if "output" in response:
-        output = response["output"]
-        if isinstance(output, str):
-            output_text = output
-        elif isinstance(output, list):
-            for item in output:
-                if isinstance(item, dict):
-                    if item.get("type") == "message":
-                        content = item.get("content", [])
-                        for c in content:
-                            if isinstance(c, dict) and c.get("type") == "output_text":
-                                output_text = c.get("text", "")
-                                break
-                    elif "text" in item:
-                        output_text = item["text"]
-                elif isinstance(item, str):
-                    output_text = item
-                if output_text:
-                    break
-
-    # Also check for choices (older format)
-    if not output_text and "choices" in response:
-        for choice in response["choices"]:
-            if "message" in choice:
-                output_text = choice["message"].get("content", "")
-                break
+        return []
 
+    output_text = extract.output_text(response)
     if not output_text:
-        return items
+        return []
 
-    # Extract JSON from the response
-    json_match = re.search(r'\{[\s\S]*"items"[\s\S]*\}', output_text)
-    if json_match:
-        try:
-            data = json.loads(json_match.group())
-            items = data.get("items", [])
-        except json.JSONDecodeError:
-            pass
+    # Recover every complete item, even from truncated or noisy output
+    items = extract.parse_items(output_text)
 
     # Validate and clean items
     clean_items = []
     for i, item in enumerate(items):
-        if not isinstance(item, dict):
-            continue
-
-        url = item.get("url", "")
-        if not url:
-            continue
-
-        # Parse engagement
-        engagement = None
-        eng_raw = item.get("engagement")
-        if isinstance(eng_raw, dict):
-            engagement = {
-                "likes": int(eng_raw.get("likes", 0)) if eng_raw.get("likes") else None,
-                "reposts": int(eng_raw.get("reposts", 0)) if eng_raw.get("reposts") else None,
-                "replies": int(eng_raw.get("replies", 0)) if eng_raw.get("replies") else None,
-                "quotes": int(eng_raw.get("quotes", 0)) if eng_raw.get("quotes") else None,
-            }
+        clean_item = _clean_item(item, i)
+        if clean_item:
+            clean_items.append(clean_item)
+
+    return clean_items
+
 
-        clean_item = {
-            "id": f"X{i+1}",
-            "text": str(item.get("text", "")).strip()[:500],  # Truncate long text
-            "url": url,
-            "author_handle": str(item.get("author_handle", "")).strip().lstrip("@"),
-            "date": item.get("date"),
-            "engagement": engagement,
-            "why_relevant": str(item.get("why_relevant", "")).strip(),
-            "relevance": min(1.0, max(0.0, float(item.get("relevance", 0.5)))),
+def _count(value: Any) -> Optional[int]:
+    """Engagement count as an int (None if missing, zero or unparseable)."""
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean_item(item: Any, index: int) -> Optional[Dict[str, Any]]:
+    """Validate one raw item; None if it is not a usable X post."""
+    if not isinstance(item, dict):
+        return None
+
+    url = item.get("url", "")
+    if not url:
+        return None
+
+    # Parse engagement
+    engagement = None
+    eng_raw = item.get("engagement")
+    if isinstance(eng_raw, dict):
+        engagement = {
+            "likes": _count(eng_raw.get("likes")),
+            "reposts": _count(eng_raw.get("reposts")),
+            "replies": _count(eng_raw.get("replies")),
+            "quotes": _count(eng_raw.get("quotes")),
         }
 
-        # Validate date format
-        if clean_item["date"]:
-            if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
-                clean_item["date"] = None
+    try:
+        relevance = min(1.0, max(0.0, float(item.get("relevance", 0.5))))
+    except (TypeError, ValueError):
+        relevance = 0.5
+
+    clean_item = {
+        "id": f"X{index+1}",
+        "text": str(item.get("text", "")).strip()[:500],  # Truncate long text
+        "url": url,
+        "author_handle": str(item.get("author_handle", "")).strip().lstrip("@"),
+        "date": item.get("date"),
+        "engagement": engagement,
+        "why_relevant": str(item.get("why_relevant", "")).strip(),
+        "relevance": relevance,
+    }
 
-        clean_items.append(clean_item)
+    # Validate date format
+    if clean_item["date"]:
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', str(clean_item["date"])):
+            clean_item["date"] = None
 
-    return clean_items
+    return clean_item
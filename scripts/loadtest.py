@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+loadtest - Run many concurrent last30days researches against the local stand-in.
+
+Reports throughput, latency p50/p95/p99, peak RSS, open sockets and threads
+per concurrency level, as JSON that can be compared across commits.
+
+Usage:
+    python3 loadtest.py [options]
+
+Options:
+    --mode=MODE         subprocess|inprocess|daemon (default: subprocess)
+    --concurrency=LIST  Concurrency levels, e.g. 1,4,8 (default: 1,4)
+    --runs=N            Runs per level (default: 2 x concurrency)
+    --topic=TEXT        Topic prefix of each run (default: "load test")
+    --emit=MODE         Output mode of each run (default: compact)
+    --upstream=URL      Use a running stand-in instead of starting one
+    --latency=SPEC      Latency of the stand-in started here (see standin.py)
+    --error-rate=P      Share of stand-in replies answered 503
+    --throttle-rate=P   Share of stand-in replies answered 429
+    --output=FILE       Write the JSON report to FILE
+    --compare=FILE      Compare with an earlier report
+
+Examples:
+    python3 loadtest.py --concurrency=1,4,8 --output=before.json
+    python3 loadtest.py --concurrency=1,4,8 --compare=before.json
+    python3 loadtest.py --mode=daemon --latency=lognormal:1,0.6 --throttle-rate=0.05
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add lib to path
+SCRIPT_DIR = Path(__file__).parent.resolve()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from lib import loadtest
+
+
+def _levels(value: str):
+    try:
+        levels = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a list of integers: {value}")
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("concurrency levels must be >= 1")
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test last30days against the local API stand-in")
+    parser.add_argument("--mode", choices=loadtest.MODES, default="subprocess", help="How runs are executed")
+    parser.add_argument("--concurrency", type=_levels, default=[1, 4], help="Concurrency levels, e.g. 1,4,8")
+    parser.add_argument("--runs", type=int, help="Runs per level (default: 2 x concurrency)")
+    parser.add_argument("--topic", default="load test", help="Topic prefix of each run")
+    parser.add_argument("--emit", default="compact", help="Output mode of each run")
+    parser.add_argument("--upstream", help="URL of a running stand-in")
+    parser.add_argument("--latency", default=loadtest.LoadConfig.latency, help="Latency spec of the stand-in")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stand-in replies answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of stand-in replies answered 429")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Earlier report to compare with")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(args.compare.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: cannot read {args.compare}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    config = loadtest.LoadConfig(
+        mode=args.mode,
+        concurrency=args.concurrency,
+        runs=args.runs,
+        topic=args.topic,
+        args=["--emit", args.emit],
+        upstream=args.upstream,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    try:
+        report = loadtest.run(config, log=lambda msg: print(msg, file=sys.stderr))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    if baseline is not None:
+        print(loadtest.compare(baseline, report))
+    elif not args.output:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+standin - Local stand-in server for the OpenAI, xAI and Reddit APIs.
+
+Replays recorded (or fixture) responses with simulated latency, errors and
+rate limiting, so last30days.py can run end-to-end without network access.
+
+Usage:
+    python3 standin.py [options]
+    LAST30DAYS_UPSTREAM=http://127.0.0.1:8787 OPENAI_API_KEY=x XAI_API_KEY=x \\
+        python3 last30days.py "topic" --no-daemon
+
+Options:
+    --port=N            Port to listen on (default: 8787)
+    --recordings=DIR    Recordings directory (default: ~/.cache/last30days/recordings)
+    --record            Forward requests to the real APIs and save the replies
+    --latency=SPEC      Latency of every reply: 0.2, uniform:LOW,HIGH,
+                        normal:MEAN,SD, lognormal:MEDIAN,SIGMA or exp:MEAN
+    --error-rate=P      Share of requests answered 503
+    --throttle-rate=P   Share of requests answered 429
+    --retry-after=S     Retry-After sent with each 429 (default: 1)
+    --profile=FILE      JSON with per-route settings, e.g.
+                        {"default": {"latency": "0.05"},
+                         "responses": {"latency": "lognormal:4,0.6"},
+                         "reddit": {"throttle_rate": 0.1}}
+    --seed=N            Seed the latency and fault dice
+
+Examples:
+    python3 standin.py --latency=lognormal:0.5,0.8 --throttle-rate=0.05
+    python3 standin.py --record
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add lib to path
+SCRIPT_DIR = Path(__file__).parent.resolve()
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from lib import standin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI, xAI and Reddit APIs")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=standin.DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--recordings", type=Path, default=standin.RECORDINGS_DIR, help="Recordings directory")
+    parser.add_argument("--record", action="store_true", help="Forward to the real APIs and save the replies")
+    parser.add_argument("--latency", default="0", help="Latency spec for every reply")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--profile", type=Path, help="JSON file of per-route settings")
+    parser.add_argument("--seed", type=int, help="Seed for latency and fault injection")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.profile:
+            config = standin.Config.from_file(
+                args.profile, recordings=args.recordings, record=args.record, seed=args.seed,
+            )
+        else:
+            config = standin.Config(
+                default=standin.Profile(args.latency, args.error_rate, args.throttle_rate, args.retry_after),
+                recordings=args.recordings, record=args.record, seed=args.seed,
+            )
+        server = standin.start(config, args.host, args.port)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    mode = "recording to" if args.record else "replaying"
+    print(f"Stand-in listening on {server.url}, {mode} {args.recordings} "
+          f"({len(server.standin.recordings)} recordings)", file=sys.stderr)
+    print(f"export LAST30DAYS_UPSTREAM={server.url}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Tests for cache module."""
 
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -55,5 +56,88 @@ class TestModelCache(unittest.TestCase):
         self.assertTrue(result is None or isinstance(result, str))
 
 
+
+class TestLayers(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = cache.CACHE_DIR
+        cache.CACHE_DIR = Path(self.tmp.name)
+
+    def tearDown(self):
+        cache.CACHE_DIR = self.original_dir
+        self.tmp.cleanup()
+
+    def test_layer_key(self):
+        key = cache.layer_key("topic", "2026-01-01", "2026-01-31", "quick")
+        self.assertEqual(len(key), 16)
+        self.assertEqual(key, cache.layer_key("topic", "2026-01-01", "2026-01-31", "quick"))
+        self.assertNotEqual(key, cache.layer_key("topic", "2026-01-01", "2026-01-31", "deep"))
+
+    def test_save_and_load(self):
+        cache.save_layer("xai", "k1", {"items": [1, 2]})
+        data, age = cache.load_layer("xai", "k1")
+        self.assertEqual(data, {"items": [1, 2]})
+        self.assertLess(age, 1)
+        # Layers are separate namespaces
+        self.assertEqual(cache.load_layer("openai", "k1"), (None, None))
+
+    def test_expired(self):
+        cache.save_layer("thread", "k1", {"submission": {}})
+        self.assertEqual(cache.load_layer("thread", "k1", ttl_hours=0), (None, None))
+
+    def test_no_temp_files_left(self):
+        cache.save_layer("scored", "k1", {"reddit": []})
+        self.assertEqual([p.name for p in (cache.CACHE_DIR / "scored").iterdir()], ["k1.json"])
+
+    def test_clear_cache_clears_layers(self):
+        cache.save_layer("openai", "k1", {})
+        cache.clear_cache()
+        self.assertEqual(cache.load_layer("openai", "k1"), (None, None))
+
+
+class TestMemoryCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = cache.MemoryCache(ttl_seconds=60, max_bytes=10, clock=lambda: self.now)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", "xyz")
+        self.assertEqual(self.cache.get("a"), "xyz")
+        self.assertEqual(self.cache.size_bytes, 3)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_ttl(self):
+        self.cache.set("a", "xyz")
+        self.now = 59
+        self.assertEqual(self.cache.get("a"), "xyz")
+        self.now = 60
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.size_bytes, 0)
+
+    def test_lru_eviction_by_size(self):
+        self.cache.set("a", "aaaa")
+        self.cache.set("b", "bbbb")
+        self.cache.get("a")  # b is now least recently used
+        self.cache.set("c", "cccc")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), "aaaa")
+        self.assertEqual(self.cache.get("c"), "cccc")
+        self.assertEqual(self.cache.size_bytes, 8)
+
+    def test_replace_and_oversized(self):
+        self.cache.set("a", "aaaa")
+        self.cache.set("a", "aa")
+        self.assertEqual(self.cache.size_bytes, 2)
+        self.cache.set("big", "x" * 11)
+        self.assertIsNone(self.cache.get("big"))
+        self.assertEqual(self.cache.get("a"), "aa")
+
+    def test_explicit_size(self):
+        self.cache.set("t", ("out", "log", 0), size=8)
+        self.assertEqual(self.cache.get("t"), ("out", "log", 0))
+        self.assertEqual(self.cache.size_bytes, 8)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for daemon module."""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import daemon
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# The daemon swaps the process-wide sys.stdout per job, so it runs in its own
+# process with this stand-in for last30days.main driven by argv[0].
+FAKE_DAEMON = '''
+import os, sys, time
+sys.path.insert(0, sys.argv[1])
+from lib import daemon
+from lib.deadline import Deadline
+
+def fake_main(argv, use_daemon=True, on_deadline=None):
+    deadline = Deadline()
+    if on_deadline:
+        on_deadline(deadline)
+    command = argv[0]
+    if command == "echo":
+        print(" ".join(argv[1:]))
+        print("progress", file=sys.stderr)
+    elif command == "env":
+        print(os.environ.get("LAST30DAYS_RUN_ID", "-"))
+    elif command == "fail":
+        sys.exit(3)
+    elif command == "wait":
+        while deadline.sleep(0.01):
+            pass
+        print("partial")
+
+daemon.serve(fake_main, sys.argv[2])
+'''
+
+
+@unittest.skipUnless(hasattr(__import__("socket"), "AF_UNIX"), "needs Unix sockets")
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "d.sock")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", FAKE_DAEMON, str(SCRIPTS_DIR), self.path],
+            stderr=subprocess.DEVNULL,
+        )
+        for _ in range(500):
+            if daemon.request({"op": "status"}, self.path):
+                break
+            time.sleep(0.01)
+        else:
+            self.fail("daemon did not start")
+
+    def tearDown(self):
+        daemon.request({"op": "stop"}, self.path)
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.tmp.cleanup()
+
+    def _remote(self, argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = daemon.run_remote(argv, self.path)
+        return code, out.getvalue(), err.getvalue()
+
+    def test_relays_output_and_exit_code(self):
+        code, out, err = self._remote(["echo", "hello", "world"])
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "hello world\n")
+        self.assertIn("progress", err)
+        self.assertEqual(self._remote(["fail"])[0], 3)
+
+    def test_per_request_env(self):
+        os.environ["LAST30DAYS_RUN_ID"] = "abc123"
+        try:
+            code, out, _ = self._remote(["env"])
+        finally:
+            del os.environ["LAST30DAYS_RUN_ID"]
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "abc123\n")
+
+    def test_rejects_different_config(self):
+        os.environ["LAST30DAYS_KEEP_RUNS"] = "999"
+        try:
+            self.assertIsNone(daemon.run_remote(["echo", "x"], self.path))
+        finally:
+            del os.environ["LAST30DAYS_KEEP_RUNS"]
+
+    def test_status_and_cancel(self):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(self._remote(["wait"])))
+        thread.start()
+
+        job_id = None
+        for _ in range(500):
+            jobs = daemon.request({"op": "status"}, self.path)["jobs"]
+            if jobs and jobs[0]["state"] == "running":
+                job_id = jobs[0]["job_id"]
+                break
+            time.sleep(0.01)
+        self.assertIsNotNone(job_id)
+
+        reply = daemon.request({"op": "cancel", "job_id": job_id}, self.path)
+        self.assertTrue(reply["ok"])
+        thread.join(timeout=5)
+        code, out, _ = result[0]
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "partial\n")
+
+    def test_no_daemon(self):
+        missing = os.path.join(self.tmp.name, "missing.sock")
+        self.assertIsNone(daemon.run_remote(["echo"], missing))
+        self.assertIsNone(daemon.request({"op": "status"}, missing))
+
+    def test_second_daemon_refused(self):
+        with self.assertRaises(RuntimeError):
+            daemon.make_server(lambda argv, **kw: None, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@
 
 import sys
 import unittest
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 # Add lib to path
@@ -110,5 +110,39 @@ class TestRecencyScore(unittest.TestCase):
         self.assertEqual(result, 0)
 
 
+class TestDateContext(unittest.TestCase):
+    def setUp(self):
+        self.ctx = dates.DateContext.last_days(30, today=date(2026, 2, 1))
+
+    def test_range_from_reference_date(self):
+        self.assertEqual(self.ctx.from_date, "2026-01-02")
+        self.assertEqual(self.ctx.to_date, "2026-02-01")
+
+    def test_confidence_matches_function(self):
+        for value in ("2026-01-15", "2025-12-15", "2026-03-01", None, "bogus"):
+            self.assertEqual(
+                self.ctx.confidence(value),
+                dates.get_date_confidence(value, self.ctx.from_date, self.ctx.to_date),
+            )
+
+    def test_days_ago_uses_frozen_today(self):
+        self.assertEqual(self.ctx.days_ago("2026-01-31"), 1)
+        self.assertEqual(self.ctx.days_ago("2026-02-02"), -1)
+        self.assertIsNone(self.ctx.days_ago(None))
+
+    def test_recency_score(self):
+        self.assertEqual(self.ctx.recency_score("2026-02-01"), 100)
+        self.assertEqual(self.ctx.recency_score("2026-01-17"), 50)
+        self.assertEqual(self.ctx.recency_score("2025-12-01"), 0)
+        self.assertEqual(self.ctx.recency_score(None), 0)
+
+    def test_date_ordinal_cached(self):
+        dates.date_ordinal.cache_clear()
+        dates.date_ordinal("2026-01-10")
+        dates.date_ordinal("2026-01-10")
+        self.assertEqual(dates.date_ordinal.cache_info().hits, 1)
+        self.assertIsNone(dates.date_ordinal("2026-13-01"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for deadline module."""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import http
+from lib.deadline import Deadline, DeadlineExceeded
+
+
+class TestDeadline(unittest.TestCase):
+    def test_unlimited(self):
+        d = Deadline()
+        self.assertIsNone(d.remaining())
+        self.assertFalse(d.expired())
+        self.assertEqual(d.timeout(30), 30)
+
+    def test_timeout_clamped_to_remaining(self):
+        d = Deadline(5)
+        self.assertLessEqual(d.timeout(120), 5)
+        self.assertEqual(d.timeout(1), 1)
+
+    def test_expired_raises(self):
+        d = Deadline(0.01)
+        time.sleep(0.02)
+        self.assertTrue(d.expired())
+        with self.assertRaises(DeadlineExceeded):
+            d.timeout(30)
+
+    def test_zero_budget_is_spent(self):
+        d = Deadline(0)
+        self.assertTrue(d.expired())
+        with self.assertRaises(DeadlineExceeded):
+            d.check()
+
+    def test_child_cancels_alone(self):
+        run = Deadline(30)
+        part = run.child()
+        self.assertTrue(part.claim("hedge", 1))
+        self.assertFalse(run.claim("hedge", 1))  # Same run allowance
+        part.cancel()
+        self.assertTrue(part.expired())
+        self.assertFalse(run.cancelled)
+        other = run.child()
+        run.cancel()
+        self.assertTrue(other.cancelled)
+        self.assertTrue(run.child().cancelled)
+
+    def test_cancel_wakes_sleep(self):
+        d = Deadline()
+        threading.Timer(0.05, d.cancel).start()
+        start = time.monotonic()
+        self.assertFalse(d.sleep(5))
+        self.assertLess(time.monotonic() - start, 1)
+        with self.assertRaises(DeadlineExceeded):
+            d.check()
+
+
+    def test_claims_are_per_deadline(self):
+        run = Deadline()
+        self.assertTrue(run.claim("hedge", 2))
+        self.assertTrue(run.claim("hedge", 2))
+        self.assertFalse(run.claim("hedge", 2))
+        self.assertTrue(run.claim("other", 1))
+        self.assertTrue(Deadline().claim("hedge", 2))
+
+
+class TestRequestDeadline(unittest.TestCase):
+    def test_request_timeout_uses_remaining_budget(self):
+        seen = {}
+
+        class FakeResponse:
+            status = 200
+
+            def read(self):
+                return b'{"ok": true}'
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+        def fake_urlopen(req, timeout):
+            seen["timeout"] = timeout
+            return FakeResponse()
+
+        with mock.patch("urllib.request.urlopen", fake_urlopen):
+            result = http.get("https://example.com", timeout=120, deadline=Deadline(3))
+        self.assertEqual(result, {"ok": True})
+        self.assertLessEqual(seen["timeout"], 3)
+
+    def test_request_stops_retrying_when_cancelled(self):
+        d = Deadline()
+        calls = []
+
+        def fake_urlopen(req, timeout):
+            calls.append(timeout)
+            d.cancel()
+            raise OSError("connection reset")
+
+        with mock.patch("urllib.request.urlopen", fake_urlopen):
+            with self.assertRaises(DeadlineExceeded):
+                http.get("https://example.com", deadline=d)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -107,5 +107,80 @@ class TestDedupeItems(unittest.TestCase):
         self.assertEqual(len(result), 1)
 
 
+class TestDedupeTop(unittest.TestCase):
+    def _items(self, titles):
+        return [schema.RedditItem(id=f"R{i}", title=t, url="", subreddit="") for i, t in enumerate(titles)]
+
+    def test_matches_dedupe_items_prefix(self):
+        items = self._items([
+            "Best practices for skills", "Best practices for skills guide", "Topic about apples",
+            "Discussion of oranges", "Topic about apples today", "Something else entirely",
+        ])
+        for k in range(1, 6):
+            expected = [i.id for i in dedupe.dedupe_items(items)[:k]]
+            self.assertEqual([i.id for i in dedupe.dedupe_top(items, k)], expected)
+
+    def test_duplicate_of_dropped_item_is_dropped(self):
+        # dedupe_items drops C for resembling B even though B was dropped for A
+        items = self._items(["aaaa bbbb", "aaaa bbbb cccc", "bbbb cccc"])
+        expected = [i.id for i in dedupe.dedupe_items(items, threshold=0.5)]
+        self.assertEqual([i.id for i in dedupe.dedupe_top(iter(items), 3, threshold=0.5)], expected)
+
+
+class TestCanonicalKey(unittest.TestCase):
+    def test_reddit_variants_share_key(self):
+        urls = [
+            "https://www.reddit.com/r/python/comments/abc123/some_title/",
+            "https://old.reddit.com/r/python/comments/abc123/some_title",
+            "https://reddit.com/r/Python/comments/ABC123/other_slug/?utm_source=share",
+            "https://www.reddit.com/comments/abc123",
+            "https://redd.it/abc123",
+        ]
+        keys = {dedupe.canonical_key(u) for u in urls}
+        self.assertEqual(keys, {"reddit:t3_abc123"})
+
+    def test_x_variants_share_key(self):
+        urls = [
+            "https://x.com/user/status/1234567890",
+            "https://twitter.com/User/status/1234567890?s=20",
+            "https://mobile.twitter.com/user/status/1234567890/",
+            "https://x.com/i/web/status/1234567890",
+        ]
+        keys = {dedupe.canonical_key(u) for u in urls}
+        self.assertEqual(keys, {"x:1234567890"})
+
+    def test_other_urls_normalized(self):
+        self.assertEqual(
+            dedupe.canonical_key("https://www.Example.com/Post/"),
+            dedupe.canonical_key("http://example.com/post"),
+        )
+
+    def test_ids(self):
+        self.assertEqual(dedupe.reddit_post_id("https://x.com/user/status/1"), None)
+        self.assertEqual(dedupe.x_status_id("https://reddit.com/r/a/comments/b1/"), None)
+        self.assertEqual(dedupe.x_status_id("https://x.com/user/status/42"), "42")
+
+    def test_lookalike_hosts_are_other_urls(self):
+        self.assertEqual(dedupe.x_status_id("https://fox.com/news/status/12345"), None)
+        self.assertEqual(dedupe.x_status_id("https://nottwitter.com/user/status/12345"), None)
+        self.assertEqual(dedupe.reddit_post_id("https://notreddit.com/r/a/comments/abc123/"), None)
+        self.assertEqual(dedupe.canonical_key("https://fox.com/news/status/12345"), "url:fox.com/news/status/12345")
+        self.assertEqual(dedupe.x_status_id("https://x.com:443/user/status/7"), "7")
+
+
+class TestDedupeByKey(unittest.TestCase):
+    def test_keeps_first_position_and_best_copy(self):
+        items = [
+            {"url": "https://www.reddit.com/r/a/comments/p1/t/", "relevance": 0.5, "date": "2026-01-02"},
+            {"url": "https://www.reddit.com/r/a/comments/p2/t/", "relevance": 0.6, "date": None},
+            {"url": "https://old.reddit.com/r/a/comments/p1/t", "relevance": 0.9, "date": None},
+        ]
+        result = dedupe.dedupe_by_key(items)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0]["relevance"], 0.9)
+        self.assertEqual(result[0]["date"], "2026-01-02")
+        self.assertIn("comments/p2", result[1]["url"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,180 @@
+"""Tests for extract module."""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import extract, http, openai_reddit, xai_x
+
+
+def _item(n):
+    return {"title": f"t{n}", "url": f"https://www.reddit.com/r/s/comments/id{n}/x/", "relevance": 0.5}
+
+
+class TestIterItems(unittest.TestCase):
+    def test_well_formed(self):
+        text = json.dumps({"items": [_item(1), _item(2)]})
+        self.assertEqual(extract.parse_items(text), [_item(1), _item(2)])
+
+    def test_truncated_keeps_complete_items(self):
+        text = json.dumps({"items": [_item(1), _item(2), _item(3)]})
+        cut = text[: text.index('"t3"') + 5]
+        self.assertEqual([i["title"] for i in extract.parse_items(cut)], ["t1", "t2"])
+
+    def test_prose_and_code_fence(self):
+        text = "Here are the threads:\n```json\n" + json.dumps({"items": [_item(1)]}) + "\n```\nHope this helps {really}."
+        self.assertEqual(extract.parse_items(text), [_item(1)])
+
+    def test_malformed_item_skipped(self):
+        good = [json.dumps(_item(1)), json.dumps(_item(3))]
+        text = '{"items": [' + good[0] + ', {"title": "t2", "url": oops}, ' + good[1] + "]}"
+        self.assertEqual([i["title"] for i in extract.parse_items(text)], ["t1", "t3"])
+
+    def test_nested_engagement_objects(self):
+        items = [{"url": "https://x.com/a/status/1", "engagement": {"likes": 1}}, {"url": "https://x.com/b/status/2", "engagement": None}]
+        self.assertEqual(extract.parse_items(json.dumps({"items": items})), items)
+
+    def test_no_items_array_falls_back_to_objects_with_url(self):
+        text = 'First {"url": "https://a"} then {"note": 1} and {"url": "https://b", "x": {"y": 2}}'
+        self.assertEqual([i["url"] for i in extract.parse_items(text)], ["https://a", "https://b"])
+
+    def test_empty_and_garbage(self):
+        self.assertEqual(extract.parse_items(""), [])
+        self.assertEqual(extract.parse_items('{"items": [not json at all'), [])
+
+
+class TestOutputText(unittest.TestCase):
+    def test_responses_message(self):
+        response = {"output": [
+            {"type": "web_search_call"},
+            {"type": "message", "content": [{"type": "output_text", "text": "hi"}]},
+        ]}
+        self.assertEqual(extract.output_text(response), "hi")
+
+    def test_chat_choices(self):
+        self.assertEqual(extract.output_text({"choices": [{"message": {"content": "hi"}}]}), "hi")
+
+    def test_missing(self):
+        self.assertEqual(extract.output_text({}), "")
+
+    def test_response_error(self):
+        self.assertEqual(extract.response_error({"error": {"message": "bad"}}), "bad")
+        self.assertIsNone(extract.response_error({"error": None}))
+
+
+class TestStructuredPost(unittest.TestCase):
+    def setUp(self):
+        extract._unsupported.clear()
+        self.addCleanup(extract._unsupported.clear)
+        self.text_format = extract.items_format("things", extract.object_schema({"url": {"type": "string"}}))
+
+    def test_sends_text_format(self):
+        with mock.patch.object(http, "post", return_value={"ok": 1}) as post:
+            extract.post("openai", "https://api", {"model": "m"}, text_format=self.text_format)
+        body = post.call_args[0][1]
+        self.assertEqual(body["text"]["format"]["type"], "json_schema")
+        self.assertEqual(body["text"]["format"]["schema"]["required"], ["items"])
+
+    def test_rejected_format_retries_without_and_remembers(self):
+        rejected = http.HTTPError("HTTP 400", 400, '{"error": {"param": "text.format"}}')
+        with mock.patch.object(http, "post", side_effect=[rejected, {"ok": 1}, {"ok": 2}]) as post:
+            self.assertEqual(extract.post("xai", "https://api", {"model": "m"}, text_format=self.text_format), {"ok": 1})
+            extract.post("xai", "https://api", {"model": "m"}, text_format=self.text_format)
+        sent = [call[0][1] for call in post.call_args_list]
+        self.assertIn("text", sent[0])
+        self.assertNotIn("text", sent[1])
+        self.assertNotIn("text", sent[2])
+        self.assertTrue(extract.structured_output_enabled("openai"))
+
+    def test_other_errors_propagate(self):
+        with mock.patch.object(http, "post", side_effect=http.HTTPError("HTTP 401", 401, "bad key")) as post:
+            with self.assertRaises(http.HTTPError):
+                extract.post("openai", "https://api", {"model": "m"}, text_format=self.text_format)
+        self.assertEqual(post.call_count, 1)
+
+    def test_disabled_by_env(self):
+        with mock.patch.dict("os.environ", {"LAST30DAYS_STRUCTURED_OUTPUT": "0"}):
+            with mock.patch.object(http, "post", return_value={}) as post:
+                extract.post("openai", "https://api", {"model": "m"}, text_format=self.text_format)
+        self.assertNotIn("text", post.call_args[0][1])
+
+
+def _deltas(text, size=7):
+    return [("response.output_text.delta", {"type": "response.output_text.delta", "delta": text[i:i + size]})
+            for i in range(0, len(text), size)]
+
+
+class TestItemScanner(unittest.TestCase):
+    def test_items_complete_as_deltas_arrive(self):
+        text = 'Sure: {"items": [' + json.dumps(_item(1)) + ", " + json.dumps(_item(2)) + "]}"
+        scanner = extract.ItemScanner()
+        seen = []
+        for i in range(0, len(text), 3):
+            for item in scanner.feed(text[i:i + 3]):
+                seen.append((item["title"], i))
+        self.assertEqual([title for title, _ in seen], ["t1", "t2"])
+        # The first item is handed over before the second has been written
+        self.assertLess(seen[0][1], text.index('"t2"'))
+        self.assertTrue(scanner.done)
+
+    def test_key_split_across_chunks(self):
+        scanner = extract.ItemScanner()
+        self.assertEqual(scanner.feed('{"ite'), [])
+        self.assertEqual(scanner.feed('ms": [{"url": "u"}'), [{"url": "u"}])
+
+
+class TestConsumeStream(unittest.TestCase):
+    def test_items_then_completed_response(self):
+        text = json.dumps({"items": [_item(1), _item(2)]})
+        final = {"id": "resp_1", "output": []}
+        events = _deltas(text) + [("response.completed", {"type": "response.completed", "response": final})]
+        seen = []
+        self.assertIs(extract.consume_stream(events, seen.append), final)
+        self.assertEqual(seen, [_item(1), _item(2)])
+
+    def test_rebuilds_response_without_terminal_event(self):
+        text = json.dumps({"items": [_item(1)]})
+        response = extract.consume_stream(_deltas(text), lambda item: None)
+        self.assertEqual(extract.output_text(response), text)
+
+    def test_error_event_raises(self):
+        with self.assertRaises(http.HTTPError):
+            extract.consume_stream([("error", {"type": "error", "message": "overloaded"})], lambda item: None)
+
+    def test_stream_sets_flag_and_cleans_items(self):
+        text = json.dumps({"items": [{"url": "https://example.com/x"}, _item(2)]})
+        seen = []
+        with mock.patch.object(http, "post_stream", return_value=iter(_deltas(text))) as post_stream:
+            extract.stream("openai", "https://api", {"model": "m"},
+                           extract.cleaned(openai_reddit._clean_item, seen.append))
+        self.assertTrue(post_stream.call_args[0][1]["stream"])
+        # The non-Reddit item is dropped but still counts towards ids
+        self.assertEqual([(i["id"], i["title"]) for i in seen], [("R2", "t2")])
+
+
+class TestClientParsers(unittest.TestCase):
+    def _wrap(self, text):
+        return {"output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]}
+
+    def test_reddit_truncated_response(self):
+        text = json.dumps({"items": [_item(1), _item(2)]})[:-20]
+        items = openai_reddit.parse_reddit_response(self._wrap(text))
+        self.assertEqual([i["title"] for i in items], ["t1"])
+
+    def test_x_noisy_response(self):
+        post = {"text": "hello", "url": "https://x.com/a/status/1", "author_handle": "@a",
+                "date": "2026-01-02", "engagement": {"likes": 3}, "relevance": 2}
+        items = xai_x.parse_x_response(self._wrap('Sure! {"items": [' + json.dumps(post) + ', {"bad": ]} done'))
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]["author_handle"], "a")
+        self.assertEqual(items[0]["engagement"]["likes"], 3)
+        self.assertEqual(items[0]["relevance"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Tests for hedge module."""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import hedge
+from lib.deadline import Deadline, DeadlineExceeded
+
+
+class TestPercentile(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(hedge.percentile([], 0.9))
+
+    def test_nearest_rank(self):
+        samples = list(range(1, 11))
+        self.assertEqual(hedge.percentile(samples, 0.9), 9)
+        self.assertEqual(hedge.percentile(samples, 0.5), 5)
+        self.assertEqual(hedge.percentile(samples, 1.0), 10)
+
+
+class TestPolicyFromEnv(unittest.TestCase):
+    def test_malformed_values_use_defaults(self):
+        env = {
+            "LAST30DAYS_HEDGE_PERCENTILE": "1.5",
+            "LAST30DAYS_HEDGE_MIN_SAMPLES": "many",
+            "LAST30DAYS_HEDGE_MAX_EXTRA": "two",
+        }
+        err = io.StringIO()
+        with mock.patch.dict(os.environ, env), mock.patch.object(sys, "stderr", err):
+            policy = hedge.HedgePolicy.from_env()
+        self.assertEqual((policy.percentile, policy.min_samples, policy.max_extra), (0.9, 5, 2))
+        self.assertIn("LAST30DAYS_HEDGE_MAX_EXTRA='two'", err.getvalue())
+
+    def test_valid_values(self):
+        env = {"LAST30DAYS_HEDGE_PERCENTILE": "0.5", "LAST30DAYS_HEDGE_MAX_EXTRA": "0"}
+        with mock.patch.dict(os.environ, env):
+            policy = hedge.HedgePolicy.from_env()
+        self.assertEqual((policy.percentile, policy.max_extra), (0.5, 0))
+
+
+class TestHedgedCall(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(hedge, "LATENCY_FILE", Path(self.tmp.name) / "latency.jsonl")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_latency_when_disabled(self):
+        policy = hedge.HedgePolicy(enabled=False)
+        self.assertEqual(hedge.call("p:default", lambda: 42, policy=policy), 42)
+        self.assertEqual(len(hedge.load_history()["p:default"]), 1)
+
+    def test_samples_are_appended(self):
+        # Another process's sample, written after this one last read the file
+        hedge.record_latency("p:default", 1.0)
+        with open(hedge.LATENCY_FILE, "a") as f:
+            f.write('{"key": "p:default", "s": 2.0}\n')
+        hedge.record_latency("p:default", 3.0)
+        self.assertEqual(hedge.load_history()["p:default"], [1.0, 2.0, 3.0])
+
+    def test_history_is_compacted(self):
+        with mock.patch.object(hedge, "COMPACT_LINES", 20):
+            for i in range(60):
+                hedge.record_latency("p:default", i)
+            hedge.record_latency("q:default", 0.5)
+        self.assertEqual(hedge.load_history()["p:default"], [float(i) for i in range(10, 60)])
+        self.assertEqual(hedge.load_history()["q:default"], [0.5])
+        with open(hedge.LATENCY_FILE) as f:
+            self.assertLessEqual(len(f.readlines()), hedge.MAX_SAMPLES + 20 + 1)
+
+    def test_no_hedge_without_history(self):
+        policy = hedge.HedgePolicy(enabled=True, min_samples=5)
+        self.assertIsNone(hedge.hedge_delay("p:default", policy))
+
+    def test_slow_call_is_hedged_and_fast_duplicate_wins(self):
+        for _ in range(5):
+            hedge.record_latency("p:default", 0.01)
+        policy = hedge.HedgePolicy(enabled=True, min_samples=5, max_extra=1)
+        calls = []
+        lock = threading.Lock()
+
+        def fn():
+            with lock:
+                calls.append(1)
+                n = len(calls)
+            if n == 1:
+                time.sleep(1.0)  # First call hits the latency tail
+                return "slow"
+            return "fast"
+
+        start = time.monotonic()
+        self.assertEqual(hedge.call("p:default", fn, policy=policy), "fast")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(len(calls), 2)
+
+    def test_spend_cap_limits_duplicates(self):
+        for _ in range(5):
+            hedge.record_latency("p:default", 0.01)
+        policy = hedge.HedgePolicy(enabled=True, min_samples=5, max_extra=0)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.05)
+            return "only"
+
+        self.assertEqual(hedge.call("p:default", fn, policy=policy), "only")
+        self.assertEqual(len(calls), 1)
+
+    def test_spend_cap_is_per_run(self):
+        for _ in range(hedge.MAX_SAMPLES):  # Slow calls below barely move the p90
+            hedge.record_latency("p:default", 0.01)
+        policy = hedge.HedgePolicy(enabled=True, min_samples=5, max_extra=1)
+        calls = []
+        lock = threading.Lock()
+
+        def fn():
+            with lock:
+                calls.append(1)
+            time.sleep(0.2)
+            return "ok"
+
+        run = Deadline()
+        hedge.call("p:default", fn, deadline=run, policy=policy)
+        hedge.call("p:default", fn, deadline=run, policy=policy)
+        self.assertEqual(len(calls), 3)  # Only the first call of the run is hedged
+        calls.clear()
+        hedge.call("p:default", fn, deadline=Deadline(), policy=policy)
+        self.assertEqual(len(calls), 2)  # A new run has its own budget
+
+
+    def test_expired_deadline_sends_nothing(self):
+        policy = hedge.HedgePolicy(enabled=False)
+        calls = []
+        run = Deadline()
+        run.cancel()
+        with self.assertRaises(DeadlineExceeded):
+            hedge.call("p:default", lambda: calls.append(1), deadline=run, policy=policy)
+        self.assertEqual(calls, [])
+
+    def test_no_duplicate_once_deadline_expires(self):
+        for _ in range(5):
+            hedge.record_latency("p:default", 1.0)
+        policy = hedge.HedgePolicy(enabled=True, min_samples=5, max_extra=2)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.5)
+            return "late"
+
+        with self.assertRaises(DeadlineExceeded):
+            hedge.call("p:default", fn, deadline=Deadline(0.05), policy=policy)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""Tests for history module."""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import history, schema
+
+
+def make_report(topic, reddit_score=10, upvotes=100):
+    report = schema.create_report(topic, "2026-01-01", "2026-01-31", "both", "gpt", "grok")
+    report.reddit = [
+        schema.RedditItem(
+            id="R1", title="Meta ads creative tests that worked", url="https://www.reddit.com/r/PPC/comments/abc123/meta_ads/",
+            subreddit="PPC", date="2026-01-20", engagement=schema.Engagement(score=upvotes, num_comments=12),
+            comment_insights=["Broad targeting beat interests"], score=reddit_score,
+        ),
+        schema.RedditItem(
+            id="R2", title="Hotel booking funnels", url="https://www.reddit.com/r/hotels/comments/def456/funnels/",
+            subreddit="hotels", date="2026-01-05", score=5,
+        ),
+    ]
+    report.x = [
+        schema.XItem(
+            id="X1", text="Advantage+ is eating our budget", url="https://x.com/adguy/status/123",
+            author_handle="adguy", date="2026-01-25", engagement=schema.Engagement(likes=40), score=30,
+        ),
+    ]
+    report.web = [
+        schema.WebSearchItem(
+            id="W1", title="Meta ads guide", url="https://blog.example.com/meta-ads",
+            source_domain="blog.example.com", snippet="Everything about campaigns", date="2026-01-15", score=3,
+        ),
+    ]
+    return report
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self.tmp.name) / "history.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def search(self, *args, **kwargs):
+        return history.search(*args, path=self.db, **kwargs)
+
+    def test_missing_db(self):
+        self.assertEqual(self.search("anything"), [])
+        self.assertEqual(history.stats(self.db)["runs"], 0)
+
+    def test_record_and_filter(self):
+        self.assertEqual(history.record_report(make_report("meta ads"), "run-1", self.db), 4)
+
+        self.assertEqual(len(self.search()), 4)
+        self.assertEqual([i["id"] for i in self.search(source="reddit")], ["R1", "R2"])
+        self.assertEqual([i["id"] for i in self.search(subreddit="r/ppc")], ["R1"])
+        self.assertEqual([i["id"] for i in self.search(author="@AdGuy")], ["X1"])
+        self.assertEqual([i["id"] for i in self.search(since="2026-01-16", until="2026-01-24")], ["R1"])
+        found = self.search(source="x")[0]
+        self.assertEqual(found["topic"], "meta ads")
+        self.assertEqual(found["run_id"], "run-1")
+        self.assertEqual(found["engagement"], {"likes": 40})
+
+    def test_full_text(self):
+        history.record_report(make_report("meta ads"), "run-1", self.db)
+        history.record_report(make_report("hotel marketing"), "run-2", self.db)
+        # Words from titles, comment insights and run topics
+        self.assertEqual([i["id"] for i in self.search("creative")], ["R1"])
+        self.assertEqual([i["id"] for i in self.search("broad targeting")], ["R1"])
+        self.assertEqual({i["topic"] for i in self.search("hotel", all_snapshots=True)}, {"hotel marketing", "meta ads"})
+        # FTS syntax in user input is treated as plain words
+        self.assertEqual(self.search('"unbalanced AND ('), [])
+
+    def test_latest_snapshot_per_item(self):
+        history.record_report(make_report("meta ads", reddit_score=10, upvotes=100), "run-1", self.db)
+        history.record_report(make_report("meta ads", reddit_score=20, upvotes=250), "run-2", self.db)
+
+        latest = self.search(source="reddit", subreddit="PPC")
+        self.assertEqual(len(latest), 1)
+        self.assertEqual(latest[0]["engagement"]["score"], 250)
+        self.assertEqual(latest[0]["run_id"], "run-2")
+        self.assertEqual(len(self.search(source="reddit", subreddit="PPC", all_snapshots=True)), 2)
+
+        stats = history.stats(self.db)
+        self.assertEqual(stats["runs"], 2)
+        self.assertEqual(stats["snapshots"], 8)
+        self.assertEqual(stats["items"], {"reddit": 2, "x": 1, "web": 1})
+
+    def test_filters_apply_to_latest_snapshot(self):
+        old = make_report("meta ads", upvotes=100)
+        history.record_report(old, "run-1", self.db)
+        new = make_report("meta ads", upvotes=250)
+        new.reddit[0].date = "2026-01-28"
+        history.record_report(new, "run-2", self.db)
+
+        # Only the old snapshot's date matches: the item's latest doesn't
+        self.assertEqual(self.search(subreddit="PPC", until="2026-01-24"), [])
+        old_only = self.search(subreddit="PPC", until="2026-01-24", all_snapshots=True)
+        self.assertEqual([i["run_id"] for i in old_only], ["run-1"])
+
+    def test_topic_filter_and_limit(self):
+        history.record_report(make_report("meta ads"), "run-1", self.db)
+        self.assertEqual(self.search(topic="META"), self.search(topic="meta"))
+        self.assertEqual(self.search(topic="nothing"), [])
+        self.assertEqual([i["id"] for i in self.search(limit=1)], ["X1"])
+
+    def test_render_results(self):
+        history.record_report(make_report("meta ads"), "run-1", self.db)
+        text = history.render_results(self.search())
+        self.assertIn("r/PPC", text)
+        self.assertIn("@adguy", text)
+        self.assertIn("https://blog.example.com/meta-ads", text)
+        self.assertEqual(history.render_results([]), "No matching items in history.")
+
+    def test_subreddit_priors(self):
+        self.assertEqual(history.subreddit_priors(self.db), {})
+        report = make_report("meta ads")
+        report.reddit[0].subs = schema.SubScores(engagement=95)
+        history.record_report(report, "run-1", self.db)
+        priors = history.subreddit_priors(self.db)
+        self.assertEqual(set(priors), {"ppc", "hotels"})
+        # One strong thread lifts its subreddit, but only part of the way
+        self.assertGreater(priors["ppc"], priors["hotels"])
+        self.assertLess(priors["ppc"], 95)
+
+    def test_subreddit_priors_use_latest_snapshot(self):
+        for engagement in (95, 10):
+            report = make_report("meta ads")
+            report.reddit[0].subs = schema.SubScores(engagement=engagement)
+            history.record_report(report, "run", self.db)
+        priors = history.subreddit_priors(self.db)
+        weight = history.PRIOR_WEIGHT
+        self.assertAlmostEqual(priors["ppc"], (10 + weight * history.score.DEFAULT_ENGAGEMENT) / (1 + weight))
+
+    def test_summaries_backfilled_for_older_stores(self):
+        report = make_report("meta ads")
+        report.reddit[0].subs = schema.SubScores(engagement=95)
+        history.record_report(report, "run-1", self.db)
+        expected = history.subreddit_priors(self.db)
+        # As recorded by a version without the summary tables
+        conn = history.connect(self.db)
+        conn.executescript("DROP TABLE reddit_latest; DROP TABLE subreddit_engagement; PRAGMA user_version = 0;")
+        conn.close()
+        self.assertEqual(history.subreddit_priors(self.db), expected)
+
+    def test_enabled(self):
+        with mock.patch.dict(os.environ, {"LAST30DAYS_HISTORY": "0"}):
+            self.assertFalse(history.enabled())
+        with mock.patch.dict(os.environ, {"LAST30DAYS_HISTORY": "1"}):
+            self.assertTrue(history.enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+"""Tests for http module."""
+
+import sys
+import time
+import unittest
+from email.message import Message
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import http
+
+
+def _headers(**values):
+    msg = Message()
+    for key, value in values.items():
+        msg[key.replace("_", "-")] = value
+    return msg
+
+
+class TestParseHeaders(unittest.TestCase):
+    def test_retry_after_seconds(self):
+        self.assertEqual(http.parse_retry_after(_headers(Retry_After="7")), 7.0)
+
+    def test_retry_after_missing(self):
+        self.assertIsNone(http.parse_retry_after(_headers()))
+        self.assertIsNone(http.parse_retry_after(None))
+
+    def test_duration_formats(self):
+        self.assertEqual(http._parse_duration("12"), 12.0)
+        self.assertEqual(http._parse_duration("6m0s"), 360.0)
+        self.assertEqual(http._parse_duration("250ms"), 0.25)
+        self.assertEqual(http._parse_duration("1h2m"), 3720.0)
+        self.assertIsNone(http._parse_duration("soon"))
+
+    def test_rate_from_reddit_headers(self):
+        headers = _headers(x_ratelimit_remaining="60", x_ratelimit_reset="120")
+        self.assertEqual(http._rate_from_headers(headers), 0.5)
+
+
+class TestBackoff(unittest.TestCase):
+    def test_honours_retry_after(self):
+        self.assertEqual(http.backoff_delay(0, retry_after=4), 4)
+        self.assertEqual(http.backoff_delay(0, retry_after=999), http.MAX_RETRY_DELAY)
+
+    def test_jittered_exponential(self):
+        for attempt in range(4):
+            base = http.RETRY_DELAY * 2 ** attempt
+            delay = http.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, base / 2)
+            self.assertLessEqual(delay, base)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_wait(self):
+        limiter = http.RateLimiter("example.com", rate=10.0, capacity=2)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertGreater(limiter.reserve(), 0)
+
+    def test_429_halves_rate_and_blocks(self):
+        limiter = http.RateLimiter("example.com", rate=4.0, capacity=4)
+        retry_after = limiter.on_response(429, _headers(Retry_After="3"))
+        self.assertEqual(retry_after, 3.0)
+        state = limiter.state()
+        self.assertEqual(state["rate"], 2.0)
+        self.assertEqual(state["throttled"], 1)
+        self.assertGreater(state["blocked_for"], 2)
+        self.assertGreaterEqual(limiter.reserve(), 2)
+
+    def test_success_recovers_rate(self):
+        limiter = http.RateLimiter("example.com", rate=4.0, capacity=4)
+        limiter.on_response(429)
+        limiter.on_response(200)
+        self.assertGreater(limiter.rate, 2.0)
+        self.assertLessEqual(limiter.rate, 4.0)
+
+    def test_headers_set_rate(self):
+        limiter = http.RateLimiter("www.reddit.com", rate=1.0, capacity=5)
+        limiter.on_response(200, _headers(x_ratelimit_remaining="10", x_ratelimit_reset="100"))
+        self.assertAlmostEqual(limiter.rate, 0.1)
+
+    def test_shared_limiter_state(self):
+        limiter = http.get_limiter("state.example.com")
+        self.assertIs(limiter, http.get_limiter("state.example.com"))
+        self.assertIn("state.example.com", http.get_limiter_state())
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def _breaker(self, **kwargs):
+        params = dict(window=60, min_failures=3, failure_ratio=0.5, cooldown=0.05)
+        params.update(kwargs)
+        return http.CircuitBreaker("down.example.com", **params)
+
+    def test_opens_after_failures(self):
+        breaker = self._breaker()
+        for _ in range(3):
+            breaker.allow()
+            breaker.record(False)
+        self.assertTrue(breaker.is_open())
+        with self.assertRaises(http.CircuitOpenError):
+            breaker.check()
+        self.assertEqual(breaker.snapshot()["opened"], 1)
+        self.assertEqual(breaker.snapshot()["rejected"], 1)
+
+    def test_stays_closed_when_mostly_successful(self):
+        breaker = self._breaker()
+        for ok in (True, True, True, True, False, False, False):
+            breaker.record(ok)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = self._breaker()
+        for _ in range(3):
+            breaker.record(False)
+        time.sleep(0.06)
+        breaker.allow()  # The probe
+        self.assertEqual(breaker.state, breaker.HALF_OPEN)
+        with self.assertRaises(http.CircuitOpenError):
+            breaker.allow()  # Only one probe at a time
+        breaker.record(True)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+    def test_half_open_probe_reopens_on_failure(self):
+        breaker = self._breaker()
+        for _ in range(3):
+            breaker.record(False)
+        time.sleep(0.06)
+        breaker.allow()
+        breaker.record(False)
+        self.assertTrue(breaker.is_open())
+
+    def test_request_fails_fast_when_open(self):
+        host = "open.example.com"
+        breaker = http.get_breaker(host)
+        for _ in range(http.BREAKER_MIN_FAILURES):
+            breaker.record(False)
+        self.assertTrue(http.is_circuit_open(f"https://{host}/v1"))
+        start = time.monotonic()
+        with self.assertRaises(http.CircuitOpenError):
+            http.get(f"https://{host}/v1", timeout=30)
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(http.get_breaker_state()[host]["state"], "open")
+
+    def _half_open_host(self, host):
+        breaker = http.get_breaker(host)
+        breaker.cooldown = 0.01
+        for _ in range(http.BREAKER_MIN_FAILURES):
+            breaker.record(False)
+        time.sleep(0.02)
+        return breaker
+
+    def test_unexpected_error_releases_probe(self):
+        import http.client as client
+
+        for host, call in (
+            ("probe.example.com", lambda url: http.get(url, retries=1)),
+            ("probe-stream.example.com", lambda url: list(http.post_stream(url, {}, retries=1))),
+        ):
+            breaker = self._half_open_host(host)
+            with mock.patch("urllib.request.urlopen", side_effect=client.IncompleteRead(b"")):
+                with self.assertRaises(client.IncompleteRead):
+                    call(f"https://{host}/v1")
+            self.assertFalse(breaker.probe_in_flight)
+            self.assertEqual(breaker.state, breaker.OPEN)  # The failed probe reopens it
+            time.sleep(0.02)
+            breaker.allow()  # A new probe can be claimed after the cooldown
+
+    def test_circuit_open_error_is_http_error(self):
+        self.assertTrue(issubclass(http.CircuitOpenError, http.HTTPError))
+
+
+class TestParseSSE(unittest.TestCase):
+    def test_events(self):
+        lines = [b": keepalive\n", b"event: response.created\n", b'data: {"a": 1}\n', b"\n",
+                 b"data: line1\n", b"data: line2\n", b"\n", b"data: [DONE]\n"]
+        self.assertEqual(list(http.parse_sse(lines)), [
+            ("response.created", '{"a": 1}'), (None, "line1\nline2"), (None, "[DONE]"),
+        ])
+
+
+class TestUpstreamURL(unittest.TestCase):
+    def test_unchanged_without_env(self):
+        with mock.patch.dict("os.environ", {}, clear=True):
+            self.assertEqual(http.upstream_url("https://api.x.ai/v1/responses"), "https://api.x.ai/v1/responses")
+
+    def test_rewritten_to_standin(self):
+        with mock.patch.dict("os.environ", {"LAST30DAYS_UPSTREAM": "http://127.0.0.1:8787/"}):
+            self.assertEqual(
+                http.upstream_url("https://www.reddit.com/comments/abc.json?raw_json=1"),
+                "http://127.0.0.1:8787/www.reddit.com/comments/abc.json?raw_json=1",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Tests for incremental module."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import cache, incremental
+
+
+def reddit_item(post_id, date="2026-01-20", engagement=None):
+    return {
+        "id": post_id,
+        "url": f"https://www.reddit.com/r/test/comments/{post_id}/title/",
+        "date": date,
+        "engagement": engagement,
+    }
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = cache.CACHE_DIR
+        cache.CACHE_DIR = Path(self.tmp.name)
+
+    def tearDown(self):
+        cache.CACHE_DIR = self.original_dir
+        self.tmp.cleanup()
+
+    def test_empty_store(self):
+        store = incremental.load_store("Topic", "default")
+        self.assertEqual(store["reddit"], {"last_success": None, "items": {}})
+        self.assertEqual(store["x"], {"last_success": None, "items": {}})
+
+    def test_roundtrip_normalizes_topic(self):
+        store = incremental.load_store("Claude  Code", "default")
+        incremental.merge(store, "reddit", [reddit_item("abc", engagement={"score": 1})], "2026-01-20")
+        incremental.mark_success(store, "reddit", "2026-01-20")
+        incremental.save_store(store)
+
+        loaded = incremental.load_store("claude code", "default")
+        self.assertEqual(loaded["reddit"]["last_success"], "2026-01-20")
+        self.assertIn("reddit:t3_abc", loaded["reddit"]["items"])
+        # Depth is part of the key
+        self.assertEqual(incremental.load_store("claude code", "deep")["reddit"]["items"], {})
+
+
+class TestSearchFrom(unittest.TestCase):
+    def setUp(self):
+        self.store = {
+            "reddit": {"last_success": None, "items": {}},
+            "x": {"last_success": None, "items": {}},
+        }
+
+    def test_full_window_without_history(self):
+        self.assertEqual(incremental.search_from(self.store, ["reddit"], "2026-01-01"), "2026-01-01")
+
+    def test_since_last_success_with_overlap(self):
+        self.store["reddit"]["last_success"] = "2026-01-25"
+        self.store["x"]["last_success"] = "2026-01-28"
+        self.assertEqual(incremental.search_from(self.store, ["x"], "2026-01-01"), "2026-01-27")
+        # Earliest source wins
+        self.assertEqual(incremental.search_from(self.store, ["reddit", "x"], "2026-01-01"), "2026-01-24")
+
+    def test_any_source_without_history_means_full_window(self):
+        self.store["reddit"]["last_success"] = "2026-01-25"
+        self.assertEqual(incremental.search_from(self.store, ["reddit", "x"], "2026-01-01"), "2026-01-01")
+
+    def test_last_success_before_window(self):
+        self.store["reddit"]["last_success"] = "2025-11-01"
+        self.assertEqual(incremental.search_from(self.store, ["reddit"], "2026-01-01"), "2026-01-01")
+
+
+class TestMergeAndRefresh(unittest.TestCase):
+    def setUp(self):
+        self.store = {
+            "reddit": {"last_success": None, "items": {}},
+            "x": {"last_success": None, "items": {}},
+        }
+
+    def test_merge_dedupes_by_post_id(self):
+        added = incremental.merge(self.store, "reddit", [reddit_item("abc")], "2026-01-20", now=100)
+        self.assertEqual(added, 1)
+        variant = dict(reddit_item("abc"), url="https://old.reddit.com/r/test/comments/abc/x/?ref=share")
+        added = incremental.merge(self.store, "reddit", [variant], "2026-01-21", now=200)
+        self.assertEqual(added, 0)
+        entry = self.store["reddit"]["items"]["reddit:t3_abc"]
+        self.assertEqual(entry["first_seen"], "2026-01-20")
+
+    def test_unenriched_copy_keeps_previous_engagement(self):
+        incremental.merge(self.store, "reddit", [reddit_item("abc", engagement={"score": 9})], "2026-01-20", now=100)
+        incremental.merge(self.store, "reddit", [reddit_item("abc")], "2026-01-21", now=200)
+        entry = self.store["reddit"]["items"]["reddit:t3_abc"]
+        self.assertEqual(entry["item"]["engagement"], {"score": 9})
+        self.assertEqual(entry["refreshed_at"], 100)
+
+    def test_stale_items(self):
+        incremental.merge(self.store, "reddit", [
+            reddit_item("old", engagement={"score": 1}),
+            reddit_item("new", engagement={"score": 1}),
+            reddit_item("none"),
+        ], "2026-01-20", now=0)
+        self.store["reddit"]["items"]["reddit:t3_new"]["refreshed_at"] = 30 * 3600
+
+        stale = incremental.stale_items(self.store, "reddit", max_age_hours=24, now=40 * 3600)
+        self.assertEqual([key for key, _ in stale], ["reddit:t3_none", "reddit:t3_old"])
+
+        incremental.mark_refreshed(self.store, "reddit", "reddit:t3_old",
+                                   reddit_item("old", engagement={"score": 5}), now=40 * 3600)
+        stale = incremental.stale_items(self.store, "reddit", max_age_hours=24, now=40 * 3600)
+        self.assertEqual([key for key, _ in stale], ["reddit:t3_none"])
+
+    def test_prune(self):
+        undated = dict(reddit_item("undated"), date=None)
+        incremental.merge(self.store, "reddit", [
+            reddit_item("inside", date="2026-01-10"),
+            reddit_item("outside", date="2025-12-20"),
+        ], "2026-01-20")
+        incremental.merge(self.store, "reddit", [undated], "2025-12-25")
+        self.assertEqual(incremental.prune(self.store, "2026-01-01"), 2)
+        self.assertEqual(list(self.store["reddit"]["items"]), ["reddit:t3_inside"])
+
+    def test_items_are_copies(self):
+        incremental.merge(self.store, "x", [{"id": "X1", "url": "https://x.com/a/status/1"}], "2026-01-20")
+        items = incremental.items(self.store, "x")
+        items[0]["id"] = "changed"
+        self.assertEqual(incremental.items(self.store, "x")[0]["id"], "X1")
+
+    def test_items_get_unique_ids(self):
+        # Each day's search numbers its items from R1
+        incremental.merge(self.store, "reddit", [dict(reddit_item("a"), id="R1")], "2026-01-20")
+        incremental.merge(self.store, "reddit", [dict(reddit_item("b"), id="R1")], "2026-01-21")
+        items = incremental.items(self.store, "reddit")
+        self.assertEqual([item["id"] for item in items], ["R1", "R2"])
+        self.assertEqual([item["url"] for item in items], [reddit_item("a")["url"], reddit_item("b")["url"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Tests for jobs module."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import jobs
+
+
+class StoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "jobs.sqlite3")
+        self.store = jobs.JobStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def wait_finished(self, job_id, timeout=5):
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            job = self.store.get(job_id)
+            if job["state"] in jobs.FINISHED_STATES:
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} did not finish")
+
+
+class TestProvidersForSources(unittest.TestCase):
+    def test_mapping(self):
+        self.assertEqual(jobs.providers_for_sources("reddit"), ("openai",))
+        self.assertEqual(jobs.providers_for_sources("x"), ("xai",))
+        self.assertEqual(jobs.providers_for_sources("auto"), ("openai", "xai"))
+
+
+class TestJobStore(StoreTestCase):
+    def test_submit_and_get(self):
+        job_id = self.store.submit("topic", {"sources": "x"}, owner="a@b.com")
+        job = self.store.get(job_id)
+        self.assertEqual(job["state"], jobs.QUEUED)
+        self.assertEqual(job["params"], {"sources": "x"})
+        self.assertEqual(job["owner"], "a@b.com")
+        self.assertIsNone(self.store.get("missing"))
+
+    def test_record_finished(self):
+        job_id = self.store.record("topic", {}, None, "cached report")
+        job = self.store.get(job_id)
+        self.assertEqual(job["state"], jobs.DONE)
+        self.assertEqual(job["output"], "cached report")
+        self.assertIsNone(self.store.claim())
+
+    def test_claim_oldest_first(self):
+        first = self.store.submit("one", {})
+        second = self.store.submit("two", {})
+        self.assertEqual(self.store.claim()["id"], first)
+        claimed = self.store.claim()
+        self.assertEqual(claimed["id"], second)
+        self.assertEqual(claimed["state"], jobs.RUNNING)
+        self.assertEqual(claimed["attempts"], 1)
+        self.assertIsNone(self.store.claim())
+
+    def test_finish_persists(self):
+        job_id = self.store.submit("topic", {})
+        self.store.claim()
+        self.store.update_progress(job_id, progress="X: searching…", partial="partial")
+        self.store.finish(job_id, jobs.DONE, "report", "log", 0)
+        self.store.close()
+
+        self.store = jobs.JobStore(self.path)
+        job = self.store.get(job_id)
+        self.assertEqual(job["state"], jobs.DONE)
+        self.assertEqual(job["output"], "report")
+        self.assertIsNone(job["partial"])
+
+    def test_cancel(self):
+        queued = self.store.submit("queued", {})
+        running = self.store.submit("running", {})
+        self.store.claim()  # queued
+        self.store.claim()  # running
+        self.store.finish(queued, jobs.DONE)
+
+        self.assertFalse(self.store.cancel(queued))
+        self.assertTrue(self.store.cancel(running))
+        self.assertTrue(self.store.cancel_requested(running))
+
+        waiting = self.store.submit("waiting", {})
+        self.assertTrue(self.store.cancel(waiting))
+        self.assertEqual(self.store.get(waiting)["state"], jobs.CANCELLED)
+
+    def test_requeue_interrupted(self):
+        job_id = self.store.submit("topic", {})
+        self.store.claim()
+        self.assertEqual(self.store.requeue_interrupted(), 1)
+        self.assertEqual(self.store.get(job_id)["state"], jobs.QUEUED)
+
+        self.store.claim()  # Second attempt also dies
+        self.assertEqual(self.store.requeue_interrupted(), 0)
+        self.assertEqual(self.store.get(job_id)["state"], jobs.FAILED)
+
+    def test_list_by_owner(self):
+        self.store.submit("mine", {}, owner="me")
+        self.store.submit("theirs", {}, owner="them")
+        self.assertEqual([j["topic"] for j in self.store.list(owner="me")], ["mine"])
+        self.assertEqual(len(self.store.list()), 2)
+
+    def test_prune(self):
+        old = self.store.submit("old", {})
+        self.store.finish(old, jobs.DONE)
+        self.store.submit("queued", {})
+        self.assertEqual(self.store.prune(max_age_days=-1), 1)
+        self.assertIsNone(self.store.get(old))
+
+
+class TestWorkerPool(StoreTestCase):
+    def test_runs_jobs(self):
+        def runner(job, ctx):
+            ctx.progress("working")
+            return f"report for {job['topic']}", "log", 0, None
+
+        pool = jobs.WorkerPool(self.store, runner, workers=2, poll_interval=0.01)
+        pool.start()
+        try:
+            job_id = pool.submit("topic", {"sources": "reddit"})
+            job = self.wait_finished(job_id)
+        finally:
+            pool.stop(timeout=5)
+        self.assertEqual(job["state"], jobs.DONE)
+        self.assertEqual(job["output"], "report for topic")
+        self.assertEqual(job["progress"], "working")
+
+    def test_failures(self):
+        def runner(job, ctx):
+            if job["topic"] == "raise":
+                raise RuntimeError("boom")
+            if job["topic"] == "timeout":
+                return "partial report", "timed out", -1, None
+            return "", "no results", 1, None
+
+        pool = jobs.WorkerPool(self.store, runner, workers=1, poll_interval=0.01)
+        pool.start()
+        try:
+            raised = self.wait_finished(pool.submit("raise", {}))
+            failed = self.wait_finished(pool.submit("empty", {}))
+            partial = self.wait_finished(pool.submit("timeout", {}))
+        finally:
+            pool.stop(timeout=5)
+        self.assertEqual(raised["state"], jobs.FAILED)
+        self.assertIn("boom", raised["log"])
+        self.assertEqual(failed["state"], jobs.FAILED)
+        # Partial output is kept, but the run still failed
+        self.assertEqual(partial["state"], jobs.FAILED)
+        self.assertEqual(partial["output"], "partial report")
+        self.assertIn("did not finish", partial["message"])
+
+    def test_provider_limit(self):
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def runner(job, ctx):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return "ok", "", 0, None
+
+        pool = jobs.WorkerPool(self.store, runner, workers=4, provider_limits={"xai": 1}, poll_interval=0.01)
+        pool.start()
+        try:
+            ids = [pool.submit(f"t{i}", {"sources": "x"}) for i in range(4)]
+            for job_id in ids:
+                self.wait_finished(job_id)
+        finally:
+            pool.stop(timeout=5)
+        self.assertEqual(active["max"], 1)
+
+    def test_cancel_running(self):
+        started = threading.Event()
+
+        def runner(job, ctx):
+            started.set()
+            while not ctx.cancelled():
+                time.sleep(0.01)
+            return "partial", "", -1, None
+
+        pool = jobs.WorkerPool(self.store, runner, workers=1, poll_interval=0.01)
+        pool.start()
+        try:
+            job_id = pool.submit("topic", {})
+            self.assertTrue(started.wait(5))
+            self.store.cancel(job_id)
+            job = self.wait_finished(job_id)
+        finally:
+            pool.stop(timeout=5)
+        self.assertEqual(job["state"], jobs.CANCELLED)
+        self.assertEqual(job["output"], "partial")
+
+
+if __name__ == "__main__":
+    unittest.main()
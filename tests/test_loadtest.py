@@ -0,0 +1,110 @@
+"""Tests for loadtest module."""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import cache, loadtest, render
+
+
+class TestPercentile(unittest.TestCase):
+    def test_interpolates(self):
+        values = [4.0, 1.0, 3.0, 2.0]
+        self.assertEqual(loadtest.percentile(values, 0.0), 1.0)
+        self.assertEqual(loadtest.percentile(values, 0.5), 2.5)
+        self.assertEqual(loadtest.percentile(values, 1.0), 4.0)
+        self.assertAlmostEqual(loadtest.percentile(values, 0.95), 3.85)
+
+    def test_empty(self):
+        self.assertIsNone(loadtest.percentile([], 0.5))
+        self.assertEqual(loadtest.latency_summary([])["p99"], None)
+
+    def test_summary(self):
+        summary = loadtest.latency_summary([1.0, 2.0, 3.0])
+        self.assertEqual(summary["p50"], 2.0)
+        self.assertEqual(summary["mean"], 2.0)
+        self.assertEqual(summary["max"], 3.0)
+
+
+class TestStatsDelta(unittest.TestCase):
+    def test_counters_and_gauges(self):
+        before = {"requests": {"reddit": 3}, "errors": 1, "in_flight": 0, "max_in_flight": 2}
+        after = {"requests": {"reddit": 8}, "errors": 1, "in_flight": 1, "max_in_flight": 4}
+        self.assertEqual(loadtest.stats_delta(before, after), {
+            "requests": {"reddit": 5}, "errors": 0, "in_flight": 1, "max_in_flight": 4,
+        })
+
+
+class TestCompare(unittest.TestCase):
+    def level(self, concurrency, throughput, p50):
+        return {
+            "concurrency": concurrency,
+            "throughput_per_min": throughput,
+            "latency_s": {"p50": p50, "p95": None, "p99": None},
+            "peak_rss_mb": 50.0,
+            "peak_sockets": 0,
+            "peak_threads": 4,
+        }
+
+    def test_changes_per_level(self):
+        baseline = {"commit": "aaa", "levels": [self.level(1, 100.0, 2.0), self.level(4, 200.0, 3.0)]}
+        current = {"commit": "bbb", "levels": [self.level(4, 250.0, 1.5), self.level(8, 300.0, 4.0)]}
+        table = loadtest.compare(baseline, current)
+        self.assertIn("aaa -> current bbb", table)
+        self.assertIn("| 4 | throughput_per_min | 200.0 | 250.0 | +25.0% |", table)
+        self.assertIn("| 4 | p50_s | 3.0 | 1.5 | -50.0% |", table)
+        self.assertIn("| 4 | p95_s | None | None | n/a |", table)
+        self.assertIn("| 4 | peak_sockets | 0 | 0 | same |", table)
+        self.assertNotIn("| 8 |", table)  # Not in the baseline
+        self.assertNotIn("| 1 |", table)
+
+
+class TestResourceSampler(unittest.TestCase):
+    @unittest.skipUnless(os.path.exists("/proc/self/status"), "needs /proc")
+    def test_samples_own_process(self):
+        with loadtest.ResourceSampler(lambda: [os.getpid()], interval=0.01) as sampler:
+            pass
+        self.assertGreaterEqual(sampler.samples, 1)
+        self.assertGreater(sampler.peak["rss_mb"], 0)
+        self.assertGreaterEqual(sampler.peak["threads"], 2)  # Includes the sampler
+
+    def test_no_processes(self):
+        with loadtest.ResourceSampler(lambda: [], interval=0.01) as sampler:
+            pass
+        self.assertEqual(sampler.samples, 0)
+        self.assertIsNone(sampler.peak["rss_mb"])
+
+
+class TestRun(unittest.TestCase):
+    def config(self, mode):
+        return loadtest.LoadConfig(mode=mode, concurrency=[2], runs=3, latency="0", args=["--emit", "compact"])
+
+    def check(self, report):
+        self.assertEqual(len(report["levels"]), 1)
+        level = report["levels"][0]
+        self.assertEqual((level["concurrency"], level["completed"], level["failed"]), (2, 3, 0))
+        self.assertIsNotNone(level["latency_s"]["p95"])
+        self.assertGreater(level["throughput_per_min"], 0)
+        self.assertGreater(level["standin"]["requests"]["responses"], 0)
+
+    def test_subprocess(self):
+        self.check(loadtest.run(self.config("subprocess")))
+
+    def test_inprocess_restores_state(self):
+        paths = (cache.CACHE_DIR, render.OUTPUT_DIR)
+        upstream = os.environ.get("LAST30DAYS_UPSTREAM")
+        self.check(loadtest.run(self.config("inprocess")))
+        self.assertEqual((cache.CACHE_DIR, render.OUTPUT_DIR), paths)
+        self.assertEqual(os.environ.get("LAST30DAYS_UPSTREAM"), upstream)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            loadtest.run(loadtest.LoadConfig(mode="threads"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for openai_reddit module."""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import openai_reddit
+from lib.deadline import Deadline
+
+
+def _response(*urls, relevance=0.5):
+    items = ",".join(
+        f'{{"title": "t", "url": "{u}", "subreddit": "s", "date": null, "relevance": {relevance}}}'
+        for u in urls
+    )
+    return {"output": [{"type": "message", "content": [
+        {"type": "output_text", "text": f'{{"items": [{items}]}}'}
+    ]}]}
+
+
+class TestBuildQueryVariants(unittest.TestCase):
+    def test_starts_with_topic_then_core(self):
+        variants = openai_reddit.build_query_variants("best nano banana prompting practices")
+        self.assertEqual(variants[0], "best nano banana prompting practices")
+        self.assertEqual(variants[1], "nano banana")
+        self.assertIn("r/nanobanana", variants[2])
+
+    def test_no_duplicates_and_capped(self):
+        variants = openai_reddit.build_query_variants("clawdbot", max_variants=3)
+        self.assertEqual(len(variants), 3)
+        self.assertEqual(len({v.lower() for v in variants}), 3)
+
+
+class TestSearchRedditFanout(unittest.TestCase):
+    def test_merges_by_url(self):
+        responses = {
+            "claude code tips": _response(
+                "https://www.reddit.com/r/a/comments/1/x/",
+                "https://www.reddit.com/r/a/comments/2/y/",
+            ),
+        }
+
+        def fake_search(api_key, model, topic, *args, **kwargs):
+            return responses.get(topic, _response(
+                "https://old.reddit.com/r/a/comments/1/x",
+                "https://www.reddit.com/r/a/comments/3/z/",
+                relevance=0.9,
+            ))
+
+        with mock.patch.object(openai_reddit, "search_reddit", fake_search):
+            items, raws = openai_reddit.search_reddit_fanout(
+                "k", "m", "claude code tips", "2026-01-01", "2026-01-31", target=100,
+            )
+
+        self.assertEqual(len(items), 3)
+        self.assertEqual([i["id"] for i in items], ["R1", "R2", "R3"])
+        self.assertEqual(len(raws), len(openai_reddit.build_query_variants("claude code tips")))
+
+    def test_stops_early_at_target(self):
+        calls = []
+        lock = threading.Lock()
+
+        def fake_search(api_key, model, topic, *args, **kwargs):
+            with lock:
+                calls.append(topic)
+                n = len(calls)
+            if n > 1:
+                time.sleep(0.5)
+            return _response(*[f"https://www.reddit.com/r/a/comments/{n}{i}/t/" for i in range(5)])
+
+        with mock.patch.object(openai_reddit, "search_reddit", fake_search):
+            start = time.monotonic()
+            items, _ = openai_reddit.search_reddit_fanout(
+                "k", "m", "nano banana tips", "2026-01-01", "2026-01-31",
+                max_workers=1, target=5,
+            )
+        self.assertEqual(len(items), 5)
+        self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_early_stop_cancels_running_variants(self):
+        stopped = threading.Event()
+
+        def fake_search(api_key, model, topic, *args, deadline=None, **kwargs):
+            if topic == "nano banana tips":
+                return _response(*[f"https://www.reddit.com/r/a/comments/{i}/t/" for i in range(5)])
+            # A slow variant that, like a streamed search, checks its deadline
+            while not deadline.expired():
+                deadline.sleep(0.05)
+            stopped.set()
+            deadline.check()
+
+        run = Deadline(3)
+        with mock.patch.object(openai_reddit, "search_reddit", fake_search):
+            items, _ = openai_reddit.search_reddit_fanout(
+                "k", "m", "nano banana tips", "2026-01-01", "2026-01-31",
+                max_workers=4, target=5, deadline=run,
+            )
+        self.assertEqual(len(items), 5)
+        self.assertTrue(stopped.wait(1))  # Not only once the run's budget ends
+        self.assertFalse(run.cancelled)  # Only the variants were
+
+    def test_raises_when_all_variants_fail(self):
+        def fake_search(*args, **kwargs):
+            raise openai_reddit.http.HTTPError("boom")
+
+        with mock.patch.object(openai_reddit, "search_reddit", fake_search):
+            with self.assertRaises(openai_reddit.http.HTTPError):
+                openai_reddit.search_reddit_fanout("k", "m", "topic", "2026-01-01", "2026-01-31")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Tests for reddit_enrich module."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import cache, reddit_enrich
+
+
+class TestFetchThreadData(unittest.TestCase):
+    def setUp(self):
+        reddit_enrich.clear_thread_cache()
+
+    def tearDown(self):
+        reddit_enrich.clear_thread_cache()
+
+    def test_url_variants_fetched_once(self):
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=[{}]) as get:
+            first = reddit_enrich.fetch_thread_data(
+                "https://www.reddit.com/r/python/comments/abc123/title/")
+            second = reddit_enrich.fetch_thread_data(
+                "https://old.reddit.com/r/python/comments/abc123/other?ref=share")
+        self.assertEqual(first, [{}])
+        self.assertIs(first, second)
+        get.assert_called_once()
+        self.assertEqual(get.call_args[0][0], "/comments/abc123")
+
+    def test_failure_not_cached(self):
+        with mock.patch.object(
+            reddit_enrich.http, "get_reddit_json",
+            side_effect=reddit_enrich.http.HTTPError("boom"),
+        ) as get:
+            url = "https://www.reddit.com/r/python/comments/abc123/title/"
+            self.assertIsNone(reddit_enrich.fetch_thread_data(url))
+            self.assertIsNone(reddit_enrich.fetch_thread_data(url))
+        self.assertEqual(get.call_count, 2)
+
+    def test_non_reddit_url(self):
+        self.assertIsNone(reddit_enrich.fetch_thread_data("https://example.com/post"))
+
+
+THREAD_JSON = [{"data": {"children": [{"data": {"score": 42, "num_comments": 7, "title": "t"}}]}}]
+
+
+class TestLoadParsedThread(unittest.TestCase):
+    URL = "https://www.reddit.com/r/python/comments/abc123/title/"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = cache.CACHE_DIR
+        cache.CACHE_DIR = Path(self.tmp.name)
+        reddit_enrich.clear_thread_cache()
+
+    def tearDown(self):
+        reddit_enrich.clear_thread_cache()
+        cache.CACHE_DIR = self.original_dir
+        self.tmp.cleanup()
+
+    def test_thread_layer_survives_process_cache(self):
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=THREAD_JSON) as get:
+            first = reddit_enrich.load_parsed_thread(self.URL)
+            reddit_enrich.clear_thread_cache()  # As in a new process
+            second = reddit_enrich.load_parsed_thread("https://redd.it/abc123")
+        self.assertEqual(first["submission"]["score"], 42)
+        self.assertEqual(second, first)
+        get.assert_called_once()
+
+    def test_refresh_skips_layer(self):
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=THREAD_JSON) as get:
+            reddit_enrich.load_parsed_thread(self.URL)
+            reddit_enrich.clear_thread_cache()
+            reddit_enrich.load_parsed_thread(self.URL, use_cache=False)
+        self.assertEqual(get.call_count, 2)
+
+    def test_mock_data_not_cached(self):
+        reddit_enrich.load_parsed_thread(self.URL, mock_thread_data=THREAD_JSON)
+        self.assertEqual(cache.load_layer("thread", "reddit:t3_abc123"), (None, None))
+
+    def test_enrich_uses_layer(self):
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=THREAD_JSON):
+            reddit_enrich.load_parsed_thread(self.URL)
+        reddit_enrich.clear_thread_cache()
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json") as get:
+            item = reddit_enrich.enrich_reddit_item({"url": self.URL})
+        get.assert_not_called()
+        self.assertEqual(item["engagement"]["score"], 42)
+
+    def test_failed_enrichment_is_reported(self):
+        item = {"url": self.URL, "title": "t"}
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=None):
+            self.assertIsNone(reddit_enrich.try_enrich_reddit_item(dict(item)))
+            self.assertEqual(reddit_enrich.enrich_reddit_item(dict(item)), item)
+
+
+class TestFetchSubmissions(unittest.TestCase):
+    URLS = [
+        "https://www.reddit.com/r/python/comments/abc123/title/",
+        "https://www.reddit.com/r/python/comments/def456/other/",
+        "https://www.reddit.com/r/python/comments/gone99/deleted/",
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = cache.CACHE_DIR
+        cache.CACHE_DIR = Path(self.tmp.name)
+        reddit_enrich.clear_thread_cache()
+
+    def tearDown(self):
+        reddit_enrich.clear_thread_cache()
+        cache.CACHE_DIR = self.original_dir
+        self.tmp.cleanup()
+
+    def test_batched_lookup_uses_warm_threads(self):
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=THREAD_JSON):
+            reddit_enrich.load_parsed_thread(self.URLS[0])
+        listing = {"data": {"children": [
+            {"data": {"id": "def456", "score": 9, "num_comments": 2, "created_utc": 1767225600}},
+        ]}}
+        with mock.patch.object(reddit_enrich.http, "get_reddit_json", return_value=listing) as get:
+            found = reddit_enrich.fetch_submissions(self.URLS)
+        get.assert_called_once()
+        self.assertEqual(get.call_args[0][0], "/by_id/t3_def456,t3_gone99")
+        self.assertEqual(found["reddit:t3_abc123"]["score"], 42)
+        self.assertEqual(found["reddit:t3_def456"]["score"], 9)
+        self.assertNotIn("reddit:t3_gone99", found)
+
+    def test_apply_submission_matches_enrich(self):
+        submission = {"score": 9, "num_comments": 2, "upvote_ratio": 0.9, "created_utc": 1767225600}
+        item = reddit_enrich.apply_submission({"url": self.URLS[1], "date": None}, submission)
+        self.assertEqual(item["engagement"], {"score": 9, "num_comments": 2, "upvote_ratio": 0.9})
+        self.assertEqual(item["date"], "2026-01-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,17 @@
 """Tests for render module."""
 
+import io
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from lib import render, schema
+from lib import render, schema, tokens
 
 
 class TestRenderCompact(unittest.TestCase):
@@ -86,6 +90,74 @@ class TestRenderContextSnippet(unittest.TestCase):
         self.assertIn("Last 30 Days", result)
 
 
+def _budget_report():
+    reddit = [
+        schema.RedditItem(
+            id=f"R{i}", title=f"Reddit thread number {i} about budgets", url=f"https://reddit.com/r/test/{i}",
+            subreddit="test", date="2026-01-15", date_confidence="high", score=score,
+            why_relevant="Discusses token budgets in depth",
+        )
+        for i, score in enumerate((90, 88, 86, 84, 82), 1)
+    ]
+    x = [
+        schema.XItem(
+            id=f"X{i}", text=f"Post {i} on keeping prompts small", url=f"https://x.com/a/status/{i}",
+            author_handle="a", date="2026-01-20", date_confidence="high", score=score,
+        )
+        for i, score in enumerate((80, 60), 1)
+    ]
+    return schema.Report(
+        topic="budgets", range_from="2026-01-01", range_to="2026-01-31",
+        generated_at="2026-01-31T12:00:00Z", mode="both", reddit=reddit, x=x,
+    )
+
+
+class TestRenderBudgeted(unittest.TestCase):
+    def test_large_budget_matches_compact(self):
+        report = _budget_report()
+        out = render.render_compact_budgeted(report, 100_000)
+        self.assertEqual(out.text, render.render_compact(report))
+        self.assertEqual(out.shown, {"Reddit": 5, "X": 2})
+        self.assertEqual(out.omitted, {"Reddit": 0, "X": 0})
+        self.assertEqual(out.tokens_used, tokens.count(out.text))
+
+    def test_fits_budget_and_keeps_sources_diverse(self):
+        report = _budget_report()
+        out = render.render_compact_budgeted(report, 300)
+        self.assertLessEqual(out.tokens_used, 300)
+        # X1 (80) beats R3 (86) once two Reddit threads are in: 86 * 0.85^2 < 80
+        self.assertIn("**X1**", out.text)
+        self.assertIn("**R1**", out.text)
+        self.assertNotIn("**R5**", out.text)
+        self.assertIn("left out to fit the context budget", out.text)
+        self.assertEqual(sum(out.shown.values()) + sum(out.omitted.values()), 7)
+
+    def test_brief_form_when_full_does_not_fit(self):
+        report = _budget_report()
+        report.reddit[0].comment_insights = ["a long insight " * 100]
+        out = render.render_compact_budgeted(report, 250)
+        self.assertIn("**R1**", out.text)
+        self.assertNotIn("a long insight", out.text)
+        self.assertGreaterEqual(out.brief, 1)
+
+    def test_errors_always_shown(self):
+        report = _budget_report()
+        report.x, report.x_error = [], "HTTP 500"
+        out = render.render_compact_budgeted(report, 1)
+        self.assertIn("**ERROR:** HTTP 500", out.text)
+        self.assertEqual(out.shown, {"Reddit": 0, "X": 0})
+        self.assertIn(" of 1 tokens", out.summary())
+        self.assertIn("left out 5 Reddit", out.summary())
+
+    def test_context_budget(self):
+        report = _budget_report()
+        out = render.render_context_budgeted(report, 150)
+        self.assertLessEqual(out.tokens_used, 150)
+        self.assertIn("## Key Sources", out.text)
+        self.assertIn("(https://reddit.com/r/test/1)", out.text)
+        self.assertLess(out.text.index("[Reddit] Reddit thread number 1"), out.text.index("[X] Post 1"))
+
+
 class TestRenderFullReport(unittest.TestCase):
     def test_renders_full_report(self):
         report = schema.Report(
@@ -103,6 +175,19 @@ class TestRenderFullReport(unittest.TestCase):
         self.assertIn("# test topic", result)
         self.assertIn("## Models Used", result)
         self.assertIn("gpt-5.2", result)
+        self.assertNotIn("Truncated", result)
+
+    def test_marks_top_k_report_truncated(self):
+        report = schema.Report(
+            topic="test topic",
+            range_from="2026-01-01",
+            range_to="2026-01-31",
+            generated_at="2026-01-31T12:00:00Z",
+            mode="both",
+            top_k=15,
+        )
+        self.assertIn("top 15 items per source only", render.render_full_report(report))
+        self.assertEqual(schema.Report.from_dict(report.to_dict()).top_k, 15)
 
 
 class TestGetContextPath(unittest.TestCase):
@@ -112,5 +197,105 @@ class TestGetContextPath(unittest.TestCase):
         self.assertIn("last30days.context.md", result)
 
 
+def _report(topic="test topic"):
+    return schema.Report(
+        topic=topic,
+        range_from="2026-01-01",
+        range_to="2026-01-31",
+        generated_at="2026-01-31T12:00:00Z",
+        mode="both",
+    )
+
+
+class TestRunDirs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(render, "OUTPUT_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_slugify(self):
+        self.assertEqual(render.slugify("Claude Code: Skills!"), "claude-code-skills")
+        self.assertEqual(render.slugify("???"), "topic")
+
+    def test_runs_do_not_clobber(self):
+        dir1 = render.write_outputs(_report("topic a"))
+        dir2 = render.write_outputs(_report("topic b"))
+        self.assertNotEqual(dir1, dir2)
+        self.assertTrue((dir1 / "report.json").exists())
+        self.assertTrue((dir2 / "report.json").exists())
+        self.assertIn("topic-a", dir1.name)
+
+    def test_latest_points_at_newest_run(self):
+        render.write_outputs(_report("topic a"))
+        dir2 = render.write_outputs(_report("topic b"))
+        self.assertEqual(render.get_latest_run_dir(), dir2.resolve())
+        self.assertEqual(render.get_context_path(), str(dir2.resolve() / "last30days.context.md"))
+
+    def test_run_id_from_env(self):
+        with mock.patch.dict(os.environ, {"LAST30DAYS_RUN_ID": "job-42"}):
+            run_dir = render.create_run_dir("topic")
+        self.assertIn("-job-42-topic", run_dir.name)
+
+    def test_gc_keeps_newest_and_latest(self):
+        dirs = [render.create_run_dir(f"t{i}", run_id=f"r{i}") for i in range(5)]
+        render.update_latest(dirs[0])
+        removed = render.gc_runs(keep=2, max_age_days=0)
+        remaining = {p.name for p in render.get_runs_dir().iterdir()}
+        self.assertEqual(len(removed), 2)
+        self.assertIn(dirs[0].name, remaining)
+
+    def test_malformed_retention_env_uses_default(self):
+        err = io.StringIO()
+        with mock.patch.object(sys, "stderr", err):
+            for value in ("lots", "-3"):
+                with mock.patch.dict(os.environ, {"LAST30DAYS_KEEP_RUNS": value}):
+                    self.assertEqual(render._env_count("LAST30DAYS_KEEP_RUNS", 20), 20)
+        self.assertIn("LAST30DAYS_KEEP_RUNS='lots'", err.getvalue())
+        with mock.patch.dict(os.environ, {"LAST30DAYS_KEEP_RUNS": "0"}):
+            self.assertEqual(render._env_count("LAST30DAYS_KEEP_RUNS", 20), 0)
+
+
+class TestStreamWriter(unittest.TestCase):
+    def test_block_is_delimited(self):
+        block = render.render_stream_block("x", "body\n", count=2)
+        lines = block.splitlines()
+        self.assertEqual(lines[0], "<!-- last30days:x begin count=2 -->")
+        self.assertEqual(lines[1], "body")
+        self.assertEqual(lines[-1], "<!-- last30days:x end -->")
+
+    def test_emits_x_then_final_in_sequence(self):
+        out = io.StringIO()
+        stream = render.StreamWriter(out)
+        stream.emit_x([
+            schema.XItem(id="X1", text="hello", url="https://x.com/a/status/1", author_handle="a", score=70),
+        ])
+        stream.emit_final("final body")
+        text = out.getvalue()
+        self.assertIn("<!-- last30days:x begin seq=1 count=1 -->", text)
+        self.assertIn("@a", text)
+        self.assertIn("<!-- last30days:final begin seq=2 -->", text)
+        self.assertLess(text.index("last30days:x end"), text.index("last30days:final begin"))
+
+    def test_parse_round_trip(self):
+        out = io.StringIO()
+        stream = render.StreamWriter(out)
+        stream.emit_error("X", "boom")
+        stream.emit_final("line one\nline two")
+        partial = out.getvalue() + "<!-- last30days:x begin seq=3 -->\nincomplete"
+        blocks = render.parse_stream_blocks(partial)
+        self.assertEqual([b["kind"] for b in blocks], ["error", "final"])
+        self.assertEqual(blocks[0]["attrs"]["source"], "x")
+        self.assertEqual(blocks[1]["body"], "line one\nline two")
+
+    def test_reddit_item_has_no_score(self):
+        out = io.StringIO()
+        item = schema.RedditItem(id="R1", title="T", url="https://reddit.com/r/a/comments/1", subreddit="a")
+        render.StreamWriter(out).emit_reddit_item(item, 1, 3)
+        self.assertIn("n=1/3", out.getvalue())
+        self.assertNotIn("score:", out.getvalue())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for schedule module."""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import schedule
+from lib.deadline import Deadline
+
+
+class TestByPriority(unittest.TestCase):
+    def test_highest_first_ties_stable(self):
+        self.assertEqual(schedule.by_priority([10, 50, 30, 50]), [1, 3, 2, 0])
+        self.assertEqual(schedule.by_priority([]), [])
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.order = []
+
+    def work(self, key, item):
+        self.gate.wait(5)
+        self.order.append(key)
+        return item["n"]
+
+    def test_runs_highest_priority_first(self):
+        sched = schedule.Scheduler(self.work)
+        self.addCleanup(sched.close)
+        first = sched.submit("a", {"n": 1}, 1)  # Picked up at once, blocks on the gate
+        while not first.running():
+            pass
+        futures = [sched.submit(key, {"n": n}, n) for key, n in (("low", 2), ("high", 9), ("mid", 5))]
+        self.gate.set()
+        self.assertEqual([f.result(5) for f in futures], [2, 9, 5])
+        self.assertEqual(self.order, ["a", "high", "mid", "low"])
+
+    def test_submit_once_per_key(self):
+        sched = schedule.Scheduler(self.work)
+        self.addCleanup(sched.close)
+        self.assertIs(sched.submit("a", {"n": 1}, 1), sched.submit("a", {"n": 2}, 9))
+        self.assertIs(sched.get("a"), sched.submit("a", {"n": 3}, 0))
+        self.assertIsNone(sched.get("b"))
+        self.assertEqual(len(sched), 1)
+
+    def test_close_cancels_queued_work(self):
+        sched = schedule.Scheduler(self.work)
+        running = sched.submit("a", {"n": 1}, 1)
+        while not running.running():
+            pass
+        queued = sched.submit("b", {"n": 2}, 5)
+        sched.close()
+        self.gate.set()
+        self.assertTrue(queued.cancelled())
+        self.assertEqual(running.result(5), 1)
+        self.assertTrue(sched.submit("c", {"n": 3}, 1).cancelled())
+
+    def test_expired_deadline_starts_nothing(self):
+        deadline = Deadline()
+        deadline.cancel()
+        sched = schedule.Scheduler(self.work, deadline=deadline)
+        self.addCleanup(sched.close)
+        self.gate.set()
+        future = sched.submit("a", {"n": 1}, 1)
+        stop = time.monotonic() + 5
+        while not future.cancelled() and time.monotonic() < stop:
+            time.sleep(0.01)
+        self.assertTrue(future.cancelled())
+        self.assertEqual(self.order, [])
+
+    def test_work_errors_reach_the_future(self):
+        def fail(key, item):
+            raise ValueError(key)
+
+        sched = schedule.Scheduler(fail)
+        self.addCleanup(sched.close)
+        with self.assertRaises(ValueError):
+            sched.submit("a", {}, 1).result(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
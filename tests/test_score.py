@@ -2,13 +2,13 @@
 
 import sys
 import unittest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
 
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from lib import schema, score
+from lib import dates, schema, score
 
 
 class TestLog1pSafe(unittest.TestCase):
@@ -164,5 +164,40 @@ class TestSortItems(unittest.TestCase):
         self.assertEqual(len(result), 2)
 
 
+class TestExpectedRedditScore(unittest.TestCase):
+    def setUp(self):
+        self.ctx = dates.DateContext("2026-01-01", "2026-01-31", today=date(2026, 1, 31))
+
+    def test_orders_by_relevance_date_and_prior(self):
+        base = {"relevance": 0.5, "date": "2026-01-20"}
+        expected = score.expected_reddit_score(base, self.ctx)
+        self.assertGreater(score.expected_reddit_score({**base, "relevance": 0.9}, self.ctx), expected)
+        self.assertGreater(score.expected_reddit_score({**base, "date": "2026-01-30"}, self.ctx), expected)
+        self.assertLess(score.expected_reddit_score({**base, "date": None}, self.ctx), expected)
+        self.assertGreater(score.expected_reddit_score(base, self.ctx, prior=80), expected)
+
+    def test_bad_relevance(self):
+        item = {"relevance": "high", "date": "2026-01-20"}
+        self.assertEqual(score.expected_reddit_score(item, self.ctx), score.expected_reddit_score({**item, "relevance": 0.5}, self.ctx))
+
+
+class TestPartialSelection(unittest.TestCase):
+    def _items(self):
+        scores = [50, 90, 10, 90, 70, 30, 70, 50]
+        return [
+            schema.RedditItem(id=f"R{i}", title="T", url="", subreddit="", score=s, date=f"2026-01-0{1 + i % 3}")
+            for i, s in enumerate(scores)
+        ]
+
+    def test_iter_sorted_matches_sort_items(self):
+        items = self._items()
+        self.assertEqual([i.id for i in score.iter_sorted(items)], [i.id for i in score.sort_items(items)])
+
+    def test_top_items_matches_sorted_prefix(self):
+        items = self._items()
+        for k in (0, 1, 3, 8, 20):
+            self.assertEqual([i.id for i in score.top_items(items, k)], [i.id for i in score.sort_items(items)[:k]])
+
+
 if __name__ == "__main__":
     unittest.main()
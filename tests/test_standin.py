@@ -0,0 +1,121 @@
+"""Tests for standin module."""
+
+import json
+import random
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import extract, http, standin
+
+
+class TestParseLatency(unittest.TestCase):
+    def test_specs(self):
+        rng = random.Random(1)
+        self.assertEqual(standin.parse_latency("0.25")(rng), 0.25)
+        self.assertTrue(0.1 <= standin.parse_latency("uniform:0.1,0.2")(rng) <= 0.2)
+        self.assertGreater(standin.parse_latency("lognormal:0.5,0.8")(rng), 0)
+        self.assertGreaterEqual(standin.parse_latency("normal:0,1")(rng), 0)
+        self.assertGreaterEqual(standin.parse_latency("exp:0.1")(rng), 0)
+
+    def test_bad_spec(self):
+        with self.assertRaises(ValueError):
+            standin.parse_latency("pareto:1")
+
+    def test_profile_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "profile.json"
+            path.write_text(json.dumps({"default": {"latency": "0.1"}, "reddit": {"throttle_rate": 0.5}}))
+            config = standin.Config.from_file(path)
+        self.assertEqual(config.profile("responses").latency, "0.1")
+        self.assertEqual(config.profile("reddit").latency, "0.1")
+        self.assertEqual(config.profile("reddit").throttle_rate, 0.5)
+
+
+class StandInCase(unittest.TestCase):
+    def start(self, **kwargs):
+        config = standin.Config(recordings=Path(self.tmp.name) / "rec", **kwargs)
+        server = standin.start(config)
+        self.addCleanup(server.stop)
+        return server
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def use(self, server):
+        patcher = mock.patch.dict("os.environ", {http.UPSTREAM_ENV: server.url})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestReplay(StandInCase):
+    def test_fixture_replies_through_http_layer(self):
+        server = self.start()
+        self.use(server)
+        response = http.post("https://api.openai.com/v1/responses", {"model": "m"}, retries=1)
+        self.assertTrue(extract.parse_items(extract.output_text(response)))
+        listing = http.get_reddit_json("/by_id/t3_aaa,t3_bbb")
+        self.assertEqual([c["data"]["id"] for c in listing["data"]["children"]], ["aaa", "bbb"])
+        thread = http.get_reddit_json("/r/x/comments/ccc/title")
+        self.assertEqual(thread[0]["data"]["children"][0]["data"]["id"], "ccc")
+        self.assertEqual(server.stats()["requests"]["reddit"], 2)
+
+    def test_streamed_reply(self):
+        server = self.start(default=standin.Profile(latency="0.05"))
+        self.use(server)
+        seen = []
+        response = extract.consume_stream(
+            http.post_stream("https://api.x.ai/v1/responses", {"model": "m", "stream": True}), seen.append,
+        )
+        self.assertTrue(seen)
+        self.assertEqual(len(seen), len(extract.parse_items(extract.output_text(response))))
+        self.assertEqual(server.stats()["streams"], 1)
+
+    def test_fixture_dates_are_recent(self):
+        server = self.start()
+        self.use(server)
+        thread = http.get_reddit_json("/r/x/comments/ccc/title")
+        created = thread[0]["data"]["children"][0]["data"]["created_utc"]
+        self.assertLess(time.time() - created, 3 * 86400)
+
+    def test_throttle_injection(self):
+        host = "api.standin-test.invalid"
+        self.addCleanup(http._limiters.pop, host, None)
+        server = self.start(default=standin.Profile(throttle_rate=1.0, retry_after=0.01))
+        self.use(server)
+        with self.assertRaises(http.HTTPError) as ctx:
+            http.get(f"https://{host}/v1/models", retries=2)
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(server.stats()["throttled"], 2)
+
+    def test_error_injection(self):
+        server = self.start(default=standin.Profile(error_rate=1.0), seed=3)
+        status, _ = server.standin._roll("responses")
+        self.assertEqual(status, 503)
+
+
+class TestRecord(StandInCase):
+    def test_record_then_replay(self):
+        upstream = self.start()
+        recorder = self.start(record=True, forward_to=upstream.url + "/{host}")
+        self.use(recorder)
+        first = http.post("https://api.openai.com/v1/responses", {"model": "m", "input": "q"}, retries=1)
+        self.assertEqual(recorder.stats()["recorded"], 1)
+
+        replay = self.start()
+        self.assertEqual(len(replay.standin.recordings), 1)
+        self.use(replay)
+        again = http.post("https://api.openai.com/v1/responses", {"model": "m", "input": "q"}, retries=1)
+        self.assertEqual(again, first)
+        self.assertEqual(replay.stats()["fixtures"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
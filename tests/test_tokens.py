@@ -0,0 +1,48 @@
+"""Tests for tokens module."""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import tokens
+
+
+class TestCount(unittest.TestCase):
+    def test_estimates(self):
+        self.assertEqual(tokens.count(""), 0)
+        self.assertEqual(tokens.count("hello world"), 2)
+        self.assertEqual(tokens.count("extraordinarily"), 2)  # Split every 8 letters
+        self.assertEqual(tokens.count("12345"), 2)
+        self.assertEqual(tokens.count("a, b!\n\nc"), 6)
+
+    def test_errs_high_on_prose(self):
+        text = "The quick brown fox jumps over the lazy dog. " * 20
+        self.assertGreaterEqual(tokens.count(text), len(text) / 4.5)
+
+    def test_cached(self):
+        tokens.count.cache_clear()
+        tokens.count("cached text")
+        tokens.count("cached text")
+        self.assertEqual(tokens.count.cache_info().hits, 1)
+
+
+class TestCost(unittest.TestCase):
+    def test_default_price(self):
+        with mock.patch.dict(os.environ, {"LAST30DAYS_USD_PER_MTOK": ""}):
+            self.assertAlmostEqual(tokens.cost_usd(1_000_000), tokens.DEFAULT_USD_PER_MTOK)
+            self.assertEqual(tokens.budget_for_cost(0.003), 1000)
+
+    def test_price_from_env(self):
+        with mock.patch.dict(os.environ, {"LAST30DAYS_USD_PER_MTOK": "1"}):
+            self.assertEqual(tokens.budget_for_cost(0.002), 2000)
+        with mock.patch.dict(os.environ, {"LAST30DAYS_USD_PER_MTOK": "free"}):
+            self.assertEqual(tokens.usd_per_mtok(), tokens.DEFAULT_USD_PER_MTOK)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Tests for ui module."""
+
+import io
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import ui
+
+
+class TestProgressEvents(unittest.TestCase):
+    def _run(self, events: bool):
+        err = io.StringIO()
+        with mock.patch.object(sys, "stderr", err):
+            progress = ui.ProgressDisplay("topic", show_banner=False, events=events)
+            progress.start_x()
+            progress.end_x(4)
+            progress.show_error("bad thing")
+        return [ui.parse_event(line) for line in err.getvalue().splitlines()]
+
+    def test_events_emitted_when_enabled(self):
+        events = [e for e in self._run(True) if e]
+        kinds = [e["event"] for e in events]
+        self.assertEqual(kinds, ["run_start", "source_start", "source_end", "error"])
+        self.assertEqual(events[2]["source"], "x")
+        self.assertEqual(events[2]["count"], 4)
+        self.assertIn("duration", events[2])
+
+    def test_no_events_when_disabled(self):
+        self.assertFalse(any(self._run(False)))
+
+    def test_complete_event_marks_partial_runs(self):
+        err = io.StringIO()
+        with mock.patch.object(sys, "stderr", err):
+            progress = ui.ProgressDisplay("topic", show_banner=False, events=True)
+            progress.show_complete(3, 2)
+            progress.show_complete(1, 0, partial=True)
+        events = [e for e in map(ui.parse_event, err.getvalue().splitlines()) if e and e["event"] == "complete"]
+        self.assertEqual([e["partial"] for e in events], [False, True])
+
+    def test_parse_event_ignores_plain_lines(self):
+        self.assertIsNone(ui.parse_event("✓ Research complete"))
+        self.assertIsNone(ui.parse_event(ui.EVENT_PREFIX + "{not json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for websearch module."""
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lib import websearch
+
+TODAY = datetime(2026, 2, 15)
+
+
+class TestExtractDateFromUrl(unittest.TestCase):
+    def test_slash_date(self):
+        self.assertEqual(websearch.extract_date_from_url("https://a.com/2026/01/24/title"), "2026-01-24")
+
+    def test_dash_date(self):
+        self.assertEqual(websearch.extract_date_from_url("https://a.com/2026-01-24-title"), "2026-01-24")
+
+    def test_compact_date(self):
+        self.assertEqual(websearch.extract_date_from_url("https://a.com/blog/20260124/title"), "2026-01-24")
+
+    def test_slash_pattern_preferred(self):
+        url = "https://a.com/20250101/2026/01/24/title"
+        self.assertEqual(websearch.extract_date_from_url(url), "2026-01-24")
+
+    def test_out_of_range_skipped(self):
+        self.assertIsNone(websearch.extract_date_from_url("https://a.com/2019/01/24/title"))
+        self.assertIsNone(websearch.extract_date_from_url("https://a.com/2026/13/24/title"))
+        self.assertEqual(
+            websearch.extract_date_from_url("https://a.com/2026/13/24/2026-01-02/"), "2026-01-02")
+
+    def test_no_date(self):
+        self.assertIsNone(websearch.extract_date_from_url("https://a.com/post/title"))
+        self.assertIsNone(websearch.extract_date_from_url(""))
+
+
+class TestExtractDateFromSnippet(unittest.TestCase):
+    def _extract(self, text):
+        return websearch.extract_date_from_snippet(text, TODAY)
+
+    def test_month_day_year(self):
+        self.assertEqual(self._extract("Posted January 24, 2026 by admin"), "2026-01-24")
+        self.assertEqual(self._extract("Sept 3rd 2025"), "2025-09-03")
+
+    def test_day_month_year(self):
+        self.assertEqual(self._extract("24 Jan 2026 - news"), "2026-01-24")
+
+    def test_iso(self):
+        self.assertEqual(self._extract("Updated 2026-02-01"), "2026-02-01")
+
+    def test_absolute_beats_relative(self):
+        self.assertEqual(self._extract("3 days ago (January 2, 2026)"), "2026-01-02")
+
+    def test_relative(self):
+        self.assertEqual(self._extract("yesterday"), "2026-02-14")
+        self.assertEqual(self._extract("Today only"), "2026-02-15")
+        self.assertEqual(self._extract("5 days ago"), "2026-02-10")
+        self.assertEqual(self._extract("2 hours ago"), "2026-02-15")
+        self.assertEqual(self._extract("last week"), "2026-02-08")
+        self.assertEqual(self._extract("this week"), "2026-02-12")
+
+    def test_days_ago_range(self):
+        self.assertIsNone(self._extract("90 days ago"))
+
+    def test_no_date(self):
+        self.assertIsNone(self._extract("A tutorial about setup"))
+        self.assertIsNone(self._extract(""))
+
+
+class TestExtractDateSignals(unittest.TestCase):
+    def test_url_high_confidence(self):
+        result = websearch.extract_date_signals("https://a.com/2026/01/24/x", "January 1, 2026", "")
+        self.assertEqual(result, ("2026-01-24", "high"))
+
+    def test_snippet_then_title(self):
+        self.assertEqual(
+            websearch.extract_date_signals("https://a.com/x", "", "Jan 5, 2026 recap"),
+            ("2026-01-05", "med"),
+        )
+
+    def test_none(self):
+        self.assertEqual(websearch.extract_date_signals("https://a.com/x", "text", "title"), (None, "low"))
+
+
+if __name__ == "__main__":
+    unittest.main()